@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Hot-path benchmarks at 1x / 10x / 100x / 1000x today's data.
+
+Cases (each timed `--repeat` times, median + min reported):
+
+    parse_billlist       scripts/scrape_numbered_bills.parse_billlist on the saved billlist.html
+    make_rep_key         datastore.make_rep_key over the bills' sponsor column
+    load_datasets        datastore.load_datasets (read + type the JSON/GeoJSON files)
+    merges               the reps x KPIs and bills x reps merges on rep_key
+    build_datastore      datastore.build_datastore (crosswalk + merges + indexes)
+    pydeck_polygons      geo.shapely_to_pydeck_polygons over every district
+    simplify_<level>     geo.simplify at each detail level
+
+Datasets come from benchmarks/synth.py (generated on first use). Results are
+written to benchmarks/results/<commit>.json, so runs on different commits can
+be compared:
+
+    python benchmarks/bench.py --scales 1 10 100
+    python benchmarks/bench.py --compare 4e0b3a6          # vs that commit's results
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_DIR = BENCH_DIR.parent
+RESULTS_DIR = BENCH_DIR / "results"
+
+sys.path.insert(0, str(REPO_DIR / "streamlit_app"))
+sys.path.insert(0, str(REPO_DIR / "scripts"))
+
+import pandas as pd  # noqa: E402
+
+import synth  # noqa: E402
+
+
+# ---------------------
+# Cases
+# ---------------------
+def case_parse_billlist(ds):
+    from scrape_numbered_bills import parse_billlist
+    page = (ds / "billlist.html").read_text(encoding="utf-8")
+    return lambda: parse_billlist(page, verbose=False)
+
+
+def case_make_rep_key(ds):
+    from datastore import make_rep_key
+    sponsors = pd.read_json(ds / "combinedBills.json", orient="records")["Bill Sponsor"]
+    return lambda: sponsors.fillna("").apply(make_rep_key)
+
+
+def case_load_datasets(ds):
+    from datastore import load_datasets
+    return lambda: load_datasets(ds / "combinedBills.json", ds / "repKPIs.json", [ds / "reps_geo.geojson"])
+
+
+def case_merges(ds):
+    from datastore import add_rep_key, load_datasets, make_rep_key
+    bills, repkpis, geo = load_datasets(ds / "combinedBills.json", ds / "repKPIs.json", [ds / "reps_geo.geojson"])
+    bills["rep_key"] = bills["Bill Sponsor"].fillna("").apply(make_rep_key)
+    add_rep_key(repkpis, ["Bill Sponsor"])
+    add_rep_key(geo, ["Bill Sponsor"])
+    repkpis = repkpis.drop_duplicates("rep_key")
+
+    def run():
+        reps = geo.merge(repkpis, on="rep_key", how="left", suffixes=("_geo", "_kpi"))
+        attrs = pd.DataFrame(reps.drop(columns="geometry"))
+        return bills.merge(attrs, on="rep_key", how="left")
+    return run
+
+
+def case_build_datastore(ds):
+    from datastore import build_datastore, load_datasets
+    frames = load_datasets(ds / "combinedBills.json", ds / "repKPIs.json", [ds / "reps_geo.geojson"])
+    return lambda: build_datastore("bench", frames=frames)
+
+
+def _geometries(ds):
+    import geopandas as gpd
+    return gpd.read_file(ds / "reps_geo.geojson")
+
+
+def case_pydeck_polygons(ds):
+    from geo import shapely_to_pydeck_polygons
+    geoms = _geometries(ds).geometry.tolist()
+    return lambda: [shapely_to_pydeck_polygons(g) for g in geoms]
+
+
+def simplify_case(level):
+    def case(ds):
+        from geo import simplify
+        gdf = _geometries(ds)[["geometry"]]
+        return lambda: simplify(gdf, level)
+    return case
+
+
+CASES = {
+    "parse_billlist": case_parse_billlist,
+    "make_rep_key": case_make_rep_key,
+    "load_datasets": case_load_datasets,
+    "merges": case_merges,
+    "build_datastore": case_build_datastore,
+    "pydeck_polygons": case_pydeck_polygons,
+    "simplify_medium": simplify_case("medium"),
+    "simplify_low": simplify_case("low"),
+}
+
+
+# ---------------------
+# Runner
+# ---------------------
+def time_case(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": round(statistics.median(times), 2), "min_ms": round(min(times), 2), "runs": repeat}
+
+
+def dataset(scale):
+    ds = synth.dataset_dir(scale)
+    if not (ds / "meta.json").exists():
+        print(f"generating {scale}x dataset...")
+        synth.write_dataset(scale)
+    return ds
+
+
+def run(scales, cases, repeat):
+    results = {}
+    for scale in scales:
+        ds = dataset(scale)
+        meta = json.loads((ds / "meta.json").read_text())
+        results[str(scale)] = {"meta": meta, "cases": {}}
+        for name in cases:
+            try:
+                fn = CASES[name](ds)
+                r = time_case(fn, repeat)
+            except Exception as e:  # record where things break instead of stopping
+                r = {"error": f"{type(e).__name__}: {e}"}
+            results[str(scale)]["cases"][name] = r
+            shown = f"{r['median_ms']:>10.1f} ms" if "median_ms" in r else r["error"]
+            print(f"{scale:>5}x  {name:<18} {shown}")
+    return results
+
+
+def commit_id():
+    try:
+        sha = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+                             capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_DIR,
+                               capture_output=True, text=True).stdout.strip()
+        return sha + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def save(results, commit):
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    path = RESULTS_DIR / f"{commit}.json"
+    doc = {"commit": commit, "timestamp": time.time(), "python": platform.python_version(),
+           "platform": platform.platform(), "pandas": pd.__version__, "results": results}
+    path.write_text(json.dumps(doc, indent=2))
+    return path
+
+
+def compare(results, other_commit):
+    other = json.loads((RESULTS_DIR / f"{other_commit}.json").read_text())["results"]
+    rows = []
+    for scale, r in results.items():
+        for name, cur in r["cases"].items():
+            old = other.get(scale, {}).get("cases", {}).get(name, {})
+            if "median_ms" in cur and "median_ms" in old:
+                rows.append({"scale": f"{scale}x", "case": name, "before_ms": old["median_ms"],
+                             "after_ms": cur["median_ms"], "ratio": round(cur["median_ms"] / old["median_ms"], 2)})
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--scales", type=int, nargs="+", default=[1, 10], choices=list(synth.SCALES))
+    ap.add_argument("--cases", nargs="+", default=list(CASES), choices=list(CASES))
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--compare", metavar="COMMIT", help="compare against benchmarks/results/<COMMIT>.json")
+    ap.add_argument("--no-save", action="store_true")
+    args = ap.parse_args()
+
+    results = run(args.scales, args.cases, args.repeat)
+    if not args.no_save:
+        print("saved", save(results, commit_id()))
+    if args.compare:
+        print(compare(results, args.compare).to_string(index=False))
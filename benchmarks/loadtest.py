@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Concurrent-session load test for the Streamlit apps.
+
+Drives N simulated sessions headlessly with streamlit.testing's AppTest, all
+in this process (so they share caches the way sessions in one server worker
+do). Each session runs a scripted scenario: pick reps, type searches, trigger
+downloads. Every rerun is timed.
+
+AppTest installs process-wide state for each run (a mock Runtime, the pages
+manager, config patches), so two runs on different threads break each other.
+Reruns therefore go through one lock: sessions interleave rerun by rerun, and
+each latency is the time of the rerun alone. Threads the app starts itself
+(e.g. the datastore's background loads) still run concurrently.
+
+Reports p50/p95/p99 rerun latency, reruns/sec and RSS growth, and can save the
+result as a baseline or compare against one:
+
+    python benchmarks/loadtest.py --app app --sessions 20
+    python benchmarks/loadtest.py --app all --sessions 20 --save-baseline
+    python benchmarks/loadtest.py --app all --sessions 20 --compare   # exit 1 on regression
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+APP_DIR = REPO_DIR / "streamlit_app"
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+
+sys.path.insert(0, str(APP_DIR))
+
+from memory_report import rss_mb  # noqa: E402
+
+# AppTest.run isn't thread-safe; see the module docstring
+_RUN_LOCK = threading.Lock()
+
+SEARCHES = ["pet", "sny", "kwal", "ivory", "harp", "smi", "lee", "mc"]
+
+# p95 may grow by this factor over the baseline before --compare fails
+REGRESSION_TOLERANCE = 1.25
+
+
+# ---------------------
+# Scenarios
+# ---------------------
+class Session:
+    """One simulated viewer: an AppTest plus the latency of each rerun."""
+
+    def __init__(self, app_path, timeout, seed):
+        from streamlit.testing.v1 import AppTest
+        self.at = AppTest.from_file(str(app_path), default_timeout=timeout)
+        self.rng = random.Random(seed)
+        self.latencies = []
+        self.errors = []
+
+    def run(self, element=None):
+        with _RUN_LOCK:
+            start = time.perf_counter()
+            try:
+                (element or self.at).run()
+            except Exception as e:
+                self.errors.append(str(e))
+            self.latencies.append(time.perf_counter() - start)
+        if self.at.exception:
+            self.errors.append(self.at.exception[0].message)
+
+    def find(self, lookup):
+        """The element lookup(self.at) returns, or None if the last rerun didn't
+        render it (a rerun error, or a fragment that changed its widgets)."""
+        try:
+            return lookup(self.at)
+        except (KeyError, IndexError):
+            return None
+
+    def pick(self, selectbox):
+        options = list(selectbox.options) if selectbox is not None else []
+        if options:
+            self.run(selectbox.select(self.rng.choice(options)))
+
+
+def _search_box(at):
+    return at.sidebar.text_input(key="rep_query")
+
+
+def _rep_picker(at):
+    return at.sidebar.selectbox[0]
+
+
+def scenario_app(s: Session, steps):
+    """app.py: pick reps, fuzzy search, prepare + fetch CSV downloads.
+
+    Elements are looked up again before every interaction: an element from an
+    earlier rerun may no longer exist (the picker gets a new identity when its
+    options change). A step whose widget is missing is skipped."""
+    s.run()
+    for _ in range(steps):
+        if s.at.exception:
+            return
+        action = s.rng.choice(["pick", "search", "download"])
+        if action == "pick":
+            s.pick(s.find(_rep_picker))
+        elif action == "search":
+            query = s.rng.choice(SEARCHES)
+            # type it a character at a time, like a person would
+            for i in range(1, len(query) + 1):
+                box = s.find(_search_box)
+                if box is None:
+                    break
+                s.run(box.input(query[:i]))
+            s.pick(s.find(_rep_picker))
+            box = s.find(_search_box)
+            if box is not None:
+                s.run(box.input(""))
+        else:
+            prepare = [b for b in s.at.button if b.label.startswith("Prepare CSV")]
+            if prepare:
+                s.run(prepare[0].click())
+
+
+def scenario_select_only(s: Session, steps):
+    """geodata_app.py / pages/page_2.py: flip between reps in the sidebar."""
+    s.run()
+    for _ in range(steps):
+        picker = s.find(_rep_picker)
+        if s.at.exception or picker is None:
+            return
+        s.pick(picker)
+
+
+APPS = {
+    "app": (APP_DIR / "app.py", scenario_app),
+    "geodata_app": (APP_DIR / "geodata_app.py", scenario_select_only),
+    "page_2": (APP_DIR / "pages" / "page_2.py", scenario_select_only),
+}
+
+
+# ---------------------
+# Runner
+# ---------------------
+def percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    k = (len(values) - 1) * q / 100
+    lo, hi = int(k), min(int(k) + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+
+def run_load(app_name, n_sessions=10, concurrency=4, steps=10, timeout=60, seed=0):
+    app_path, scenario = APPS[app_name]
+    rss_start = rss_mb()
+    lock = threading.Lock()
+    sessions = []
+
+    def one(i):
+        s = Session(app_path, timeout, seed + i)
+        scenario(s, steps)
+        with lock:
+            sessions.append(s)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(n_sessions)))
+    wall = time.perf_counter() - start
+
+    latencies = [x for s in sessions for x in s.latencies]
+    errors = [e for s in sessions for e in s.errors]
+    ms = lambda v: round(v * 1000, 1) if v is not None else None
+    return {
+        "app": app_name,
+        "sessions": n_sessions,
+        "concurrency": concurrency,
+        "steps": steps,
+        "seed": seed,
+        "reruns": len(latencies),
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "p50_ms": ms(percentile(latencies, 50)),
+        "p95_ms": ms(percentile(latencies, 95)),
+        "p99_ms": ms(percentile(latencies, 99)),
+        "mean_ms": ms(statistics.fmean(latencies)) if latencies else None,
+        "reruns_per_sec": round(len(latencies) / wall, 2) if wall else None,
+        "wall_s": round(wall, 2),
+        "rss_growth_mb": round(rss_mb() - rss_start, 1),
+    }
+
+
+def baseline_path(app_name):
+    return BASELINE_DIR / f"loadtest_{app_name}.json"
+
+
+def compare(result, baseline, tolerance=REGRESSION_TOLERANCE):
+    """List of regression messages (empty if none)."""
+    problems = []
+    for metric in ("p50_ms", "p95_ms", "p99_ms", "rss_growth_mb"):
+        old, new = baseline.get(metric), result.get(metric)
+        if old and new and new > old * tolerance:
+            problems.append(f"{result['app']}: {metric} {old} -> {new} (>{tolerance:.0%} of baseline)")
+    if result["errors"] > baseline.get("errors", 0):
+        problems.append(f"{result['app']}: errors {baseline.get('errors', 0)} -> {result['errors']}")
+    return problems
+
+
+def print_result(r):
+    print(f"{r['app']:<12} sessions={r['sessions']} reruns={r['reruns']} errors={r['errors']}  "
+          f"p50={r['p50_ms']}ms p95={r['p95_ms']}ms p99={r['p99_ms']}ms  "
+          f"{r['reruns_per_sec']} reruns/s  rss +{r['rss_growth_mb']}MB")
+    if r["first_error"]:
+        print(f"{'':<12} first error: {r['first_error']}")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--app", choices=list(APPS) + ["all"], default="app")
+    ap.add_argument("--sessions", type=int, default=10)
+    ap.add_argument("--concurrency", type=int, default=4)
+    ap.add_argument("--steps", type=int, default=10, help="interactions per session")
+    ap.add_argument("--timeout", type=float, default=60)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--save-baseline", action="store_true")
+    ap.add_argument("--compare", action="store_true")
+    args = ap.parse_args()
+
+    names = list(APPS) if args.app == "all" else [args.app]
+    regressions = []
+    for name in names:
+        result = run_load(name, args.sessions, args.concurrency, args.steps, args.timeout, args.seed)
+        print_result(result)
+        if args.save_baseline:
+            BASELINE_DIR.mkdir(parents=True, exist_ok=True)
+            baseline_path(name).write_text(json.dumps(result, indent=2))
+        if args.compare:
+            path = baseline_path(name)
+            if not path.exists():
+                print(f"{'':<12} no baseline at {path}")
+                continue
+            regressions += compare(result, json.loads(path.read_text()))
+
+    for msg in regressions:
+        print("REGRESSION:", msg)
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Synthetic scale-up datasets for the benchmarks.
+
+Takes today's data (one state, one session: 959 bills, 104 legislators) and
+multiplies it by adding sessions and states:
+
+    scale   states  sessions   bills      legislators
+    1x      1       1          ~960       104
+    10x     1       10         ~9.6k      104
+    100x    10      10         ~96k       1,040
+    1000x   50      20         ~960k      5,200
+
+The extra states reuse the real district geometries, shifted on the map.
+Their legislators get names drawn from a small pool of surnames and first
+names, so sponsors like "Owens, D." collide within a state and across
+states, the way they do in real multi-state data. Earlier sessions are
+copies of the 2025 bills shifted back a year at a time and tagged with a
+Session column.
+
+Each dataset is written to benchmarks/data/scale_<n>x/ in the app's formats:
+combinedBills.json, repKPIs.json, reps_geo.geojson, plus a billlist.html
+shaped like le.utah.gov/billlist.jsp for the scraper parser.
+
+    python benchmarks/synth.py --scales 1 10 100
+"""
+import argparse
+import html
+import json
+import random
+from pathlib import Path
+
+import geopandas as gpd
+import pandas as pd
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+SRC_DIR = REPO_DIR / "streamlit_app" / "data"
+OUT_DIR = Path(__file__).resolve().parent / "data"
+
+SCALES = {1: (1, 1), 10: (1, 10), 100: (10, 10), 1000: (50, 20)}
+BASE_SESSION_YEAR = 2025
+MS_PER_YEAR = 365 * 24 * 3600 * 1000
+STATE_LON_SHIFT = 9.0  # degrees between copies of the district map
+
+COMMON_SURNAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Miller", "Davis", "Anderson", "Taylor",
+    "Thomas", "Moore", "Jackson", "Martin", "Lee", "Owens", "Peterson", "Christensen", "Hansen",
+    "Jensen", "Larsen", "Nielsen", "Young", "Allen", "King", "Wright", "Hall", "Walker",
+]
+FIRST_NAMES = [
+    "David", "Daniel", "Douglas", "Derrin", "Karen", "Kay", "Kim", "Michael", "Mike", "Mark",
+    "Jennifer", "Jen", "James", "John", "Joseph", "Sarah", "Susan", "Steve", "Scott", "Robert",
+    "Rachel", "Nancy", "Neil", "Carol", "Chris", "Angela", "Anthony", "Brady", "Brian",
+]
+
+DATE_MS_COLS = ["Bill Date Raw", "Bill Date (utc_iso)", "Date Passed", "Gov's Action Date",
+                "Effective Date", "Scrape Timestamp"]
+
+
+def load_source():
+    bills = pd.read_json(SRC_DIR / "combinedBills_2025.json", orient="records")
+    repkpis = pd.read_json(SRC_DIR / "repKPIs_2025.json", orient="records")
+    geo = pd.concat(
+        [gpd.read_file(SRC_DIR / f"reps_with_geo_data_{p}.geojson") for p in ("a", "b")],
+        ignore_index=True,
+    )
+    return bills, repkpis, geo
+
+
+def _state_names(geo, rng):
+    """{real sponsor: (Representative, Bill Sponsor)} for a synthetic state."""
+    surnames = COMMON_SURNAMES + geo["Bill Sponsor"].str.split(",").str[0].dropna().tolist()
+    out = {}
+    for sponsor in geo["Bill Sponsor"].dropna():
+        first, last = rng.choice(FIRST_NAMES), rng.choice(surnames)
+        out[sponsor] = (f"{first} {last}", f"{last}, {first[0]}.")
+    return out
+
+
+def generate(scale, seed=0):
+    n_states, n_sessions = SCALES[scale]
+    rng = random.Random(seed)
+    bills, repkpis, geo = load_source()
+
+    bill_parts, kpi_parts, geo_parts = [], [], []
+    for s in range(n_states):
+        state = f"S{s:02d}"
+        names = {} if s == 0 else _state_names(geo, rng)
+        rename_rep = lambda col: col.map(lambda v: names.get(v, (v, v))[0])
+        rename_sponsor = lambda col: col.map(lambda v: names.get(v, (v, v))[1])
+
+        g = geo.copy()
+        if s:
+            g["Representative"] = rename_rep(g["Bill Sponsor"])
+            g["Bill Sponsor"] = rename_sponsor(g["Bill Sponsor"])
+            g["geometry"] = g.geometry.translate(xoff=STATE_LON_SHIFT * s)
+            g["lon"] = g["lon"] + STATE_LON_SHIFT * s
+        g["Img_ID"] = state + "_" + g["Img_ID"].astype(str)
+        g["DistrictKey"] = state + " " + g["DistrictKey"].astype(str)
+        g["State"] = state
+        geo_parts.append(g)
+
+        k = repkpis.copy()
+        if s:
+            k["Representative"] = rename_rep(k["Bill Sponsor"])
+            k["Bill Sponsor"] = rename_sponsor(k["Bill Sponsor"])
+        k["State"] = state
+        kpi_parts.append(k)
+
+        for y in range(n_sessions):
+            b = bills.copy()
+            if s:
+                b["Bill Sponsor"] = rename_sponsor(b["Bill Sponsor"])
+            for col in DATE_MS_COLS:
+                if col in b.columns and pd.api.types.is_numeric_dtype(b[col]):
+                    b[col] = b[col] - y * MS_PER_YEAR
+            b["Session"] = f"{BASE_SESSION_YEAR - y}GS"
+            b["State"] = state
+            bill_parts.append(b)
+
+    return (
+        pd.concat(bill_parts, ignore_index=True),
+        pd.concat(kpi_parts, ignore_index=True),
+        gpd.GeoDataFrame(pd.concat(geo_parts, ignore_index=True), crs=geo.crs),
+    )
+
+
+def billlist_html(bills):
+    """A page shaped like billlist.jsp: group titles, then one <li> per bill."""
+    out = ["<html><body>"]
+    for category, group in bills.groupby("Category", sort=False):
+        out.append(f'<div class="grouptitle">{html.escape(str(category))}</div><ul>')
+        for num, title, sponsor in group[["Bill Number", "Bill Title", "Bill Sponsor"]].itertuples(index=False):
+            code = str(num).replace(" ", "")
+            out.append(
+                f'<li><a class="billlink" href="/~2025/bills/static/{code}.html">{html.escape(str(num))}</a> '
+                f"<b>{html.escape(str(title))}</b> <i>(Rep. {html.escape(str(sponsor))})</i> "
+                f"<em>Mon, 20 Jan 2025 10:00:00 MST</em></li>"
+            )
+        out.append("</ul>")
+    out.append("</body></html>")
+    return "\n".join(out)
+
+
+def dataset_dir(scale):
+    return OUT_DIR / f"scale_{scale}x"
+
+
+def write_dataset(scale, seed=0):
+    out = dataset_dir(scale)
+    out.mkdir(parents=True, exist_ok=True)
+    bills, repkpis, geo = generate(scale, seed)
+    bills.to_json(out / "combinedBills.json", orient="records")
+    repkpis.to_json(out / "repKPIs.json", orient="records")
+    geo.to_file(out / "reps_geo.geojson", driver="GeoJSON")
+    (out / "billlist.html").write_text(billlist_html(bills), encoding="utf-8")
+    meta = {"scale": scale, "seed": seed, "bills": len(bills), "reps": len(geo),
+            "states": SCALES[scale][0], "sessions": SCALES[scale][1]}
+    (out / "meta.json").write_text(json.dumps(meta, indent=2))
+    return out, meta
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--scales", type=int, nargs="+", default=[1, 10], choices=list(SCALES))
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+    for scale in args.scales:
+        out, meta = write_dataset(scale, args.seed)
+        print(f"{scale}x -> {out}: {meta['bills']} bills, {meta['reps']} reps")
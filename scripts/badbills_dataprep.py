@@ -162,14 +162,24 @@ updates['Process Tag'] = updates['Process Tag'].str.strip()
 # Convert Date to datetime format
 updates['Date'] = pd.to_datetime(updates['Date'], errors='coerce')
 
-# Convert Day of Legislature to int, handling NaN values
-updates['Day of Legislature'] = pd.to_numeric(updates['Day of Legislature'], errors='coerce').fillna(0).astype(int)
+# Day of Legislature comes from the date instead of the hand-filled sheet column.
+# legislative_calendar.py (streamlit_app/ in the repo) knows each session's start/end
+# and the state holidays, so this is one vectorized call for the whole column.
+# Dates outside the session stay empty (Int64 NA) instead of becoming day 0.
+# Run from a checkout (python scripts/badbills_dataprep.py) the module is found
+# next to this script; in Colab, run from the cloned repo's root.
+import sys
+from pathlib import Path
+REPO_DIR = Path(__file__).resolve().parent.parent if "__file__" in globals() else Path.cwd()
+sys.path.insert(0, str(REPO_DIR / "streamlit_app"))
+from legislative_calendar import session_day
+updates['Day of Legislature'] = pd.array(session_day(updates['Date']), dtype='Int64')
 
 # Drop duplicates if necessary
 updates.drop_duplicates(subset=['Bill Number', 'Notecard', 'Process Tag', 'Date'], inplace=True)
 
 # Fill missing values if needed (adjust based on context)
-updates.fillna({'Process Tag': 'Unknown', 'Day of Legislature': 0}, inplace=True)
+updates.fillna({'Process Tag': 'Unknown'}, inplace=True)
 
 # Print summary to verify changes
 print(updates.info())
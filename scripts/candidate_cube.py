@@ -0,0 +1,161 @@
+# candidate_cube.py
+"""
+Candidate-filing cube for dashboard_2_0.py.
+
+cleaned_candidates_data.csv is grouped once, at the finest grain:
+
+    Cycle x scope (statewide/district) x judge x on_ballot x Office x District x Party
+
+Each cell holds the candidate count and the ", " joined ballot names. Every
+chart in the dashboard is a filter + small groupby over that cube, never a
+rescan of the filings. Files from several cycles can be concatenated (a
+Cycle column, or pass cycle= per file) and they land in the same cube.
+
+    python scripts/candidate_cube.py data/cleaned_candidates_data.csv
+"""
+
+import sys
+
+import pandas as pd
+
+NAME_COL = "Name on Ballot"
+BALLOT_STATUSES = ("Election Candidate", "Write-In")
+JUDGE_PARTY = "NO PARTY"
+JUDGE_OFFICES = ("Judge", "Justice")
+STATEWIDE_DISTRICT = "0"
+DEFAULT_CYCLE = "2024"
+
+CUBE_KEYS = ["Cycle", "scope", "judge", "on_ballot", "Office", "District", "Party"]
+
+
+# ---------------------
+# Load + flags
+# ---------------------
+def load_candidates(paths, cycle=DEFAULT_CYCLE) -> pd.DataFrame:
+    """Read one or more filing CSVs and add the flag columns used as cube keys."""
+    if isinstance(paths, (str, bytes)) or not hasattr(paths, "__iter__"):
+        paths = [paths]
+    frames = []
+    for p in paths:
+        df = pd.read_csv(p, dtype={"District": str})
+        if "Cycle" not in df.columns:
+            df["Cycle"] = cycle
+        frames.append(df)
+    return add_flags(pd.concat(frames, ignore_index=True))
+
+
+def add_flags(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    df["Cycle"] = df["Cycle"].astype(str)
+    df["District"] = df["District"].fillna("").astype(str).str.strip()
+    df["Party"] = df["Party"].fillna(JUDGE_PARTY)
+    df["scope"] = df["District"].eq(STATEWIDE_DISTRICT).map({True: "statewide", False: "district"})
+    df["judge"] = df["Party"].eq(JUDGE_PARTY) | df["Office"].isin(JUDGE_OFFICES)
+    df["on_ballot"] = df["Status"].isin(BALLOT_STATUSES)
+    return df
+
+
+# ---------------------
+# Cube
+# ---------------------
+def build_cube(df: pd.DataFrame) -> pd.DataFrame:
+    """One groupby over all the filings: count + joined names per cell."""
+    return (
+        df.groupby(CUBE_KEYS, sort=False, observed=True)[NAME_COL]
+        .agg(count="size", names=", ".join)
+        .reset_index()
+    )
+
+
+class CandidateCube:
+    """Slices of the candidate cube.
+
+    Filters are any of the cube keys, e.g. on_ballot=True, judge=False,
+    scope="district", Office="State House", Cycle="2024".
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.cube = build_cube(df)
+
+    @classmethod
+    def from_csv(cls, paths, cycle=DEFAULT_CYCLE):
+        return cls(load_candidates(paths, cycle))
+
+    def slice(self, **filters) -> pd.DataFrame:
+        cube = self.cube
+        for col, value in filters.items():
+            if value is None:
+                continue
+            cube = cube[cube[col] == value]
+        return cube
+
+    def rollup(self, by, **filters) -> pd.DataFrame:
+        """Counts + names summed over every key not in by."""
+        return (
+            self.slice(**filters)
+            .groupby(by, sort=False)
+            .agg(count=("count", "sum"), names=("names", ", ".join))
+            .reset_index()
+        )
+
+    def by_office_party(self, **filters) -> pd.DataFrame:
+        return self.rollup(["Office", "Party"], **filters)
+
+    def by_district(self, office, **filters) -> pd.DataFrame:
+        """District x Party for one office, districts in numeric order."""
+        out = self.rollup(["District", "Party"], Office=office, **filters)
+        # numeric districts as numbers (2 before 10), named ones after
+        out["_num"] = pd.to_numeric(out["District"], errors="coerce")
+        out = out.sort_values(["_num", "District"], na_position="last", kind="stable")
+        return out.drop(columns="_num").reset_index(drop=True)
+
+    def offices(self, **filters):
+        return self.slice(**filters)["Office"].drop_duplicates().tolist()
+
+
+# ---------------------
+# Figures
+# ---------------------
+def office_party_bar(grouped, title, color="Party", color_map=None):
+    import plotly.express as px
+
+    return px.bar(
+        grouped,
+        x="Office",
+        y="count",
+        color=color,
+        title=title,
+        labels={"count": "Count of Candidates"},
+        barmode="stack",
+        color_discrete_map=color_map,
+    )
+
+
+def district_bar(grouped, office, color_map=None):
+    import plotly.express as px
+
+    fig = px.bar(
+        grouped,
+        x="District",
+        y="count",
+        color="Party",
+        text="names",  # Show candidate names on the bars
+        title=f"{office} Candidates by District and Party",
+        labels={"count": "Count of Candidates"},
+        barmode="stack",
+        color_discrete_map=color_map,
+    )
+    fig.update_traces(textposition="inside", textangle=0, textfont_size=10, insidetextanchor="middle")
+    # keep the cube's district order, only the districts that have candidates
+    fig.update_layout(xaxis={"type": "category", "categoryorder": "array",
+                             "categoryarray": grouped["District"].drop_duplicates().tolist()})
+    return fig
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("usage: python scripts/candidate_cube.py <cleaned_candidates_data.csv> [...]")
+        sys.exit(2)
+    cube = CandidateCube.from_csv(sys.argv[1:])
+    print(f"{len(cube.cube)} cells")
+    print(cube.by_office_party(on_ballot=True, judge=False).to_string(index=False))
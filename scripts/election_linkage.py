@@ -0,0 +1,186 @@
+# election_linkage.py
+"""
+Link candidates, current officials and incumbents across the election CSVs.
+
+The files' record_id (FIRST-OFFICE-DISTRICT, e.g. JOHN-US SENATE-0) isn't
+unique: two Lairds file for US Senate, and PHIL LYMAN-GOVERNOR-0 shows up
+twice. It's also built from the ballot first name, so "Mike" and "Michael"
+don't meet. Instead, every row gets normalized composite keys:
+
+    seat_key    OFFICE|DISTRICT                  STATE HOUSE|30
+    person_key  OFFICE|DISTRICT|LAST|F           STATE HOUSE|30|ROHNER|J
+    name_key    LAST|F                           ROHNER|J  (same person, any seat)
+
+The keys are built with vectorized string ops. The files are joined with
+hash merges on those keys, and the lookups below are dict gets on prebuilt
+groupby indices.
+
+    python scripts/election_linkage.py data/
+"""
+
+import sys
+import unicodedata
+from pathlib import Path
+
+import pandas as pd
+
+CANDIDATES_FILE = "cleaned_candidates_data.csv"
+OFFICIALS_FILE = "current_officials.csv"
+INCUMBENTS_FILE = "incumbents.csv"
+
+BALLOT_STATUSES = ("Election Candidate", "Write-In")
+PARTY_NAMES = {"R": "REPUBLICAN", "D": "DEMOCRATIC", "L": "LIBERTARIAN", "U": "UNAFFILIATED"}
+SUFFIXES = r"\b(JR|SR|II|III|IV)\b"
+
+
+# ---------------------
+# Key normalization (vectorized)
+# ---------------------
+def _fold(s: pd.Series) -> pd.Series:
+    return s.fillna("").astype(str).map(
+        lambda v: "".join(ch for ch in unicodedata.normalize("NFKD", v) if not unicodedata.combining(ch))
+    )
+
+
+def norm_text(s: pd.Series) -> pd.Series:
+    """Uppercase, punctuation dropped, whitespace collapsed."""
+    return (
+        _fold(s).str.upper()
+        .str.replace(r"[^A-Z0-9 ]", "", regex=True)
+        .str.replace(r"\s+", " ", regex=True)
+        .str.strip()
+    )
+
+
+def norm_district(s: pd.Series) -> pd.Series:
+    """'07' / '7.0' -> '7'; named districts (courts) normalized as text."""
+    num = pd.to_numeric(s, errors="coerce")
+    out = norm_text(s)
+    is_num = num.notna()
+    out[is_num] = num[is_num].astype(int).astype(str)
+    return out
+
+
+def norm_last(s: pd.Series) -> pd.Series:
+    return norm_text(s).str.replace(SUFFIXES, "", regex=True).str.replace(" ", "", regex=False)
+
+
+def add_keys(df: pd.DataFrame, first_col="First Name", last_col="Last Name") -> pd.DataFrame:
+    df = df.copy()
+    df["seat_key"] = norm_text(df["Office"]) + "|" + norm_district(df["District"])
+    df["name_key"] = norm_last(df[last_col]) + "|" + norm_text(df[first_col]).str[:1]
+    df["person_key"] = df["seat_key"] + "|" + df["name_key"]
+    if "Party" in df.columns:
+        party = norm_text(df["Party"])
+        df["party_norm"] = party.map(PARTY_NAMES).fillna(party)
+    return df
+
+
+# ---------------------
+# Linkage
+# ---------------------
+class ElectionLinkage:
+    """Candidates, officials and incumbents joined on composite keys.
+
+    links: one row per candidate with the seat's current official(s), if any
+    (names joined with "; ", plus official_count) and is_incumbent /
+    incumbent_running / listed_incumbent flags.
+    """
+
+    def __init__(self, candidates: pd.DataFrame, officials: pd.DataFrame, incumbents: pd.DataFrame = None):
+        self.candidates = add_keys(candidates)
+        self.officials = add_keys(officials).drop_duplicates("person_key")
+        self.incumbents = add_keys(incumbents) if incumbents is not None else self.candidates.iloc[0:0]
+
+        # candidate x seat's official(s) (hash join on seat_key). Some seats have
+        # more than one sitting official (US SENATE|0), so officials are first
+        # collapsed to one row per seat; otherwise the join would fan out.
+        officials = (
+            self.officials.groupby("seat_key", sort=False)
+            .agg(
+                official_name=("Name", "; ".join),
+                official_party=("party_norm", lambda s: "; ".join(s.dropna().unique())),
+                official_count=("person_key", "size"),
+            )
+            .reset_index()
+        )
+        links = self.candidates.merge(officials, on="seat_key", how="left", validate="many_to_one")
+        assert len(links) == len(self.candidates), "seat join duplicated candidates"
+        links["official_count"] = links["official_count"].fillna(0).astype(int)
+        # person_key includes the seat, so this is "is one of the seat's officials"
+        links["is_incumbent"] = links["person_key"].isin(set(self.officials["person_key"]))
+        links["listed_incumbent"] = links["person_key"].isin(set(self.incumbents["person_key"]))
+        links["on_ballot"] = links["Status"].isin(BALLOT_STATUSES)
+        running = links.loc[links["on_ballot"] & (links["is_incumbent"] | links["listed_incumbent"]), "seat_key"]
+        links["incumbent_running"] = links["seat_key"].isin(set(running))
+        self.links = links
+
+        # indexes
+        self.candidates_by_seat = links.groupby("seat_key", sort=False).indices
+        self.candidate_by_person = links.groupby("person_key", sort=False).indices
+        self.official_by_person = dict(zip(self.officials["person_key"], range(len(self.officials))))
+        self.officials_by_seat = self.officials.groupby("seat_key", sort=False).indices
+        self.officials_by_name = self.officials.groupby("name_key", sort=False).indices
+
+    # ---------------------
+    # Lookups
+    # ---------------------
+    def challengers(self, official_key, on_ballot=True) -> pd.DataFrame:
+        """Candidates for the official's seat, other than the official."""
+        pos = self.official_by_person.get(official_key)
+        if pos is None:
+            return self.links.iloc[0:0]
+        seat = self.officials["seat_key"].iat[pos]
+        rows = self.links.iloc[self.candidates_by_seat.get(seat, [])]
+        rows = rows[rows["person_key"] != official_key]
+        return rows[rows["on_ballot"]] if on_ballot else rows
+
+    def incumbent_for(self, candidate_key) -> pd.DataFrame:
+        """Current official(s) of the seat this candidate is running for."""
+        rows = self.candidate_by_person.get(candidate_key)
+        if rows is None:
+            return self.officials.iloc[0:0]
+        seat = self.links["seat_key"].iat[rows[0]]
+        return self.officials.iloc[self.officials_by_seat.get(seat, [])]
+
+    def current_office(self, candidate_key) -> pd.DataFrame:
+        """Offices this candidate holds now, in any seat (e.g. a senator running for Congress)."""
+        rows = self.candidate_by_person.get(candidate_key)
+        if rows is None:
+            return self.officials.iloc[0:0]
+        name = self.links["name_key"].iat[rows[0]]
+        return self.officials.iloc[self.officials_by_name.get(name, [])]
+
+    def open_seats(self) -> pd.DataFrame:
+        """Seats on the ballot with no incumbent running, with their candidate counts."""
+        ballot = self.links[self.links["on_ballot"] & ~self.links["incumbent_running"]]
+        return (
+            ballot.groupby(["seat_key", "Office", "District"], sort=False)
+            .agg(candidates=("person_key", "nunique"), official=("official_name", "first"))
+            .reset_index()
+            .sort_values("seat_key")
+            .reset_index(drop=True)
+        )
+
+    def unlinked_incumbents(self) -> pd.DataFrame:
+        """incumbents.csv rows that match no current official (bad data or a seat change)."""
+        return self.incumbents[~self.incumbents["person_key"].isin(self.official_by_person)]
+
+
+def load_linkage(data_dir) -> ElectionLinkage:
+    data_dir = Path(data_dir)
+    read = lambda name: pd.read_csv(data_dir / name, dtype={"District": str})
+    incumbents = read(INCUMBENTS_FILE) if (data_dir / INCUMBENTS_FILE).exists() else None
+    return ElectionLinkage(read(CANDIDATES_FILE), read(OFFICIALS_FILE), incumbents)
+
+
+if __name__ == "__main__":
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else Path(__file__).resolve().parent.parent / "data"
+    link = load_linkage(data_dir)
+    links = link.links
+    print(f"{len(links)} candidates, {int(links['is_incumbent'].sum())} matched to the sitting official")
+    print(f"{len(link.open_seats())} open seats")
+    unlinked = link.unlinked_incumbents()
+    if not unlinked.empty:
+        print("incumbents with no matching official:")
+        print(unlinked[["Name on Ballot", "Office", "District"]].to_string(index=False))
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Publish the data as a static JSON API for index.html.
+
+The front end shouldn't have to download the whole 519 KB combinedBills or
+the district geometry to show one rep. This writes small documents, each
+named by a hash of its content:
+
+    api/manifest.json                   -> logical name -> hashed file (the only unhashed file)
+    api/reps/index.<hash>.json          every rep: key, name, party, district, KPIs
+    api/reps/<rep_key>.<hash>.json      one rep: attributes, KPIs, committees, bills
+    api/districts/<H-1>.<hash>.json     one district: rep, counties, simplified geometry
+    api/bills/page-<n>.<hash>.json      all bills, newest first, PAGE_SIZE per page
+
+Every shard also gets .gz and .br (if brotli is installed) copies next to it.
+Hashed files never change, so they can be served with
+"Cache-Control: max-age=31536000, immutable". The manifest is written last,
+atomically, and should be served with a short max-age. A page fetches the
+manifest, then only the shards it needs:
+
+    python scripts/publish_api.py              # -> api/
+    python scripts/publish_api.py --prune      # also delete shards no longer in the manifest
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+API_DIR = REPO_DIR / "api"
+sys.path.insert(0, str(REPO_DIR / "streamlit_app"))
+
+import pandas as pd  # noqa: E402
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+PAGE_SIZE = 100
+HASH_LEN = 10
+SCHEMA_VERSION = 1
+
+REP_FIELDS = ["rep_key", "display_name", "Party_geo", "Chamber", "DistrictKey", "County(ies)",
+              "Email", "Webpage", "Img_URL"]
+BILL_FIELDS = ["Bill Number", "Bill Title", "Category", "Bill Sponsor", "Bill Status",
+               "bill_date_parsed (display)", "Date Passed (display)", "Governor's Action", "Bill URL", "rep_key"]
+KPI_FIELDS = ["total_bills", "passed_bills", "failed_bills", "pass_rate"]
+
+
+# ---------------------
+# Writing shards
+# ---------------------
+def _records(df, fields):
+    cols = [c for c in fields if c in df.columns]
+    return json.loads(df[cols].to_json(orient="records", date_format="iso"))
+
+
+def _encode(doc):
+    return json.dumps(doc, ensure_ascii=False, separators=(",", ":"), sort_keys=True, default=str).encode("utf-8")
+
+
+def _atomic_write(path, data):
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+class Publisher:
+    """Writes content-hashed shards (+ .gz/.br) and collects the manifest."""
+
+    def __init__(self, out_dir=API_DIR):
+        self.out_dir = Path(out_dir)
+        self.shards = {}
+        self.raw_bytes = 0
+
+    def put(self, name, doc):
+        """name like 'reps/index' -> writes reps/index.<hash>.json, returns its path."""
+        data = _encode(doc)
+        digest = hashlib.sha256(data).hexdigest()[:HASH_LEN]
+        rel = f"{name}.{digest}.json"
+        path = self.out_dir / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if not path.exists():  # same content, same name: nothing to do
+            _atomic_write(path, data)
+            _atomic_write(path.with_name(path.name + ".gz"), gzip.compress(data, compresslevel=9, mtime=0))
+            if brotli is not None:
+                _atomic_write(path.with_name(path.name + ".br"), brotli.compress(data, quality=11))
+        self.shards[name] = rel
+        self.raw_bytes += len(data)
+        return rel
+
+    def write_manifest(self, extra):
+        manifest = {"schema": SCHEMA_VERSION, "generated": int(time.time()), "shards": self.shards, **extra}
+        data = _encode(manifest)
+        _atomic_write(self.out_dir / "manifest.json", data)
+        _atomic_write(self.out_dir / "manifest.json.gz", gzip.compress(data, compresslevel=9, mtime=0))
+        return manifest
+
+    def prune(self):
+        """Delete hashed shards that the current manifest doesn't reference."""
+        keep = set(self.shards.values())
+        removed = 0
+        for path in self.out_dir.rglob("*.json*"):
+            rel = path.relative_to(self.out_dir).as_posix()
+            base = rel.removesuffix(".gz").removesuffix(".br")
+            if base != "manifest.json" and base not in keep:
+                path.unlink()
+                removed += 1
+        return removed
+
+
+# ---------------------
+# Documents
+# ---------------------
+def district_slug(key):
+    """'H 1' -> 'H-1' (safe in a URL path)."""
+    return str(key).strip().replace(" ", "-")
+
+
+def publish(store, pub: Publisher, page_size=PAGE_SIZE):
+    from geo import simplify
+
+    reps = pd.DataFrame(store.reps.drop(columns="geometry"))
+    kpis = store.kpi_engine.rep_kpis[KPI_FIELDS]
+    # KPIs from the bills themselves, not the precomputed repKPIs columns
+    reps = reps.drop(columns=KPI_FIELDS, errors="ignore").join(kpis, on="rep_key")
+    bills = store.bills.sort_values("bill_date_parsed", ascending=False, na_position="last")
+
+    # reps index
+    index = _records(reps, REP_FIELDS + KPI_FIELDS)
+    for row in index:
+        row["district"] = district_slug(row.get("DistrictKey", ""))
+    pub.put("reps/index", {"reps": index})
+
+    # one document per rep
+    bills_by_rep = bills.groupby("rep_key", sort=False).indices
+    for rec in index:
+        key = rec["rep_key"]
+        rows = bills_by_rep.get(key, [])
+        doc = {
+            "rep": rec,
+            "committees": _records(store.committees.committees_for(key), ["Committee", "Role"]),
+            "bills": _records(bills.iloc[rows], BILL_FIELDS),
+        }
+        pub.put(f"reps/{key}", doc)
+
+    # one document per district (simplified geometry)
+    geo = simplify(store.reps[["rep_key", "DistrictKey", "Chamber", "County(ies)", "geometry"]], "medium")
+    features = geo.geometry.__geo_interface__["features"]
+    for row, feat in zip(geo.drop(columns="geometry").to_dict(orient="records"), features):
+        pub.put(f"districts/{district_slug(row['DistrictKey'])}", {**row, "geometry": feat["geometry"]})
+
+    # paginated bills
+    n_pages = max(1, -(-len(bills) // page_size))
+    for page in range(n_pages):
+        chunk = bills.iloc[page * page_size:(page + 1) * page_size]
+        pub.put(f"bills/page-{page + 1}", {"page": page + 1, "pages": n_pages, "bills": _records(chunk, BILL_FIELDS)})
+
+    return {"data_version": store.version, "page_size": page_size, "pages": n_pages,
+            "counts": {"reps": len(reps), "bills": len(bills)}}
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--out", type=Path, default=API_DIR)
+    ap.add_argument("--page-size", type=int, default=PAGE_SIZE)
+    ap.add_argument("--prune", action="store_true", help="delete shards no longer in the manifest")
+    args = ap.parse_args()
+
+    from datastore import build_datastore
+
+    pub = Publisher(args.out)
+    extra = publish(build_datastore(), pub, args.page_size)
+    pub.write_manifest(extra)
+    print(f"Published {len(pub.shards)} shards ({pub.raw_bytes / 1e3:.0f} KB raw) to {args.out}"
+          + ("" if brotli else " (brotli not installed: .gz only)"))
+    if args.prune:
+        print(f"Pruned {pub.prune()} stale files")
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Pre-render a static HTML profile page for every rep.
+
+app.py builds a rep's profile live on every visit, but the data only changes
+when the pipeline runs. This writes the same profile (KPIs, pass-rate bar,
+committees, bills table, district outline) once per rep as plain HTML next to
+index.html, so a visit only costs a file read:
+
+    reps/index.html          list of every rep, linking to their page
+    reps/<rep_key>.html      one rep
+    reps/manifest.json       rep_key -> hash of that page's inputs
+
+The district outline is an inline SVG built from the simplified geometry, so
+a page is a single request apart from the photo and Bootstrap.
+
+Builds are incremental. Each page's inputs (rep attributes, KPIs, committees,
+bills, outline) are collected into a plain dict and hashed together with
+TEMPLATE_VERSION. Only pages whose hash differs from the manifest, or whose
+file is missing, are rendered. Rendering runs in worker processes.
+
+    python scripts/render_rep_pages.py              # render what changed
+    python scripts/render_rep_pages.py --force      # render everything
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+OUT_DIR = REPO_DIR / "reps"
+MANIFEST_PATH = OUT_DIR / "manifest.json"
+sys.path.insert(0, str(REPO_DIR / "streamlit_app"))
+
+import pandas as pd  # noqa: E402
+
+# bump when the markup below changes so every page is re-rendered
+TEMPLATE_VERSION = 1
+
+BOOTSTRAP_CSS = "https://cdn.jsdelivr.net/npm/bootstrap@5.0.2/dist/css/bootstrap.min.css"
+FALLBACK_URL = "https://le.utah.gov/Documents/find.htm"
+PARTY_NAMES = {"R": "Republican", "D": "Democrat"}
+BILL_COLS = ["Bill Number", "Bill Title", "Bill Status", "Date Passed", "Effective Date", "Bill URL"]
+SVG_SIZE = 320
+SVG_LEVEL = "medium"
+
+
+# ---------------------
+# Page inputs (main process)
+# ---------------------
+def _text(value, default=""):
+    return default if value is None or (isinstance(value, float) and pd.isna(value)) else str(value)
+
+
+def outline_rings(geom):
+    """Exterior rings of a (Multi)Polygon as [[x, y], ...] lists, 5 decimals."""
+    from geo import shapely_to_pydeck_polygons
+    return [[[round(x, 5), round(y, 5)] for x, y in ring] for ring in shapely_to_pydeck_polygons(geom)]
+
+
+def photo_src(rep):
+    """Photo path relative to reps/ when it's cached locally, else the le.utah.gov URL."""
+    from photos import photo_for
+    src = photo_for(rep.get("Img_ID"), rep.get("Img_URL"), size="md")
+    if src and Path(src).is_absolute():
+        return Path(os.path.relpath(src, OUT_DIR)).as_posix()
+    return _text(src)
+
+
+def page_inputs(store):
+    """{rep_key: dict of everything its page shows}. Plain JSON types only."""
+    from data_prep import BILL_DATE_SORT_COL, display_col
+    from geo import simplify
+
+    kpis = store.kpi_engine.rep_kpis
+    geoms = simplify(store.reps[["rep_key", "geometry"]], SVG_LEVEL).set_index("rep_key").geometry
+    bills = store.bills.sort_values(BILL_DATE_SORT_COL, ascending=False)
+    bills_by_rep = bills.groupby("rep_key", sort=False).indices
+
+    pages = {}
+    for rep in store.reps.drop(columns="geometry").to_dict(orient="records"):
+        key = rep["rep_key"]
+        if not key:
+            continue
+        k = kpis.loc[key] if key in kpis.index else {}
+        rows = bills.iloc[bills_by_rep.get(key, [])]
+        table = pd.DataFrame({c: rows[display_col(c)] if display_col(c) in rows.columns else rows[c]
+                              for c in BILL_COLS if c in rows.columns})
+        pages[key] = {
+            "name": _text(rep.get("display_name")),
+            "district": _text(rep.get("DistrictKey")),
+            "party": PARTY_NAMES.get(_text(rep.get("Party_geo")).upper(), "Unknown"),
+            "counties": _text(rep.get("County(ies)"), "Unknown"),
+            "email": _text(rep.get("Email"), "Unknown"),
+            "webpage": _text(rep.get("Webpage")) or FALLBACK_URL,
+            "photo": photo_src(rep),
+            "kpis": {c: (0 if pd.isna(k.get(c, 0)) else round(float(k.get(c, 0)), 1))
+                     for c in ["total_bills", "passed_bills", "failed_bills", "pass_rate"]},
+            "committees": store.committees.committees_for(key)[["Committee", "Role"]].values.tolist(),
+            "bills": json.loads(table.fillna("").to_json(orient="split", index=False)),
+            "outline": outline_rings(geoms.get(key)),
+        }
+    return pages
+
+
+def input_hash(inputs):
+    data = json.dumps([TEMPLATE_VERSION, inputs], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]
+
+
+# ---------------------
+# Rendering (worker processes: plain dicts in, HTML out)
+# ---------------------
+def district_label(district):
+    if district[:1].upper() == "H":
+        return "House District " + district[1:].strip()
+    if district[:1].upper() == "S":
+        return "Senate District " + district[1:].strip()
+    return district or "Unknown"
+
+
+def outline_svg(rings, size=SVG_SIZE):
+    """Inline SVG of the district, scaled to fit a size x size box (north up)."""
+    points = [p for ring in rings for p in ring]
+    if not points:
+        return '<p class="text-muted"><em>No district geometry available.</em></p>'
+    xs, ys = [p[0] for p in points], [p[1] for p in points]
+    x0, y1 = min(xs), max(ys)
+    span = max(max(xs) - x0, y1 - min(ys)) or 1.0
+    scale = (size - 10) / span
+    paths = []
+    for ring in rings:
+        d = " ".join(f"{(x - x0) * scale + 5:.1f},{(y1 - y) * scale + 5:.1f}" for x, y in ring)
+        paths.append(f"M{d}Z")
+    return (f'<svg viewBox="0 0 {size} {size}" width="100%" style="max-width:{size}px" role="img" '
+            f'aria-label="District outline"><path d="{" ".join(paths)}" fill="rgba(200,30,0,0.3)" '
+            f'stroke="#000" stroke-width="1"/></svg>')
+
+
+def status_bar(kpis):
+    total = kpis["total_bills"] or 0
+    if not total:
+        return ""
+    passed = kpis["passed_bills"] / total * 100
+    failed = kpis["failed_bills"] / total * 100
+    return (f'<div class="progress" style="height:24px">'
+            f'<div class="progress-bar bg-success" style="width:{passed:.1f}%" title="Passed"></div>'
+            f'<div class="progress-bar bg-danger" style="width:{failed:.1f}%" title="Failed"></div></div>')
+
+
+def bills_table(bills):
+    cols, rows = bills["columns"], bills["data"]
+    if not rows:
+        return "<p><em>No bills available for this rep.</em></p>"
+    esc = html.escape
+    head = "".join(f"<th>{esc(c)}</th>" for c in cols if c != "Bill URL")
+    body = []
+    for row in rows:
+        rec = dict(zip(cols, row))
+        url = rec.pop("Bill URL", "")
+        cells = []
+        for c, v in rec.items():
+            v = esc(str(v))
+            cells.append(f'<td><a href="{esc(url)}">{v}</a></td>' if c == "Bill Number" and url else f"<td>{v}</td>")
+        body.append("<tr>" + "".join(cells) + "</tr>")
+    return (f'<table class="table table-sm table-striped"><thead><tr>{head}</tr></thead>'
+            f'<tbody>{"".join(body)}</tbody></table>')
+
+
+def render_page(page):
+    esc = html.escape
+    k = page["kpis"]
+    committees = "".join(f"<li><strong>{esc(c)}</strong> — {esc(r)}</li>" for c, r in page["committees"])
+    photo = f'<img src="{esc(page["photo"])}" class="img-fluid mb-3" alt="{esc(page["name"])}">' if page["photo"] else ""
+    return f"""<!doctype html>
+<html lang="en">
+<head>
+    <meta charset="utf-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1">
+    <link href="{BOOTSTRAP_CSS}" rel="stylesheet">
+    <title>{esc(page["name"])} | Election Time</title>
+</head>
+<body>
+<nav class="navbar navbar-dark bg-dark"><div class="container-fluid">
+    <a class="navbar-brand" href="../index.html">Election Time</a>
+    <a class="nav-link text-light" href="index.html">All reps</a>
+</div></nav>
+<main class="container my-4">
+    <div class="row">
+        <div class="col-md-5">
+            <h2>{esc(page["name"])}</h2>
+            <p>{esc(district_label(page["district"]))}</p>
+            {photo}
+            <div class="row text-center mb-2">
+                <div class="col"><div class="text-muted">Failed</div><div class="fs-3">{k["failed_bills"]:g}</div></div>
+                <div class="col"><div class="text-muted">Passed</div><div class="fs-3">{k["passed_bills"]:g}</div></div>
+                <div class="col"><div class="text-muted">Total bills</div><div class="fs-3">{k["total_bills"]:g}</div></div>
+            </div>
+            {status_bar(k)}
+            <p class="mt-2">Pass rate: <strong>{k["pass_rate"]:.1f}%</strong></p>
+        </div>
+        <div class="col-md-7">
+            <h4>District map</h4>
+            {outline_svg(page["outline"])}
+            <p class="mt-3"><a class="btn btn-outline-dark btn-sm" href="{esc(page["webpage"])}">Go to website</a></p>
+            <p>Party: {esc(page["party"])}<br>Count(ies): {esc(page["counties"])}<br>Email: {esc(page["email"])}</p>
+        </div>
+    </div>
+    <h4 class="mt-4">Bills overview</h4>
+    {bills_table(page["bills"])}
+    <hr>
+    <h4>Committee Assignments</h4>
+    {f"<ul>{committees}</ul>" if committees else "<p><em>No committee data available for this representative.</em></p>"}
+</main>
+</body>
+</html>
+"""
+
+
+def render_index(pages):
+    esc = html.escape
+    items = "".join(
+        f'<li><a href="{esc(key)}.html">{esc(p["name"])}</a> <span class="text-muted">'
+        f'{esc(district_label(p["district"]))}, {esc(p["party"])}</span></li>'
+        for key, p in sorted(pages.items(), key=lambda kv: kv[1]["name"])
+    )
+    return f"""<!doctype html>
+<html lang="en">
+<head>
+    <meta charset="utf-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1">
+    <link href="{BOOTSTRAP_CSS}" rel="stylesheet">
+    <title>Representatives | Election Time</title>
+</head>
+<body>
+<main class="container my-4">
+    <h2>Representatives</h2>
+    <ul>{items}</ul>
+</main>
+</body>
+</html>
+"""
+
+
+def _render_to(args):
+    key, page, out_dir = args
+    path = Path(out_dir) / f"{key}.html"
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(render_page(page), encoding="utf-8")
+    os.replace(tmp, path)
+    return key
+
+
+# ---------------------
+# Incremental build
+# ---------------------
+def load_manifest(path=MANIFEST_PATH):
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8")).get("pages", {})
+
+
+def build(store, out_dir=OUT_DIR, force=False, workers=None, verbose=True):
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = out_dir / MANIFEST_PATH.name
+
+    start = time.perf_counter()
+    pages = page_inputs(store)
+    hashes = {key: input_hash(page) for key, page in pages.items()}
+    old = {} if force else load_manifest(manifest_path)
+    todo = [key for key in pages
+            if old.get(key) != hashes[key] or not (out_dir / f"{key}.html").exists()]
+
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(_render_to, [(key, pages[key], str(out_dir)) for key in todo], chunksize=8))
+
+    # pages for reps that are gone
+    removed = [key for key in old if key not in pages]
+    for key in removed:
+        (out_dir / f"{key}.html").unlink(missing_ok=True)
+
+    (out_dir / "index.html").write_text(render_index(pages), encoding="utf-8")
+    tmp = manifest_path.with_name(manifest_path.name + ".tmp")
+    tmp.write_text(json.dumps({"template": TEMPLATE_VERSION, "data_version": store.version,
+                               "pages": hashes}, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, manifest_path)
+
+    if verbose:
+        print(f"{len(todo)} of {len(pages)} pages rendered, {len(pages) - len(todo)} unchanged, "
+              f"{len(removed)} removed ({time.perf_counter() - start:.1f}s) -> {out_dir}")
+    return todo
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--out", type=Path, default=OUT_DIR)
+    ap.add_argument("--force", action="store_true", help="re-render every page")
+    ap.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    args = ap.parse_args()
+
+    from datastore import build_datastore
+
+    build(build_datastore(), args.out, force=args.force, workers=args.workers)
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Local cache of legislator photos + thumbnails.
+
+Reads Img_ID / Img_URL from the reps geojson, downloads any photo we don't
+already have under assets/img/rep_photos/<chamber>/2025/, dedups them by
+content hash and writes fixed-size WebP + JPEG thumbnails. The app then serves
+photos from disk (see streamlit_app/photos.py) instead of hotlinking le.utah.gov.
+
+    python scripts/rep_photos.py                        # download missing + thumbnails
+    python scripts/rep_photos.py --stand-in ./fixtures  # same, against a local server
+    python scripts/rep_photos.py --serve ./fixtures     # just run the stand-in server
+
+The stand-in server serves a directory laid out like le.utah.gov
+(images/legislator/house/XXXX.jpg) so the pipeline can be exercised without
+touching the real site.
+"""
+import argparse
+import hashlib
+import json
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from PIL import Image
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+GEO_PATHS = [
+    REPO_DIR / "streamlit_app" / "data" / "reps_with_geo_data_a.geojson",
+    REPO_DIR / "streamlit_app" / "data" / "reps_with_geo_data_b.geojson",
+]
+PHOTO_ROOT = REPO_DIR / "assets" / "img" / "rep_photos"
+MANIFEST_PATH = PHOTO_ROOT / "manifest.json"
+SESSION_YEAR = "2025"
+
+CHAMBER_DIRS = {"House": "state_house", "Senate": "state_senate"}
+
+# thumbnail widths in px; height is capped at 5:4 portrait
+THUMB_SIZES = {"sm": 96, "md": 240, "lg": 480}
+THUMB_FORMATS = {"webp": "WEBP", "jpg": "JPEG"}
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                  "AppleWebKit/537.36 (KHTML, like Gecko) "
+                  "Chrome/120.0 Safari/537.36"
+}
+
+
+# ---------------------
+# Inputs
+# ---------------------
+def load_photo_list(paths=GEO_PATHS):
+    """[{Img_ID, Img_URL, Chamber}] from the reps geojson parts."""
+    reps = []
+    for p in paths:
+        if not Path(p).exists():
+            continue
+        with open(p, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        features = data["features"] if isinstance(data, dict) else data
+        for feat in features:
+            props = feat.get("properties", feat)
+            if props.get("Img_ID") and props.get("Img_URL"):
+                reps.append({
+                    "Img_ID": props["Img_ID"],
+                    "Img_URL": props["Img_URL"],
+                    "Chamber": props.get("Chamber", "House"),
+                })
+    return reps
+
+
+def original_path(rep, root=PHOTO_ROOT):
+    chamber_dir = CHAMBER_DIRS.get(rep["Chamber"], "state_house")
+    return root / chamber_dir / SESSION_YEAR / f"{rep['Img_ID']}.jpg"
+
+
+def rebase_url(url, base_url):
+    """Swap scheme+host of url for base_url (used for the stand-in server)."""
+    if not base_url:
+        return url
+    parts = urlsplit(url)
+    base = urlsplit(base_url)
+    return urlunsplit((base.scheme, base.netloc, parts.path, parts.query, ""))
+
+
+# ---------------------
+# Download
+# ---------------------
+def fetch(url, timeout=20):
+    r = requests.get(url, headers=HEADERS, timeout=timeout)
+    r.raise_for_status()
+    return r.content
+
+
+def download_missing(reps, root=PHOTO_ROOT, base_url=None, workers=8, verbose=True):
+    """Download photos that aren't on disk yet, concurrently.
+
+    Returns {Img_ID: error message} for the ones that failed.
+    """
+    todo = [r for r in reps if not original_path(r, root).exists()]
+    if verbose:
+        print(f"{len(reps) - len(todo)} photos cached, {len(todo)} to download")
+    errors = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(fetch, rebase_url(r["Img_URL"], base_url)): r for r in todo}
+        for fut in as_completed(futures):
+            rep = futures[fut]
+            try:
+                content = fut.result()
+            except Exception as e:
+                errors[rep["Img_ID"]] = str(e)
+                continue
+            dest = original_path(rep, root)
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            tmp = dest.with_suffix(".part")
+            tmp.write_bytes(content)
+            tmp.replace(dest)
+    if verbose and errors:
+        print(f"{len(errors)} downloads failed:", ", ".join(sorted(errors)))
+    return errors
+
+
+# ---------------------
+# Dedup + thumbnails
+# ---------------------
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def thumb_name(digest, size_name, ext):
+    # thumbnails are keyed by content, so identical photos share one set
+    return f"{digest[:16]}_{size_name}.{ext}"
+
+
+def make_thumbnails(data: bytes, digest, thumb_dir: Path):
+    """Write every THUMB_SIZES x THUMB_FORMATS variant that doesn't exist yet."""
+    thumb_dir.mkdir(parents=True, exist_ok=True)
+    img = None
+    written = {}
+    for size_name, width in THUMB_SIZES.items():
+        for ext, fmt in THUMB_FORMATS.items():
+            out = thumb_dir / thumb_name(digest, size_name, ext)
+            written.setdefault(size_name, {})[ext] = out.name
+            if out.exists():
+                continue
+            if img is None:
+                img = Image.open(BytesIO(data)).convert("RGB")
+            thumb = img.copy()
+            thumb.thumbnail((width, int(width * 1.25)), Image.LANCZOS)
+            thumb.save(out, fmt, quality=82)
+    return written
+
+
+def build_manifest(reps, root=PHOTO_ROOT):
+    """Hash every cached original, make thumbnails once per unique photo and
+    return the manifest dict {"thumb_dir", "sizes", "photos": {Img_ID: ...}}."""
+    thumb_dir = root / "thumbs"
+    by_hash = {}
+    photos = {}
+    for rep in reps:
+        src = original_path(rep, root)
+        if not src.exists():
+            continue
+        data = src.read_bytes()
+        digest = content_hash(data)
+        if digest not in by_hash:
+            by_hash[digest] = make_thumbnails(data, digest, thumb_dir)
+        photos[rep["Img_ID"]] = {
+            "sha256": digest,
+            "original": src.relative_to(root).as_posix(),
+            "thumbs": by_hash[digest],
+        }
+    return {
+        "thumb_dir": thumb_dir.relative_to(root).as_posix(),
+        "sizes": THUMB_SIZES,
+        "photos": photos,
+        "unique_photos": len(by_hash),
+    }
+
+
+def write_manifest(manifest, path=MANIFEST_PATH):
+    tmp = Path(path).with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    tmp.replace(path)
+
+
+# ---------------------
+# Stand-in server
+# ---------------------
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def serve_directory(directory, port=0):
+    """Serve directory over http on localhost in a daemon thread.
+
+    Returns (server, base_url); call server.shutdown() when done.
+    """
+    handler = partial(_QuietHandler, directory=str(directory))
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, bound_port = server.server_address[:2]
+    return server, f"http://{host}:{bound_port}"
+
+
+def run(base_url=None, root=PHOTO_ROOT, workers=8, verbose=True):
+    reps = load_photo_list()
+    errors = download_missing(reps, root=root, base_url=base_url, workers=workers, verbose=verbose)
+    manifest = build_manifest(reps, root=root)
+    write_manifest(manifest, root / MANIFEST_PATH.name)
+    if verbose:
+        print(f"{len(manifest['photos'])} photos in manifest, "
+              f"{manifest['unique_photos']} unique, thumbnails in {manifest['thumb_dir']}/")
+    return manifest, errors
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--base-url", help="fetch from this host instead of le.utah.gov")
+    ap.add_argument("--stand-in", metavar="DIR", help="serve DIR locally and fetch from it")
+    ap.add_argument("--serve", metavar="DIR", help="only run the stand-in server on DIR")
+    ap.add_argument("--port", type=int, default=0)
+    ap.add_argument("--workers", type=int, default=8)
+    args = ap.parse_args()
+
+    if args.serve:
+        server, url = serve_directory(args.serve, args.port)
+        print(f"Serving {args.serve} at {url} (Ctrl+C to stop)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
+        sys.exit(0)
+
+    server = None
+    base_url = args.base_url
+    if args.stand_in:
+        server, base_url = serve_directory(args.stand_in, args.port)
+    try:
+        _, failed = run(base_url=base_url, workers=args.workers)
+    finally:
+        if server:
+            server.shutdown()
+    sys.exit(1 if failed else 0)
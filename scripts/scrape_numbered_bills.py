@@ -48,7 +48,10 @@ def parse_date(dt_text):
 def scrape_billlist(url=BASE_URL, pause=0.5, verbose=True):
     r = requests.get(url, headers=HEADERS, timeout=20)
     r.raise_for_status()
-    html = r.text
+    return parse_billlist(r.text, base_url=url, pause=pause, verbose=verbose)
+
+def parse_billlist(html, base_url=BASE_URL, pause=0.0, verbose=True):
+    """Parse a billlist.jsp page (live or saved) into one row per bill."""
     soup = BeautifulSoup(html, "html.parser")
 
     bill_anchors = soup.find_all("a", class_="billlink")
@@ -57,11 +60,11 @@ def scrape_billlist(url=BASE_URL, pause=0.5, verbose=True):
 
     rows = []
     if bill_anchors:
-        for a in tqdm(bill_anchors, desc="Scraping bills", unit="bill"):
+        for a in tqdm(bill_anchors, desc="Scraping bills", unit="bill", disable=not verbose):
             try:
                 bill_number = a.get_text(strip=True)
                 href = a.get("href", "")
-                bill_url = urljoin(BASE_URL, href) if href else None
+                bill_url = urljoin(base_url, href) if href else None
 
                 li = a.find_parent("li") or a.parent
 
@@ -94,7 +97,8 @@ def scrape_billlist(url=BASE_URL, pause=0.5, verbose=True):
             except Exception as e:
                 if verbose:
                     print("Error parsing anchor:", e)
-            time.sleep(pause)
+            if pause:
+                time.sleep(pause)
     else:
         print("No anchors with class 'billlink' found.")
 
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Watch the data directories and rebuild only what a change affects.
+
+RULES is the dependency graph: each rule names its input files, the files it
+writes and a build function. When files change, the affected rules are the
+ones reading a changed file, plus (transitively) the ones reading what those
+rules write. They run in RULES order, which is topological.
+
+    combinedBills + reps geojson     -> crosswalk       -> streamlit_app/data/sponsor_crosswalk.json
+    data/from_equality_utah.txt      -> advocacy_tags   -> streamlit_app/data/advocacy_tags_2025.json
+    app data files + crosswalk/tags  -> bundle          -> streamlit_app/data/data_bundle.tar (if zstandard)
+    repKPIs                          -> committee_edges -> streamlit_app/data/committee_edges_2025.json
+    app data + crosswalk             -> duckdb          -> streamlit_app/data/electiontime.duckdb (if installed)
+    app data + crosswalk             -> static_api      -> api/       (scripts/publish_api.py)
+    app data + crosswalk + photos    -> rep_pages       -> reps/      (scripts/render_rep_pages.py)
+
+combinedBills_2025.json and repKPIs_2025.json are not built here. They are
+still produced by the ExtractData_CreateJson notebook, which merges the
+scrape (data/utah_bills_2025.json) with the legislature's passed-bills
+exports and the roster sheets. Those inputs aren't all in the repo, so a
+new scrape alone does not reach the app. When the notebook writes new
+files into streamlit_app/data/, everything downstream of them is rebuilt.
+
+Changes are debounced: a rebuild starts once nothing has changed for
+--debounce seconds, so a notebook copying several files triggers one rebuild.
+Every output file is written to a temp file and swapped in with os.replace,
+so a reader never sees a half-written file. The running app notices the new
+data version on its next rerun and keeps serving the old datastore until the
+new one has been built in the background (see datastore.get_datastore).
+
+Uses watchdog when it's installed, otherwise polls file mtimes.
+
+    python scripts/watch_pipeline.py                  # watch until Ctrl-C
+    python scripts/watch_pipeline.py --once           # rebuild everything once
+    python scripts/watch_pipeline.py --once --dry-run streamlit_app/data/combinedBills_2025.json
+"""
+import argparse
+import os
+import queue
+import sys
+import time
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+RAW_DIR = REPO_DIR / "data"
+APP_DATA_DIR = REPO_DIR / "streamlit_app" / "data"
+sys.path.insert(0, str(REPO_DIR / "streamlit_app"))
+sys.path.insert(0, str(REPO_DIR / "scripts"))
+
+import pandas as pd  # noqa: E402
+
+from advocacy import SOURCES, TAGS_PATH, ingest_all  # noqa: E402
+from bundle import BUNDLE_PATH, SCHEMAS  # noqa: E402
+from committees import EDGES_PATH, build_committee_edges  # noqa: E402
+from datastore import BILLS_PATH, DATA_PATHS, GEO_PATH_A, GEO_PATH_B, REPKPIS_PATH  # noqa: E402
+from entity_resolution import CROSSWALK_PATH, resolve  # noqa: E402
+
+WATCH_DIRS = [RAW_DIR, APP_DATA_DIR]
+PHOTO_MANIFEST = REPO_DIR / "assets" / "img" / "rep_photos" / "manifest.json"
+CANDIDATES_PATH = RAW_DIR / "cleaned_candidates_data.csv"
+DEBOUNCE_S = 2.0
+POLL_S = 1.0
+STORE_INPUTS = list(DATA_PATHS)  # includes the crosswalk, advocacy tags and the bundle
+
+
+# ---------------------
+# Build steps
+# ---------------------
+# Each step gets stage(path) -> temp path. Whatever it writes to staged paths is
+# swapped in with os.replace after the step succeeds; steps that write whole
+# directories (api/, reps/) handle their own atomicity.
+def build_crosswalk(stage, ctx):
+    import geopandas as gpd
+    from entity_resolution import write_crosswalk
+    bills = pd.read_json(BILLS_PATH, orient="records")
+    reps = pd.concat([gpd.read_file(p) for p in (GEO_PATH_A, GEO_PATH_B)], ignore_index=True)
+    write_crosswalk(resolve(bills, reps), stage(CROSSWALK_PATH))
+
+
+def build_data_bundle(stage, ctx):
+    import bundle
+    if bundle.zstd is None:
+        print("  zstandard not installed, skipped")
+        return
+    bundle.build_bundle(out=stage(bundle.BUNDLE_PATH))
+
+
+def build_committee_edges_file(stage, ctx):
+    from committees import write_edges
+    write_edges(build_committee_edges(pd.read_json(REPKPIS_PATH, orient="records")), stage(EDGES_PATH))
+
+
+def build_advocacy_tags(stage, ctx):
+    from advocacy import write_tags
+    write_tags(ingest_all(), stage(TAGS_PATH))
+
+
+def build_duckdb(stage, ctx):
+    import db
+    if db.duckdb is None:
+        print("  duckdb not installed, skipped")
+        return
+    db.build_db(ctx.store(), stage(db.DB_PATH), CANDIDATES_PATH)
+
+
+def build_static_api(stage, ctx):
+    import publish_api
+    pub = publish_api.Publisher()
+    pub.write_manifest(publish_api.publish(ctx.store(), pub))
+    pub.prune()
+
+
+def build_rep_pages(stage, ctx):
+    import render_rep_pages
+    render_rep_pages.build(ctx.store(), verbose=False)
+
+
+# name -> (inputs, outputs, build)
+RULES = {
+    "crosswalk": ([BILLS_PATH, GEO_PATH_A, GEO_PATH_B], [CROSSWALK_PATH], build_crosswalk),
+    "advocacy_tags": ([cfg["path"] for cfg in SOURCES.values()], [TAGS_PATH], build_advocacy_tags),
+    "bundle": ([APP_DATA_DIR / name for name in SCHEMAS], [BUNDLE_PATH], build_data_bundle),
+    "committee_edges": ([REPKPIS_PATH], [EDGES_PATH], build_committee_edges_file),
+    "duckdb": (STORE_INPUTS + [CANDIDATES_PATH], [APP_DATA_DIR / "electiontime.duckdb"], build_duckdb),
+    "static_api": (STORE_INPUTS, [], build_static_api),
+    "rep_pages": (STORE_INPUTS + [PHOTO_MANIFEST], [], build_rep_pages),
+}
+OUTPUTS = {Path(p) for _, outs, _ in RULES.values() for p in outs}
+
+
+def affected(changed, rules=RULES):
+    """Rule names to run for a set of changed paths, in RULES order."""
+    dirty = {Path(p).resolve() for p in changed}
+    todo = []
+    for name, (inputs, outputs, _) in rules.items():
+        if any(Path(p).resolve() in dirty for p in inputs):
+            todo.append(name)
+            dirty.update(Path(p).resolve() for p in outputs)
+    return todo
+
+
+class BuildContext:
+    """Shared state for one rebuild: the datastore is built once, on first use."""
+
+    def __init__(self):
+        self._store = None
+
+    def store(self):
+        if self._store is None:
+            from datastore import build_datastore
+            self._store = build_datastore()
+        return self._store
+
+
+def run_rule(name, ctx, rules=RULES):
+    staged = {}
+
+    def stage(path):
+        path = Path(path)
+        tmp = path.with_name(f".{path.name}.tmp")
+        staged[tmp] = path
+        return tmp
+
+    start = time.perf_counter()
+    try:
+        rules[name][2](stage, ctx)
+        for tmp, path in staged.items():
+            os.replace(tmp, path)
+    except Exception as e:
+        for tmp in staged:
+            Path(tmp).unlink(missing_ok=True)
+        print(f"  {name}: FAILED {type(e).__name__}: {e}")
+        return False
+    print(f"  {name}: {time.perf_counter() - start:.1f}s")
+    return True
+
+
+def rebuild(changed, dry_run=False):
+    todo = affected(changed)
+    names = ", ".join(Path(p).name for p in sorted(changed)) or "nothing"
+    print(f"changed: {names} -> {', '.join(todo) or 'no rules'}")
+    if dry_run or not todo:
+        return todo
+    # the datastore is built on first use, i.e. after crosswalk & co. have run
+    ctx = BuildContext()
+    for name in todo:
+        run_rule(name, ctx)
+    return todo
+
+
+# ---------------------
+# Watching
+# ---------------------
+def _watched(path):
+    path = Path(path)
+    # temp files are ours; outputs are rebuilt via their inputs, not watched themselves
+    return not path.name.startswith(".") and not path.name.endswith(".tmp") and path not in OUTPUTS
+
+
+def _snapshot(dirs):
+    out = {}
+    for d in dirs:
+        for p in Path(d).glob("*"):
+            if p.is_file() and _watched(p):
+                st = p.stat()
+                out[p] = (st.st_mtime_ns, st.st_size)
+    return out
+
+
+def poll_events(dirs, events, interval=POLL_S):
+    """Put changed paths on the queue, by comparing mtime/size snapshots."""
+    before = _snapshot(dirs)
+    while True:
+        time.sleep(interval)
+        now = _snapshot(dirs)
+        for p in set(before) | set(now):
+            if before.get(p) != now.get(p):
+                events.put(p)
+        before = now
+
+
+def start_watchdog(dirs, events):
+    """Observer feeding the queue, or None if watchdog isn't installed."""
+    try:
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+    except ImportError:
+        return None
+
+    class Handler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            if event.is_directory:
+                return
+            for p in (event.src_path, getattr(event, "dest_path", None)):
+                if p and _watched(p):
+                    events.put(Path(p))
+
+    observer = Observer()
+    for d in dirs:
+        observer.schedule(Handler(), str(d), recursive=False)
+    observer.start()
+    return observer
+
+
+def watch(dirs=WATCH_DIRS, debounce=DEBOUNCE_S, dry_run=False):
+    import threading
+
+    events = queue.Queue()
+    observer = start_watchdog(dirs, events)
+    if observer is None:
+        threading.Thread(target=poll_events, args=(dirs, events), daemon=True).start()
+    print(f"watching {', '.join(str(d) for d in dirs)} ({'watchdog' if observer else 'polling'})")
+    try:
+        while True:
+            changed = {events.get()}
+            # debounce: keep collecting until it's been quiet for `debounce` seconds
+            while True:
+                try:
+                    changed.add(events.get(timeout=debounce))
+                except queue.Empty:
+                    break
+            rebuild({p.resolve() for p in changed}, dry_run=dry_run)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if observer is not None:
+            observer.stop()
+            observer.join()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("paths", nargs="*", type=Path, help="with --once: treat these as changed (default: all inputs)")
+    ap.add_argument("--once", action="store_true", help="rebuild once and exit instead of watching")
+    ap.add_argument("--debounce", type=float, default=DEBOUNCE_S)
+    ap.add_argument("--dry-run", action="store_true", help="print which rules would run")
+    args = ap.parse_args()
+
+    if args.once:
+        changed = args.paths or {p for inputs, _, _ in RULES.values() for p in inputs}
+        rebuild(changed, dry_run=args.dry_run)
+    else:
+        watch(debounce=args.debounce, dry_run=args.dry_run)
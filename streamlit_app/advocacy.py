@@ -0,0 +1,209 @@
+# advocacy.py
+"""
+Advocacy-site bill tags (stance + status) joined onto the bills table.
+
+Advocacy groups publish the bills they track as HTML cards. A source is
+described by a selector config instead of code. Each card becomes one record,
+and each field is a "tag.class" selector (with "@attr" to read an attribute
+instead of the text):
+
+    "equality_utah": {
+        "path": ROOT_DATA_DIR / "from_equality_utah.txt",
+        "card": "li",
+        "fields": {"status": "div.status_tag", "bill": "div.eyebrow", "title": "h4", ...},
+    }
+
+The markup is fed through html.parser in chunks, so a page is parsed in one
+pass without building a DOM. Bill numbers are normalized to the "HB 5" form
+used in combinedBills_2025.json ("H.B. 5", "HB0005" and "1st Sub. HB 5" all
+become "HB 5").
+
+    python streamlit_app/advocacy.py   # writes data/advocacy_tags_2025.json
+"""
+
+import json
+import re
+from html.parser import HTMLParser
+from pathlib import Path
+
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "data"
+ROOT_DATA_DIR = BASE_DIR.parent / "data"
+TAGS_PATH = DATA_DIR / "advocacy_tags_2025.json"
+
+CHUNK_SIZE = 64 * 1024
+VOID_TAGS = {"br", "img", "hr", "input", "meta", "link", "source", "wbr"}
+
+SOURCES = {
+    "equality_utah": {
+        "path": ROOT_DATA_DIR / "from_equality_utah.txt",
+        "card": "li",
+        "fields": {
+            "status": "div.status_tag",
+            "bill": "div.eyebrow",
+            "title": "h4",
+            "summary": "div.small",
+            "url": "a.wp-block-button__link@href",
+        },
+        # regexes run over a captured field: new_field -> (field, pattern)
+        "extract": {"status_detail": ("summary", r"Status:\s*(.+?)\s*$")},
+        # the cards don't say for/against, only that the bill is tracked
+        "stance": "tracked",
+    },
+}
+
+TAG_COLS = ["source", "bill_key", "bill", "title", "stance", "status", "status_detail", "url"]
+
+
+# ---------------------
+# Bill numbers
+# ---------------------
+_SUB_PREFIX = re.compile(r"^\s*\d+(?:ST|ND|RD|TH)\s+SUB(?:STITUTE)?\.?\s*", re.I)
+_BILL = re.compile(r"^\s*((?:[A-Z]\.?\s*){1,4}?)\s*0*(\d+)")
+
+
+def norm_bill_number(value):
+    """'H.B. 5' / 'HB0005' / '1st Sub. HB 5' / 'HB 5S01' -> 'HB 5' (None if not a bill number)."""
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return None
+    s = _SUB_PREFIX.sub("", str(value).upper())
+    m = _BILL.match(s)
+    if not m:
+        return None
+    prefix = re.sub(r"[^A-Z]", "", m.group(1))
+    return f"{prefix} {int(m.group(2))}"
+
+
+# ---------------------
+# Streaming card parser
+# ---------------------
+def parse_selector(selector):
+    """'a.wp-block-button__link@href' -> ('a', 'wp-block-button__link', 'href')"""
+    selector, _, attr = selector.partition("@")
+    tag, _, cls = selector.partition(".")
+    return tag.lower(), cls or None, attr or None
+
+
+def _matches(sel, tag, attrs):
+    want_tag, want_cls, _ = sel
+    if tag != want_tag:
+        return False
+    if want_cls is None:
+        return True
+    classes = (dict(attrs).get("class") or "").split()
+    return want_cls in classes
+
+
+class CardParser(HTMLParser):
+    """Collects one dict per card. Feed it chunks; read .records."""
+
+    def __init__(self, card, fields):
+        super().__init__(convert_charrefs=True)
+        self.card = parse_selector(card)
+        self.fields = {name: parse_selector(sel) for name, sel in fields.items()}
+        self.records = []
+        self._record = None
+        self._depth = 0          # open tags inside the current card
+        self._capture = None     # (field, depth it opened at, text parts)
+
+    def handle_starttag(self, tag, attrs):
+        if self._record is None:
+            if _matches(self.card, tag, attrs):
+                self._record = {}
+                self._depth = 1
+            return
+        if tag not in VOID_TAGS:
+            self._depth += 1
+        if self._capture is not None:
+            self._capture[2].append(" ")  # keep words in adjacent elements apart
+            return
+        for name, sel in self.fields.items():
+            if name in self._record or not _matches(sel, tag, attrs):
+                continue
+            if sel[2]:
+                self._record[name] = dict(attrs).get(sel[2])
+            elif tag not in VOID_TAGS:
+                self._capture = (name, self._depth, [])
+            break
+
+    def handle_endtag(self, tag):
+        if self._record is None or tag in VOID_TAGS:
+            return
+        if self._capture is not None and self._depth == self._capture[1]:
+            name, _, parts = self._capture
+            self._record[name] = " ".join("".join(parts).split())
+            self._capture = None
+        if self._capture is not None:
+            self._capture[2].append(" ")
+        self._depth -= 1
+        if self._depth == 0:
+            self.records.append(self._record)
+            self._record = None
+
+    def handle_data(self, data):
+        if self._capture is not None:
+            self._capture[2].append(data)
+
+
+def parse_cards(path, card, fields, chunk_size=CHUNK_SIZE):
+    parser = CardParser(card, fields)
+    with open(path, encoding="utf-8") as f:
+        while chunk := f.read(chunk_size):
+            parser.feed(chunk)
+    parser.close()
+    return parser.records
+
+
+def ingest_source(name, config) -> pd.DataFrame:
+    """One row per card for a configured source, with bill_key normalized."""
+    records = parse_cards(config["path"], config["card"], config["fields"])
+    df = pd.DataFrame(records)
+    for new_col, (field, pattern) in config.get("extract", {}).items():
+        df[new_col] = df[field].str.extract(pattern, expand=False) if field in df.columns else None
+    df["source"] = name
+    df["stance"] = df["stance"] if "stance" in df.columns else config.get("stance")
+    df["status"] = df["status"].str.strip().str.lower() if "status" in df.columns else None
+    df["bill_key"] = df["bill"].map(norm_bill_number)
+    for col in TAG_COLS:
+        if col not in df.columns:
+            df[col] = None
+    return df[TAG_COLS]
+
+
+def ingest_all(sources=SOURCES) -> pd.DataFrame:
+    frames = [ingest_source(name, cfg) for name, cfg in sources.items() if Path(cfg["path"]).exists()]
+    if not frames:
+        return pd.DataFrame(columns=TAG_COLS)
+    return pd.concat(frames, ignore_index=True)
+
+
+# ---------------------
+# Join onto bills
+# ---------------------
+def join_advocacy(bills: pd.DataFrame, tags: pd.DataFrame, bill_col="Bill Number") -> pd.DataFrame:
+    """Bills with <source>_stance / <source>_status columns (one pair per source)."""
+    tags = tags.dropna(subset=["bill_key"]).drop_duplicates(["source", "bill_key"], keep="last")
+    wide = tags.pivot(index="bill_key", columns="source", values=["stance", "status"])
+    wide.columns = [f"{source}_{field}" for field, source in wide.columns]
+    # aligned by position; DataFrame.join(on=<array>) would add a key_0 column
+    tagged = wide.reindex(bills[bill_col].map(norm_bill_number).values)
+    tagged.index = bills.index
+    return pd.concat([bills, tagged], axis=1)
+
+
+def write_tags(tags: pd.DataFrame, path=TAGS_PATH):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(tags.to_dict(orient="records"), f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    tags = ingest_all()
+    write_tags(tags)
+    print(f"Wrote {len(tags)} advocacy tags to {TAGS_PATH}")
+    bills = pd.read_json(DATA_DIR / "combinedBills_2025.json", orient="records")
+    known = set(bills["Bill Number"].map(norm_bill_number))
+    missing = tags[~tags["bill_key"].isin(known)]
+    if not missing.empty:
+        print("Not in combinedBills_2025.json:", ", ".join(missing["bill"].astype(str)))
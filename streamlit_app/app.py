@@ -11,15 +11,19 @@ Data files expected at: streamlit_app/data/
 """
 
 import streamlit as st
-from pathlib import Path
 import pandas as pd
-import geopandas as gpd
-import json
 from shapely import wkt
-from shapely.geometry import Polygon, MultiPolygon
 import pydeck as pdk
 import altair as alt
 
+from data_prep import display_frame, BILL_DATE_SORT_COL
+from datastore import datastore_ready, find_col, get_datastore, preview_kpis
+from db import get_db
+from photos import photo_for
+from exports import rep_bills_csv, bulk_export_bytes
+from geo import shapely_to_pydeck_polygons
+import perf
+
 # fuzzy matching (rapidfuzz preferred)
 try:
     from rapidfuzz import process as rf_process
@@ -36,238 +40,55 @@ except Exception:
 
 st.set_page_config(page_title="ElectionTime — Rep KPI Dashboard", layout="wide")
 
-# ---------------------
-# Paths
-# ---------------------
-BASE_DIR = Path(__file__).resolve().parent
-DATA_DIR = BASE_DIR / "data"
-
-BILLS_PATH = DATA_DIR / "combinedBills_2025.json"
-REPKPIS_PATH = DATA_DIR / "repKPIs_2025.json"
-GEO_PATH_A = DATA_DIR / "reps_with_geo_data_a.geojson"
-GEO_PATH_B = DATA_DIR / "reps_with_geo_data_b.geojson"
-
-# ---------------------
-# Helpers
-# ---------------------
-def safe_read_json(path: Path) -> pd.DataFrame:
-    path = Path(path)
-    if not path.exists():
-        raise FileNotFoundError(path)
-    try:
-        return pd.read_json(path, orient="records")
-    except Exception:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return pd.DataFrame(data)
-
-def find_col(df: pd.DataFrame, candidates):
-    if df is None:
-        return None
-    cols_lower = {c.lower(): c for c in df.columns}
-    for cand in candidates:
-        if not cand:
-            continue
-        if cand.lower() in cols_lower:
-            return cols_lower[cand.lower()]
-    # substring fallback
-    for cand in candidates:
-        if not cand:
-            continue
-        for c in df.columns:
-            if cand.lower() in c.lower():
-                return c
-    return None
-
-def make_rep_key(name):
-    """Return lastname_firstinitial (lowercase, no spaces). Handles:
-       - 'Last, F.'
-       - 'Last F.' (two tokens where second is single letter)
-       - 'First Last'
-    """
-    if pd.isna(name):
-        return ""
-    s = str(name).strip().replace(".", "")
-    if s == "":
-        return ""
-    # 'Last, F' pattern
-    if "," in s:
-        left, right = [p.strip() for p in s.split(",", 1)]
-        last = left
-        first_token = right.split()[0] if right else ""
-        first = first_token
-    else:
-        parts = s.split()
-        if len(parts) == 1:
-            # single token, use it as last with empty initial
-            last = parts[0]
-            first = ""
-        elif len(parts) == 2 and len(parts[1]) == 1:
-            # 'Last F' pattern
-            last = parts[0]
-            first = parts[1]
-        else:
-            # assume 'First Last' or longer - use first and last
-            last = parts[-1]
-            first = parts[0]
-    last_clean = "".join(last.split()).lower()
-    first_initial = first[0].lower() if (first and len(first) > 0) else ""
-    return f"{last_clean}_{first_initial}"
-
-def shapely_to_pydeck_polygons(geom):
-    if geom is None:
-        return []
-    polys = []
-    if isinstance(geom, (Polygon, MultiPolygon)):
-        if geom.geom_type == "Polygon":
-            ext = list(geom.exterior.coords)
-            polys.append([[c[0], c[1]] for c in ext])
-        else:
-            for p in geom.geoms:
-                polys.append([[c[0], c[1]] for c in list(p.exterior.coords)])
-    else:
-        try:
-            gg = wkt.loads(str(geom))
-            return shapely_to_pydeck_polygons(gg)
-        except Exception:
-            return []
-    return polys
-
-def parse_list_column(value):
-    """
-    Convert a stored list-like value into a real Python list.
-    Handles cases where the value is already a list,
-    a stringified list, or just a plain string.
-    """
-    if isinstance(value, list):
-        return value
-    if isinstance(value, str):
-        try:
-            # Try to safely eval strings like "['Committee A', 'Committee B']"
-            import ast
-            parsed = ast.literal_eval(value)
-            if isinstance(parsed, list):
-                return parsed
-            else:
-                return [value] if value else []
-        except Exception:
-            # Fallback: split by common separators
-            return [v.strip() for v in value.split(",") if v.strip()]
-    return []
-
+# timing instrumentation: ELECTIONTIME_PERF=1 or ?perf=1 (see perf.py)
+perf.start_run("app", enabled=perf.ENABLED or st.query_params.get("perf") == "1")
 
 # ---------------------
-# Load datasets (cached)
+# Shared datastore
 # ---------------------
-@st.cache_data
-def load_datasets():
-    bills = safe_read_json(BILLS_PATH)
-    repkpis = safe_read_json(REPKPIS_PATH)
-
-    geo_parts = []
-    for p in [GEO_PATH_A, GEO_PATH_B]:
-        if p.exists():
-            geo_parts.append(gpd.read_file(p))
-    if not geo_parts:
-        raise FileNotFoundError("Missing both geojson parts (reps_with_geo_data_a/b.geojson).")
-    repsgeo = pd.concat(geo_parts, ignore_index=True)
-    return bills, repkpis, repsgeo
-
+# Built once per data version and shared by reference across sessions
+# (see datastore.py); sessions only keep their selections.
 try:
-    bills_df, repkpis_df, repsgeo_gdf = load_datasets()
+    preview = st.sidebar.empty()
+    if not datastore_ready():
+        # cold worker: list the reps from repKPIs while the district geometry loads
+        with perf.timer("preview_kpis"):
+            names = preview_kpis().get("Representative", pd.Series(dtype=str)).dropna().sort_values()
+        with preview.container():
+            st.selectbox("Choose representative", names.tolist(), disabled=True, key="rep_preview")
+            st.caption("Loading district maps...")
+    with perf.timer("get_datastore"):
+        store = get_datastore()
+    preview.empty()
 except Exception as e:
     st.error(f"Error loading data: {e}")
     st.stop()
 
-# Normalize column names (strip whitespace)
-bills_df.columns = bills_df.columns.str.strip()
-repkpis_df.columns = repkpis_df.columns.str.strip()
-repsgeo_gdf.columns = repsgeo_gdf.columns.str.strip()
+bills_df = store.bills
+repkpis_df = store.repkpis
+reps_merged = store.reps
+bills_with_rep = store.bills_with_rep
+committee_index = store.committees
+kpi_engine = store.kpi_engine
+bill_sponsor_col = store.bill_sponsor_col
+DATA_VERSION = store.version
+# DuckDB backend (db.py) for per-rep lookups when it's built for this data version.
+# It only serves a rep's bills and committees; the datastore above is still built
+# (see the limitation noted in db.py).
+db = get_db()
+if db is not None and db.version != DATA_VERSION:
+    db = None
 
 # ---------------------
-# Identify meaningful columns
-# ---------------------
-bill_sponsor_col = find_col(bills_df, ["Bill Sponsor", "Sponsor", "bill_sponsor"])
-if bill_sponsor_col is None:
-    st.error("Could not find a 'Bill Sponsor' column in bills data.")
-    st.stop()
-
-# try to find name columns in KPIs & geo; if not found we still proceed but warn
-repkpi_name_col = find_col(repkpis_df, ["Bill Sponsor", "Representative", "Rep_Name", "Rep Name"])
-repgeo_name_col = find_col(repsgeo_gdf, ["Bill Sponsor", "Representative", "Rep_Name", "Rep Name", "Representative_geo"])
-# If a column is missing, we'll still try to proceed but create keys from whatever exists.
-
-# ---------------------
-# Build consistent rep_key for all three datasets
-# ---------------------
-# For bills we base on the Bill Sponsor column
-bills_df["rep_key"] = bills_df[bill_sponsor_col].fillna("").apply(make_rep_key)
-
-# For rep KPIs: prefer explicit name column, else fall back try other heuristics:
-if repkpi_name_col:
-    repkpis_df["rep_key"] = repkpis_df[repkpi_name_col].fillna("").apply(make_rep_key)
-else:
-    # try common alternative columns
-    alt = None
-    for c in ["Representative", "Rep_Name", "Bill Sponsor"]:
-        if c in repkpis_df.columns:
-            alt = c
-            break
-    if alt:
-        repkpis_df["rep_key"] = repkpis_df[alt].fillna("").apply(make_rep_key)
-    else:
-        # as last resort, create empty keys (won't match)
-        repkpis_df["rep_key"] = ""
-
-# For geo: prefer Bill Sponsor if present (you said you added it), else representative name
-if repgeo_name_col:
-    repsgeo_gdf["rep_key"] = repsgeo_gdf[repgeo_name_col].fillna("").apply(make_rep_key)
-else:
-    # try a few likely columns
-    alt_geo = None
-    for c in ["Bill Sponsor", "Representative", "Rep_Name", "Representative_geo", "Bill Sponsor_geo"]:
-        if c in repsgeo_gdf.columns:
-            alt_geo = c
-            break
-    if alt_geo:
-        repsgeo_gdf["rep_key"] = repsgeo_gdf[alt_geo].fillna("").apply(make_rep_key)
-    else:
-        repsgeo_gdf["rep_key"] = ""
-
-# Deduplicate KPIs by rep_key keeping first KPI row per rep_key
-repkpis_df = repkpis_df.drop_duplicates(subset=["rep_key"], keep="first")
-
-# ---------------------
-# Merge datasets (geo + kpi), then join bills
-# ---------------------
-reps_merged = repsgeo_gdf.merge(repkpis_df, on="rep_key", how="left", suffixes=("_geo", "_kpi"))
-
-# create a friendly display name (prioritized)
-def pick_display_name(row):
-    candidates = [
-        "Representative_kpi", "Representative_geo",
-        "Bill Sponsor_kpi", "Bill Sponsor_geo",
-        "Representative", "Bill Sponsor", "Rep_Name"
-    ]
-    for c in candidates:
-        if c in row.index and pd.notna(row[c]) and str(row[c]).strip():
-            return str(row[c]).strip()
-    # fallback: try common columns in original geo df
-    for c in ["Representative", "Representative_geo", "Bill Sponsor", "Bill Sponsor_geo"]:
-        if c in row.index and pd.notna(row[c]) and str(row[c]).strip():
-            return str(row[c]).strip()
-    return row.get("rep_key", "")
-
-reps_merged["display_name"] = reps_merged.apply(pick_display_name, axis=1)
-# keep a cleaned version without trailing spaces
-reps_merged["display_name"] = reps_merged["display_name"].fillna("").astype(str).str.strip()
-
-# bills joined to reps (so each bill row will carry rep metadata if merged)
-bills_with_rep = bills_df.merge(reps_merged.drop(columns="geometry", errors="ignore"), on="rep_key", how="left")
-
-# ---------------------
-# Sidebar + search
+# Page layout
 # ---------------------
+# The panels with widgets (search, bills, bulk export) are fragments
+# (st.fragment). A widget inside a fragment only reruns that fragment, so
+# typing in the search box doesn't rebuild the map, chart, bills table or
+# committee list. The other panels have no widgets, so they are plain
+# functions and only render on full reruns. Each panel gets the data it
+# depends on as arguments; picking a different rep is the one interaction that
+# reruns the whole page.
 st.title("ElectionTime — Rep KPI Dashboard")
 st.markdown("Search a representative, view KPIs, committees, bills, and district map.")
 
@@ -275,16 +96,31 @@ st.markdown("Search a representative, view KPIs, committees, bills, and district
 st.sidebar.caption(f"Loaded: {len(bills_df)} bills, {len(repkpis_df)} KPI rows, {len(reps_merged)} geo rows")
 
 # build choices (non-empty)
-rep_choices = sorted([x for x in reps_merged["display_name"].unique().tolist() if str(x).strip()])
+rep_choices = list(store.rep_choices)
 if len(rep_choices) == 0:
     st.error("No display names were created. Check your geo/KPI name columns.")
     st.stop()
 
-query = st.sidebar.text_input("Search representative (fuzzy)", "")
-if query.strip() == "":
-    selected_rep = st.sidebar.selectbox("Choose representative", options=rep_choices)
-else:
-    raw_matches = fuzzy_extract(query, rep_choices, limit=10)
+# column lookups used by the panels below
+district_col = find_col(reps_merged, ["DistrictKey", "District Key", "district key"])
+total_col = find_col(reps_merged, ["total_bills", "Total Bills", "total"])
+passed_col = find_col(reps_merged, ["passed_bills", "passed"])
+failed_col = find_col(reps_merged, ["failed_bills", "failed"])
+passrate_col = find_col(reps_merged, ["pass_rate", "pass rate"])
+bill_status_col = find_col(bills_df, ["Bill Status", "Status", "Outcome"])
+wkt_col = find_col(reps_merged, ["geometry_wkt", "geom", "wkt"])
+lat_col = find_col(reps_merged, ["lat", "latitude"])
+lon_col = find_col(reps_merged, ["lon", "longitude"])
+url_col = find_col(reps_merged, ["webpage", "Webpage"])
+party_col = find_col(reps_merged, ["party", "Party"])
+county_col = find_col(reps_merged, ["County(ies)", "County", "Counties", "county"])
+email_col = find_col(reps_merged, ["email", "Email"])
+
+
+# ---------------------
+# Search (sidebar fragment)
+# ---------------------
+def normalize_matches(raw_matches):
     # normalize match tuples (match, score, maybe index)
     matches = []
     for m in raw_matches:
@@ -295,13 +131,42 @@ else:
                 matches.append((m[0], 0))
         else:
             matches.append((m, 0))
-    if len(matches) == 0:
-        st.sidebar.warning("No fuzzy matches found; showing full list.")
-        selected_rep = st.sidebar.selectbox("Choose representative", options=rep_choices)
+    return matches
+
+
+@st.fragment
+def search_panel(rep_choices):
+    """Fuzzy search + picker. Typing only reruns this fragment; the app reruns
+    when the picked rep actually changes."""
+    current = st.session_state.get("selected_rep", rep_choices[0])
+    query = st.text_input("Search representative (fuzzy)", "", key="rep_query")
+    if query.strip() == "":
+        options = rep_choices
+        label = "Choose representative"
     else:
-        match_names = [m[0] for m in matches]
-        selected_rep = st.sidebar.selectbox("Top matches", options=match_names)
+        with perf.timer("fuzzy search"):
+            matches = normalize_matches(fuzzy_extract(query, rep_choices, limit=10))
+        if len(matches) == 0:
+            st.warning("No fuzzy matches found; showing full list.")
+            options = rep_choices
+            label = "Choose representative"
+        else:
+            options = [m[0] for m in matches]
+            label = "Top matches"
+    index = options.index(current) if current in options else None
+    picked = st.selectbox(label, options=options, index=index, placeholder="Pick a match")
+    if picked and picked != current:
+        st.session_state["selected_rep"] = picked
+        st.rerun()
+
+
+if "selected_rep" not in st.session_state:
+    st.session_state["selected_rep"] = rep_choices[0]
 
+with st.sidebar:
+    search_panel(rep_choices)
+
+selected_rep = st.session_state["selected_rep"]
 if not selected_rep:
     st.info("Pick a representative to continue.")
     st.stop()
@@ -320,124 +185,58 @@ if rep_row.empty:
     st.stop()
 
 rep = rep_row.iloc[0]  # Series of selected rep
+rep_key = rep.get("rep_key", "")
 # # -------------------------------------------------------- # #
 # Debugging
 # st.write("Debug — rep row columns:", rep.index.tolist())
 # st.json(rep.to_dict())
 # # -------------------------------------------------------- # #
 
-# ---------------------
-# KPIs & Summary (left column)
-# ---------------------
-col1, col2 = st.columns([2, 3])
-with col1:
-    st.subheader(selected_rep)
 
-    # --- District
-    district_col = find_col(reps_merged, ["DistrictKey", "District Key", "district key"])
-    district = rep.get(district_col) if district_col else None
-    if not district or pd.isna(district):
-        district = "Unknown"
-    if district[0].upper() == 'H':
-        chamber = "House District"
-        d_num = district[1:]
-        district = chamber + " " + d_num
-    if district[0].upper() == 'S':
-        chamber = "Senate District"
-        d_num = district[1:]
-        district = chamber + " " + d_num
-    st.markdown(f"{district}")
-    
-    # find KPI column names on the merged df (these should come from repKPIs)
-    total_col = find_col(reps_merged, ["total_bills", "Total Bills", "total"])
-    passed_col = find_col(reps_merged, ["passed_bills", "passed"])
-    failed_col = find_col(reps_merged, ["failed_bills", "failed"])
-    passrate_col = find_col(reps_merged, ["pass_rate", "pass rate"])
-
-    # compute rep_bills from bills_with_rep (using rep_key)
-    rep_key = rep.get("rep_key", "")
-    rep_bills = bills_with_rep[bills_with_rep["rep_key"] == rep_key].copy() if rep_key else pd.DataFrame()
-
-    row = rep_bills.iloc[0]
-    # bill status column in bills_df
-    bill_status_col = find_col(bills_df, ["Bill Status", "Status", "Outcome"])
-
-    # Prefer KPI values from repKPIs (present in reps_merged after merge)
+def rep_kpis(rep):
+    """(total, passed, failed, pass_rate) for a rep; repKPIs first, engine as fallback."""
     if total_col and pd.notna(rep.get(total_col)):
         total_bills = int(rep.get(total_col)) if pd.notna(rep.get(total_col)) else 0
         passed_bills = int(rep.get(passed_col)) if (passed_col and pd.notna(rep.get(passed_col))) else 0
         failed_bills = int(rep.get(failed_col)) if (failed_col and pd.notna(rep.get(failed_col))) else max(0, total_bills - passed_bills)
         pass_rate = float(rep.get(passrate_col)) if (passrate_col and pd.notna(rep.get(passrate_col))) else (passed_bills / total_bills * 100 if total_bills else 0)
     else:
-        # fallback compute from rep_bills
-        total_bills = len(rep_bills)
-        if bill_status_col and bill_status_col in rep_bills.columns and total_bills > 0:
-            passed_bills = rep_bills[bill_status_col].astype(str).str.contains("pass", case=False, na=False).sum()
-        else:
-            passed_bills = 0
-        failed_bills = total_bills - passed_bills
-        pass_rate = (passed_bills / total_bills * 100) if total_bills else 0.0
-
-    # # horizontal bar chart - normalized
-    # # status stacked bar (horizontal, normalized to 100%)
-    #
-    #
-    # total = row["total_bills"] or 0
-    # passed = row["passed_bills"] or 0
-    # failed = row["failed_bills"] or 0
-    # unknown = max(0, total - (passed + failed))
-    #
-    # # Build a dataframe for the stacked bar
-    # data = pd.DataFrame({
-    #     "Status": ["Passed", "Failed", "Unknown"],
-    #     "Value": [passed, failed, unknown]
-    # })
-    #
-    # # Horizontal stacked bar, normalized to total
-    # chart = (
-    #     alt.Chart(data)
-    #     .mark_bar(size=40)  # thicker bar
-    #     .encode(
-    #         x=alt.X("Value:Q", stack="normalize", axis=alt.Axis(format="%", labelPadding=10, tickSize=5)),
-    #         y=alt.value(0),  # single horizontal bar
-    #         color=alt.Color("Status:N", scale=alt.Scale(
-    #             domain=["Passed", "Failed", "Unknown"],
-    #             range=["green", "red", "#f7f7f7"]  # white/light gray for unknown
-    #         ),
-    #                         legend=None
-    #                         ),
-    #         tooltip=["Status", "Value"       ]
-    #     )
-    #     .properties(height=50)
-    # )
-    #
-    # st.altair_chart(chart, use_container_width=True)
-
-    # # ------------------------------------------# #
-    # # --- aggregates - top level info
-    # # ------------------------------------------# #
-    st.image(row["Img_URL"], use_container_width=True)
-
-    k1, k2, k3 = st.columns(3)
-    k1.metric("Failed", failed_bills)
-    k2.metric("Passed", passed_bills)
-    k3.metric("Total bills", total_bills)
-
-    # horizontal bar chart - normalized
-    # status stacked bar (horizontal, normalized to 100%)
-
-
-    total = row["total_bills"] or 0
-    passed = row["passed_bills"] or 0
-    failed = row["failed_bills"] or 0
-    unknown = max(0, total - (passed + failed))
+        # fallback: KPIs the engine computed from the bills table
+        kpis = kpi_engine.kpis_for(rep.get("rep_key", "")) or {}
+        total_bills = int(kpis.get("total_bills", 0))
+        passed_bills = int(kpis.get("passed_bills", 0))
+        failed_bills = int(kpis.get("failed_bills", 0))
+        pass_rate = float(kpis.get("pass_rate", 0.0))
+    return total_bills, passed_bills, failed_bills, pass_rate
+
+
+def rep_bills_for(rep_key, selected_rep):
+    """This rep's bills, newest first (rep_key join, last-name match as fallback)."""
+    rep_bills = db.bills_for(rep_key) if db is not None else store.bills_for(rep_key)
+    used_fallback = False
+    if rep_bills.empty:
+        # fallback by last name match from bills_df
+        last_name = selected_rep.split()[-1]
+        rep_bills = bills_df[bills_df[bill_sponsor_col].astype(str).str.contains(last_name, case=False, na=False)]
+        used_fallback = True
+    # dates were typed at load time (data_prep.prepare_bills); only sort + slice here
+    rep_bills = rep_bills.sort_values(by=BILL_DATE_SORT_COL, ascending=False).reset_index(drop=True)
+    return rep_bills, used_fallback
 
-    # --------------------------------
-    # ---- general info -------------
-    # --------------------------------
 
+def district_label(district):
+    if not district or pd.isna(district):
+        return "Unknown"
+    district = str(district)
+    if district[0].upper() == 'H':
+        return "House District " + district[1:].strip()
+    if district[0].upper() == 'S':
+        return "Senate District " + district[1:].strip()
+    return district
 
 
+@st.cache_resource(max_entries=64, show_spinner=False)
+def status_chart(passed, failed, unknown):
     # Build a dataframe for the stacked bar
     data = pd.DataFrame({
         "Status": ["Passed", "Failed", "Unknown"],
@@ -445,7 +244,7 @@ with col1:
     })
 
     # Horizontal stacked bar, normalized to total
-    chart = (
+    return (
         alt.Chart(data)
         .mark_bar(size=40)  # thicker bar
         .encode(
@@ -462,40 +261,60 @@ with col1:
         .properties(height=50)
     )
 
-    st.altair_chart(chart, use_container_width=True)
 
-    st.metric("Pass rate", f"{pass_rate:.1f}%")
+@st.cache_data(max_entries=256, show_spinner=False)
+def district_polygons(rep_key, version, _geom):
+    """pydeck polygons + centroid for a rep's district, converted once per rep."""
+    polygons = shapely_to_pydeck_polygons(_geom)
+    if not polygons:
+        return [], None
+    centroid = _geom.centroid
+    return polygons, (centroid.y, centroid.x)
+
+
 # ---------------------
-# Right column: bills overview & map
+# KPIs & Summary (left column)
 # ---------------------
-with col2:
-    # st.subheader("Bills overview")
-    if rep_bills.empty:
-        st.write("_No bills found for this rep via rep_key. (We will try a last-name fallback.)_")
-        # fallback by last name match from bills_df
-        last_name = selected_rep.split()[-1]
-        rep_bills = bills_df[bills_df[bill_sponsor_col].astype(str).str.contains(last_name, case=False, na=False)].copy()
+def profile_panel(rep, selected_rep, kpis):
+    total_bills, passed_bills, failed_bills, pass_rate = kpis
+    st.subheader(selected_rep)
 
-    if rep_bills.empty:
-        st.write("_No bills available for this rep in combinedBills_2025.json._")
-    else:
-        # always create bill_date_parsed, even if no valid date col is found
-        date_col = find_col(rep_bills, ["Bill Date (utc_iso)", "Bill Date", "Bill Date Raw", "Date", "bill_date"])
-        rep_bills["bill_date_parsed"] = (
-            pd.to_datetime(rep_bills[date_col], errors="coerce")
-            if date_col
-            else pd.NaT
-        )
+    # --- District
+    district = rep.get(district_col) if district_col else None
+    st.markdown(f"{district_label(district)}")
+
+    # # ------------------------------------------# #
+    # # --- aggregates - top level info
+    # # ------------------------------------------# #
+    # served from the local thumbnail cache (scripts/rep_photos.py), URL as fallback
+    st.image(photo_for(rep.get("Img_ID"), rep.get("Img_URL"), size="lg"), use_container_width=True)
+
+    k1, k2, k3 = st.columns(3)
+    k1.metric("Failed", failed_bills)
+    k2.metric("Passed", passed_bills)
+    k3.metric("Total bills", total_bills)
+
+    # horizontal bar chart - normalized
+    # status stacked bar (horizontal, normalized to 100%)
+    unknown = max(0, total_bills - (passed_bills + failed_bills))
+    with perf.timer("status chart"):
+        chart = status_chart(passed_bills, failed_bills, unknown)
+    st.altair_chart(chart, use_container_width=True)
+
+    st.metric("Pass rate", f"{pass_rate:.1f}%")
 
 
-# Map: use geometry from reps_merged (should be in geo)
+# ---------------------
+# Right column: map + rep info
+# ---------------------
+def map_panel(rep, rep_key, selected_rep):
+    # Map: use geometry from reps_merged (should be in geo)
     st.subheader("District map")
     geom = None
     if "geometry" in rep.index and pd.notna(rep.get("geometry")):
         geom = rep.get("geometry")
     else:
         # try geometry_wkt if present
-        wkt_col = find_col(reps_merged, ["geometry_wkt", "geom", "wkt"])
         if wkt_col and pd.notna(rep.get(wkt_col)):
             try:
                 geom = wkt.loads(rep.get(wkt_col))
@@ -503,10 +322,10 @@ with col2:
                 geom = None
 
     if geom is not None:
-        polygons = shapely_to_pydeck_polygons(geom)
+        with perf.timer("geometry -> pydeck"):
+            polygons, center = district_polygons(rep_key, DATA_VERSION, geom)
         if polygons:
-            centroid = geom.centroid
-            view = pdk.ViewState(latitude=centroid.y, longitude=centroid.x, zoom=8)
+            view = pdk.ViewState(latitude=center[0], longitude=center[1], zoom=8)
             polygon_layer = pdk.Layer(
                 "PolygonLayer",
                 data=[{"polygon": polygons[0], "name": selected_rep}],
@@ -523,8 +342,6 @@ with col2:
             st.write("_Geometry present but could not convert to polygon for pydeck._")
     else:
         # fallback Lat/Lon
-        lat_col = find_col(reps_merged, ["lat", "latitude"])
-        lon_col = find_col(reps_merged, ["lon", "longitude"])
         try:
             lat = float(rep.get(lat_col)) if lat_col and pd.notna(rep.get(lat_col)) else None
             lon = float(rep.get(lon_col)) if lon_col and pd.notna(rep.get(lon_col)) else None
@@ -535,27 +352,16 @@ with col2:
         except Exception:
             st.write("_No geometry or lat/lon available for this rep._")
 
-    # -----------
-    # --- Rep info
-    # --------------
-    # --- Website
-    # Find the correct column name for webpage
-    url_col = find_col(reps_merged, ["webpage", "Webpage"])
 
-    # Get the URL value from the current rep row
+def rep_info(rep):
+    # --- Website
     url = rep.get(url_col) if url_col else None
-
     # If URL is missing or empty, use default
     if not url or pd.isna(url):
         url = "https://le.utah.gov/Documents/find.htm"
-
-    # Display the button
     st.link_button("Go to website", url)
 
-    # Debugging helper
-    # st.markdown(f"link is: {url}")
     # --- party
-    party_col = find_col(reps_merged, ["party", "Party"])
     party = rep.get(party_col) if party_col else None
     if not party or pd.isna(party):
         party = "Unknown"
@@ -565,178 +371,122 @@ with col2:
         party = "Democrat"
     st.text(f"Party: {party}")
     # --- county
-    county_col = find_col(reps_merged, ["County(ies)", "County", "Counties", "county"])
     county = rep.get(county_col) if county_col else None
     if not county or pd.isna(county):
         county = "Unknown"
     st.text(f"Count(ies): {county}")
     # --- Email
-    email_col = find_col(reps_merged, ["email", "Email"])
     email = rep.get(email_col) if email_col else None
     if not email or pd.isna(email):
         email = "Unknown"
     st.text(f"Email: {email}")
 
 
-# show table with expanded columns
-# st.subheader("Bills overview")
-# display_cols = [
-#     find_col(rep_bills, ["Bill Number", "BillNumber", "bill_number"]),
-#     "Bill Title",
-#     bill_status_col,
-#     "Date Passed",
-#     "Effective Date",
-#     rep_bills["bill_date_parsed"].name if "bill_date_parsed" in rep_bills else None,
-#     find_col(rep_bills, ["Bill URL", "BillURL", "url"])
-# ]
-# display_cols = [c for c in display_cols if c]
-#
-# rep_bills_sorted = rep_bills.sort_values(by="bill_date_parsed", ascending=False).reset_index(drop=True)
-#
-# st.dataframe(rep_bills_sorted[display_cols], use_container_width=True)
-st.subheader("Bills overview")
-
-display_cols = [
-    find_col(rep_bills, ["Bill Number", "BillNumber", "bill_number"]),
-    "Bill Title",
-    bill_status_col,
-    "Date Passed",
-    "Effective Date",
-    find_col(rep_bills, ["Bill URL", "BillURL", "url"])
-]
-display_cols = [c for c in display_cols if c]
-
-rep_bills_sorted = rep_bills.sort_values(by="bill_date_parsed", ascending=False).reset_index(drop=True)
-
-# Convert numeric timestamps to proper datetime (if necessary)
-for col in ["Date Passed", "Effective Date", "bill_date_parsed"]:
-    if col in rep_bills_sorted.columns:
-        # Check if numeric (milliseconds) or string
-        if pd.api.types.is_numeric_dtype(rep_bills_sorted[col]):
-            rep_bills_sorted[col] = pd.to_datetime(rep_bills_sorted[col], unit='ms', errors='coerce')
-        else:
-            rep_bills_sorted[col] = pd.to_datetime(rep_bills_sorted[col], errors='coerce')
-        # Format nicely
-        rep_bills_sorted[col] = rep_bills_sorted[col].dt.strftime("%Y-%m-%d")
+# ---------------------
+# Bills overview + export
+# ---------------------
+# Only build the CSV once someone asks for it; cached per (rep, data version)
+@st.cache_data(max_entries=256, show_spinner=False)
+def rep_csv_export(rep_key, version, _rep_bills, cols):
+    return rep_bills_csv(_rep_bills, cols)
 
-st.dataframe(rep_bills_sorted[display_cols], use_container_width=True, hide_index=True)
+@st.cache_data(max_entries=4, show_spinner="Building export...")
+def bulk_export(fmt, version, _bills):
+    return bulk_export_bytes(_bills, fmt)
 
 
-# ==============================
-# Right column: Bills overview (updated)
-# ==============================
-from st_aggrid import AgGrid, GridOptionsBuilder, JsCode
-
-# --- Bills overview table ---
-# st.subheader("Bills overview")
-#
-# # Convert date columns to readable format
-# for date_col in ["Date Passed", "Effective Date"]:
-#     if date_col in rep_bills.columns:
-#         rep_bills[date_col] = pd.to_datetime(rep_bills[date_col], errors="coerce")
-#         rep_bills[date_col] = rep_bills[date_col].dt.strftime("%Y-%m-%d")
-#
-# # Build HTML table
-# display_cols = [
-#     find_col(rep_bills, ["Bill Number", "BillNumber", "bill_number"]),
-#     "Bill Title",
-#     bill_status_col,
-#     "Date Passed",
-#     "Effective Date",
-#     rep_bills["bill_date_parsed"].name if "bill_date_parsed" in rep_bills else None,
-#     find_col(rep_bills, ["Bill URL", "BillURL", "url"])
-# ]
-# display_cols = [c for c in display_cols if c]
-#
-# table_html = '<table style="width:100%; border-collapse: collapse;">'
-# # header
-# table_html += "<tr style='background-color:#f0f0f0'>"
-# for c in display_cols:
-#     if c != find_col(rep_bills, ["Bill URL", "BillURL", "url"]):  # hide URL column
-#         table_html += f"<th style='padding:4px;text-align:left'>{c}</th>"
-# table_html += "</tr>"
-#
-# # rows
-# url_col = find_col(rep_bills, ["Bill URL", "BillURL", "url"])
-# for idx, row in rep_bills.iterrows():
-#     table_html += "<tr style='border-bottom:1px solid #ddd;'>"
-#     for c in display_cols:
-#         if c == "Bill Title" and url_col and pd.notna(row[url_col]):
-#             table_html += f'<td style="padding:4px"><a href="{row[url_col]}" target="_blank">{row[c]}</a></td>'
-#         elif c != url_col:  # skip URL column
-#             table_html += f"<td style='padding:4px'>{row[c]}</td>"
-#     table_html += "</tr>"
-#
-# table_html += "</table>"
-#
-# st.markdown(table_html, unsafe_allow_html=True)
+@st.fragment
+def bills_panel(rep_key, selected_rep, rep_bills, used_fallback):
+    st.subheader("Bills overview")
+    if used_fallback:
+        st.write("_No bills found for this rep via rep_key. (Used a last-name fallback.)_")
+    if rep_bills.empty:
+        st.write("_No bills available for this rep in combinedBills_2025.json._")
+        return
+
+    display_cols = [
+        find_col(rep_bills, ["Bill Number", "BillNumber", "bill_number"]),
+        "Bill Title",
+        bill_status_col,
+        "Date Passed",
+        "Effective Date",
+        find_col(rep_bills, ["Bill URL", "BillURL", "url"])
+    ]
+    display_cols = [c for c in display_cols if c]
+    st.dataframe(display_frame(rep_bills, display_cols), use_container_width=True, hide_index=True)
+
+    # --- CSV download (clicking these only reruns this fragment)
+    export_flag = f"export_ready_{rep_key}"
+    if st.button("Prepare CSV of this rep's bills", key=f"prepare_{rep_key}"):
+        st.session_state[export_flag] = True
+    if st.session_state.get(export_flag):
+        st.download_button(
+            "Download currently visible rep's bills as CSV",
+            data=rep_csv_export(rep_key, DATA_VERSION, rep_bills, tuple(display_cols)),
+            file_name=f"{selected_rep.replace(' ','_')}_bills.csv",
+            mime="text/csv",
+            key=f"download_{rep_key}"  # unique per rep
+        )
 
 
-# ==============================
-# Download CSV button
-# ==============================
-# if st.button("Download currently visible rep's bills as CSV"):
-#     try:
-#         # export df_display with proper formatting
-#         export_df = df_display.copy()
-#         for date_col in ["Date Passed", "Effective Date"]:
-#             if date_col in export_df:
-#                 export_df[date_col] = export_df[date_col].dt.strftime("%Y-%m-%d")
-#         csv = export_df.to_csv(index=False)
-#         st.download_button(
-#             "Download CSV",
-#             data=csv,
-#             file_name=f"{selected_rep.replace(' ','_')}_bills.csv",
-#             mime="text/csv"
-#         )
-#     except Exception as e:
-#         st.error(f"Could not prepare download: {e}")
-# --- CSV download ---
-csv_string = rep_bills_sorted[display_cols].to_csv(index=False)
-st.download_button(
-    "Download currently visible rep's bills as CSV",
-    data=csv_string,
-    file_name=f"{selected_rep.replace(' ','_')}_bills.csv",
-    mime="text/csv",
-    key=f"download_{rep_key}"  # unique per rep
-)
+@st.fragment
+def bulk_export_panel():
+    with st.expander("Bulk export (all reps)"):
+        bulk_fmt = st.radio("Format", ["zip", "parquet"], horizontal=True,
+                            format_func=lambda f: "Zip of CSVs" if f == "zip" else "Parquet")
+        if st.button("Prepare bulk export", key="prepare_bulk"):
+            st.session_state["bulk_export_fmt"] = bulk_fmt
+        if st.session_state.get("bulk_export_fmt") == bulk_fmt:
+            st.download_button(
+                "Download all reps' bills",
+                data=bulk_export(bulk_fmt, DATA_VERSION, bills_df),
+                file_name=f"all_reps_bills_2025.{bulk_fmt}",
+                mime="application/zip" if bulk_fmt == "zip" else "application/octet-stream",
+                key=f"download_bulk_{bulk_fmt}",
+            )
+
 
 # ==============================
 # Committees & Roles
 # ==============================
-st.markdown("---")
+def committees_panel(rep_key):
+    st.subheader("Committee Assignments")
+
+    # Committees come from the prebuilt edge table (see committees.py)
+    rep_committees = db.committees_for(rep_key) if db is not None else committee_index.committees_for(rep_key)
+
+    if rep_key in committee_index.edges.attrs.get("mismatched", []):
+        st.warning("⚠️ Committees and Roles list lengths don’t match for this representative.")
+
+    # Display committees with corresponding roles
+    if not rep_committees.empty:
+        for c, r in zip(rep_committees["Committee"], rep_committees["Role"]):
+            st.markdown(f"- **{c}** — {r}")
+    else:
+        st.info("No committee data available for this representative.")
+
 
-st.subheader("Committee Assignments")
-
-# Identify which columns to use
-committee_col = find_col(reps_merged, ["Committee", "Committees", "committee"])
-role_col = find_col(reps_merged, ["Role", "Roles", "role"])
-
-# Extract lists for the selected representative
-comm_list = parse_list_column(rep.get(committee_col)) if committee_col else []
-role_list = parse_list_column(rep.get(role_col)) if role_col else []
-
-# Make sure lengths line up
-if len(comm_list) != len(role_list):
-    st.warning("⚠️ Committees and Roles list lengths don’t match for this representative.")
-    min_len = min(len(comm_list), len(role_list))
-    comm_list = comm_list[:min_len]
-    role_list = role_list[:min_len]
-
-# Display committees with corresponding roles
-if comm_list:
-    for c, r in zip(comm_list, role_list):
-        st.markdown(f"- **{c}** — {r}")
-else:
-    st.info("No committee data available for this representative.")
 # ---------------------
-# Bottom: quick export
+# Render
 # ---------------------
-# st.markdown("---")
-# st.write(f"- Loaded {len(bills_df)} bills, {len(repkpis_df)} KPI rows, {len(reps_merged)} geo rows.")
-# if st.button("Download currently visible rep's bills as CSV"):
-#     try:
-#         csv = rep_bills.to_csv(index=False)
-#         st.download_button("Download CSV", data=csv, file_name=f"{selected_rep.replace(' ','_')}_bills.csv", mime="text/csv")
-#     except Exception as e:
-#         st.error(f"Could not prepare download: {e
\ No newline at end of file
+with perf.timer("rep bills slice"):
+    rep_bills, used_fallback = rep_bills_for(rep_key, selected_rep)
+perf.count("rep_bills_rows", len(rep_bills))
+
+col1, col2 = st.columns([2, 3])
+with col1:
+    profile_panel(rep, selected_rep, rep_kpis(rep))
+with col2:
+    map_panel(rep, rep_key, selected_rep)
+    rep_info(rep)
+
+bills_panel(rep_key, selected_rep, rep_bills, used_fallback)
+
+with st.sidebar:
+    bulk_export_panel()
+
+st.markdown("---")
+committees_panel(rep_key)
+
+# perf panel (only shows when instrumentation is on)
+perf.render_panel()
@@ -0,0 +1,263 @@
+# bundle.py
+"""
+One compressed, checksummed archive for the app's data files.
+
+streamlit_app/data/ holds about 1.8 MB of JSON/GeoJSON, including variants
+the app never reads (reps_with_geo_data.json, the _a/_b .json copies, the
+scraper's utah_bills_2025 copies). The bundle holds only what the datastore
+loads:
+
+    data/data_bundle.tar
+        manifest.json                        written first
+        combinedBills_2025.json.zst          one zstd frame per file
+        repKPIs_2025.json.zst
+        reps_with_geo_data_a.geojson.zst
+        reps_with_geo_data_b.geojson.zst
+        sponsor_crosswalk.json.zst           (if it has been built)
+        advocacy_tags_2025.json.zst          (if it has been built)
+
+The tar itself isn't compressed, so a member can be found from the tar index
+and decoded on its own. The manifest lists each member's sha256 (of the
+decompressed bytes), sizes and schema version, plus the data version of the
+files it was built from.
+
+Reading decompresses straight into memory through a streaming decoder. The
+hash is checked while a member is read, the first time it is read, rather
+than for the whole bundle at open time. datastore.py reads from the bundle
+when it exists and falls back to the loose files otherwise. A deploy only
+needs the bundle. build_bundle() reads every member of a new bundle back and
+compares it with its source file before swapping it in.
+
+    python streamlit_app/bundle.py build      # data/*.json -> data/data_bundle.tar
+    python streamlit_app/bundle.py verify     # check every member (hash + JSON)
+    python streamlit_app/bundle.py ls
+"""
+
+import hashlib
+import io
+import json
+import os
+import tarfile
+import time
+from functools import lru_cache
+from pathlib import Path
+
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "data"
+BUNDLE_PATH = DATA_DIR / "data_bundle.tar"
+
+BUNDLE_FORMAT = 1
+ZSTD_LEVEL = 19
+CHUNK = 1 << 16
+
+# file name -> schema version; bump when the file's layout changes
+SCHEMAS = {
+    "combinedBills_2025.json": 1,
+    "repKPIs_2025.json": 1,
+    "reps_with_geo_data_a.geojson": 1,
+    "reps_with_geo_data_b.geojson": 1,
+    "sponsor_crosswalk.json": 1,
+    "advocacy_tags_2025.json": 1,
+}
+
+
+class BundleError(Exception):
+    pass
+
+
+# ---------------------
+# Build
+# ---------------------
+def _add_bytes(tar, name, data):
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    info.mtime = 0  # same inputs, same bytes
+    tar.addfile(info, io.BytesIO(data))
+
+
+def build_bundle(data_dir=DATA_DIR, out=BUNDLE_PATH, schemas=SCHEMAS, level=ZSTD_LEVEL):
+    if zstd is None:
+        raise ImportError("zstandard is not installed (pip install zstandard)")
+    from data_prep import data_version
+
+    data_dir, out = Path(data_dir), Path(out)
+    paths = [data_dir / name for name in schemas if (data_dir / name).exists()]
+    compressor = zstd.ZstdCompressor(level=level, write_checksum=True)
+
+    members, blobs = {}, {}
+    for p in paths:
+        raw = p.read_bytes()
+        blob = compressor.compress(raw)
+        members[p.name] = {
+            "file": p.name + ".zst",
+            "sha256": hashlib.sha256(raw).hexdigest(),
+            "size": len(raw),
+            "compressed_size": len(blob),
+            "schema": schemas[p.name],
+        }
+        blobs[p.name + ".zst"] = blob
+
+    manifest = {
+        "format": BUNDLE_FORMAT,
+        "built_at": int(time.time()),
+        "data_version": data_version(paths),
+        "members": members,
+    }
+    tmp = out.with_name(out.name + ".tmp")
+    with tarfile.open(tmp, "w", format=tarfile.PAX_FORMAT) as tar:
+        _add_bytes(tar, "manifest.json", json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8"))
+        for name, blob in blobs.items():
+            _add_bytes(tar, name, blob)
+    try:
+        check_bundle(tmp, {p.name: p for p in paths})
+    except Exception:
+        tmp.unlink(missing_ok=True)
+        raise
+    os.replace(tmp, out)
+    return manifest
+
+
+def check_bundle(path, sources):
+    """Round trip: every member verifies, parses as JSON and has the source
+    file's bytes. Raises BundleError on the first problem."""
+    bundle = Bundle(path)
+    for name, error in bundle.verify().items():
+        if error:
+            raise BundleError(error)
+    for name, src in sources.items():
+        bundle.read_json(name)
+        if bundle.read(name) != Path(src).read_bytes():
+            raise BundleError(f"{bundle.path.name}: {name} doesn't match {src}")
+
+
+# ---------------------
+# Read
+# ---------------------
+class Bundle:
+    """Read access to a data bundle. Members are verified on first read."""
+
+    def __init__(self, path=BUNDLE_PATH):
+        if zstd is None:
+            raise ImportError("zstandard is not installed (pip install zstandard)")
+        self.path = Path(path)
+        with tarfile.open(self.path, "r:") as tar:
+            try:
+                self.manifest = json.load(tar.extractfile("manifest.json"))
+            except KeyError:
+                raise BundleError(f"{self.path.name}: no manifest.json") from None
+            # where each member's bytes start; reads open their own handle, so
+            # sessions on different threads don't share a file position
+            self.offsets = {m.name: m.offset_data for m in tar.getmembers()}
+        if self.manifest.get("format") != BUNDLE_FORMAT:
+            raise BundleError(f"{self.path.name}: bundle format {self.manifest.get('format')}, "
+                              f"expected {BUNDLE_FORMAT}")
+        self.members = self.manifest["members"]
+        self.version = self.manifest["data_version"]
+        self.verified = set()
+
+    def __contains__(self, name):
+        return name in self.members
+
+    def schema(self, name):
+        return self.members[name]["schema"]
+
+    def iter_chunks(self, name, chunk=CHUNK):
+        """Decompressed bytes of a member, streamed. The sha256 is checked at the
+        end of the first full read; a mismatch raises BundleError."""
+        entry = self.members[name]
+        check = name not in self.verified
+        digest = hashlib.sha256() if check else None
+        with open(self.path, "rb") as f:
+            f.seek(self.offsets[entry["file"]])
+            # only the member's own bytes: past them is tar padding, which the
+            # decoder would try to read as another frame
+            blob = f.read(entry["compressed_size"])
+        reader = zstd.ZstdDecompressor().stream_reader(io.BytesIO(blob), read_across_frames=False)
+        seen = 0
+        try:
+            while seen < entry["size"]:
+                block = reader.read(min(chunk, entry["size"] - seen))
+                if not block:
+                    break
+                seen += len(block)
+                if check:
+                    digest.update(block)
+                yield block
+        except zstd.ZstdError as e:
+            raise BundleError(f"{self.path.name}: {name} is corrupt ({e})") from None
+        if seen != entry["size"]:
+            raise BundleError(f"{self.path.name}: {name} is truncated ({seen} of {entry['size']} bytes)")
+        if check:
+            if digest.hexdigest() != entry["sha256"]:
+                raise BundleError(f"{self.path.name}: {name} failed its sha256 check")
+            self.verified.add(name)
+
+    def read(self, name) -> bytes:
+        buf = bytearray()
+        for block in self.iter_chunks(name):
+            buf += block
+        return bytes(buf)
+
+    def read_json(self, name):
+        return json.loads(self.read(name))
+
+    def verify(self):
+        """Check every member; returns {name: error or None}."""
+        out = {}
+        for name in self.members:
+            self.verified.discard(name)
+            try:
+                for _ in self.iter_chunks(name):
+                    pass
+                out[name] = None
+            except BundleError as e:
+                out[name] = str(e)
+        return out
+
+
+@lru_cache(maxsize=2)
+def _open_bundle(path, mtime_ns):
+    return Bundle(path)
+
+
+def get_bundle(path=BUNDLE_PATH):
+    """The bundle if it exists and zstandard is installed, else None."""
+    path = Path(path)
+    if zstd is None or not path.exists():
+        return None
+    # keyed on mtime so a rebuilt bundle is picked up without a restart
+    return _open_bundle(str(path), path.stat().st_mtime_ns)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("command", choices=["build", "verify", "ls"])
+    ap.add_argument("--path", type=Path, default=BUNDLE_PATH)
+    args = ap.parse_args()
+
+    if args.command == "build":
+        manifest = build_bundle(out=args.path)
+        raw = sum(m["size"] for m in manifest["members"].values())
+        print(f"Wrote {args.path}: {len(manifest['members'])} members, "
+              f"{raw / 1e3:.0f} KB -> {args.path.stat().st_size / 1e3:.0f} KB")
+    elif args.command == "verify":
+        bundle = Bundle(args.path)
+        bad = {k: v for k, v in bundle.verify().items() if v}
+        for name in bundle.members:
+            if name not in bad:
+                try:
+                    bundle.read_json(name)
+                except ValueError as e:
+                    bad[name] = f"{args.path.name}: {name} is not valid JSON ({e})"
+        print("\n".join(bad.values()) if bad else "all members OK")
+        raise SystemExit(1 if bad else 0)
+    else:
+        for name, m in Bundle(args.path).members.items():
+            print(f"{name:<32} schema {m['schema']}  {m['size']:>8} -> {m['compressed_size']:>7} bytes  {m['sha256'][:12]}")
@@ -0,0 +1,147 @@
+# committees.py
+"""
+Committee assignments as a rep x committee x role edge table.
+
+repKPIs_2025.json stores Committee and Role as parallel lists per rep. They're
+normalized here once, when the data loads, into one row per assignment. Two
+prebuilt indexes sit on top of that table:
+  - rep -> committees
+  - committee -> members
+
+    python streamlit_app/committees.py   # writes data/committee_edges_2025.json
+"""
+
+import ast
+import json
+from itertools import zip_longest
+from pathlib import Path
+
+import pandas as pd
+
+from shared import SharedFrames
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+REPKPIS_PATH = DATA_DIR / "repKPIs_2025.json"
+EDGES_PATH = DATA_DIR / "committee_edges_2025.json"
+
+EDGE_COLS = ["Committee", "Role", "position"]
+UNKNOWN_ROLE = "Unknown"
+
+
+def to_list(value):
+    """A real list from a list, a stringified list, or a comma separated string."""
+    if isinstance(value, (list, tuple)):
+        return [str(v).strip() for v in value]
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return []
+    s = str(value).strip()
+    if not s:
+        return []
+    if s.startswith("["):
+        try:
+            parsed = ast.literal_eval(s)
+            if isinstance(parsed, (list, tuple)):
+                return [str(v).strip() for v in parsed]
+        except (ValueError, SyntaxError):
+            pass
+    return [v.strip() for v in s.split(",") if v.strip()]
+
+
+def build_committee_edges(repkpis: pd.DataFrame, key="rep_key",
+                          committee_col="Committee", role_col="Role",
+                          carry=("Representative", "Bill Sponsor", "Party", "Office")) -> pd.DataFrame:
+    """One row per (rep, committee) with the rep's role on it.
+
+    If a rep's Committee and Role lists don't line up, the extra committees get
+    an UNKNOWN_ROLE instead of being dropped; those reps are listed in
+    edges.attrs["mismatched"].
+    """
+    if key not in repkpis.columns:
+        key = "Bill Sponsor"
+    carry = [c for c in carry if c in repkpis.columns and c != key]
+    committees = repkpis[committee_col].map(to_list) if committee_col in repkpis.columns else [[]] * len(repkpis)
+    roles = repkpis[role_col].map(to_list) if role_col in repkpis.columns else [[]] * len(repkpis)
+
+    rows = []
+    mismatched = []
+    for rep_values, comms, rls in zip(repkpis[[key] + carry].itertuples(index=False), committees, roles):
+        if len(comms) != len(rls):
+            mismatched.append(rep_values[0])
+        for pos, (c, r) in enumerate(zip_longest(comms, rls[:len(comms)], fillvalue=UNKNOWN_ROLE)):
+            if c:
+                rows.append((*rep_values, c, r or UNKNOWN_ROLE, pos))
+
+    edges = pd.DataFrame(rows, columns=[key] + carry + EDGE_COLS)
+    edges.attrs["key"] = key
+    edges.attrs["mismatched"] = mismatched
+    return edges
+
+
+class CommitteeIndex(SharedFrames):
+    """Lookups over the edge table in both directions.
+
+    The indexes map a rep key / committee name to row positions in edges,
+    so a lookup is a dict get plus an iloc. edges is handed out as a shallow
+    copy (see shared.py).
+    """
+
+    SHARED = frozenset({"edges"})
+
+    def __init__(self, edges: pd.DataFrame, key=None):
+        self.key = key or edges.attrs.get("key", "rep_key")
+        self.edges = edges.reset_index(drop=True)
+        self.by_rep = self.edges.groupby(self.key, sort=False).indices
+        self.by_committee = self.edges.groupby("Committee", sort=True).indices
+
+    @property
+    def committee_names(self):
+        return list(self.by_committee)
+
+    def committees_for(self, rep_key) -> pd.DataFrame:
+        """The rep's committees + roles, in the order they were listed."""
+        rows = self.by_rep.get(rep_key)
+        if rows is None:
+            return self.edges.iloc[0:0]
+        return self.edges.iloc[rows].sort_values("position")
+
+    def roster(self, committee) -> pd.DataFrame:
+        """Members of a committee, chairs first."""
+        rows = self.by_committee.get(committee)
+        if rows is None:
+            return self.edges.iloc[0:0]
+        members = self.edges.iloc[rows]
+        return members.sort_values("Role", key=_role_rank)
+
+    def chairs(self, include_vice=True) -> pd.DataFrame:
+        """Who chairs what."""
+        role = self.edges["Role"].str.lower()
+        mask = role.str.contains("chair")
+        if not include_vice:
+            mask &= ~role.str.contains("vice")
+        return self.edges[mask].sort_values(["Committee", "Role"], key=_role_rank)
+
+
+def _role_rank(s: pd.Series):
+    if s.name != "Role":
+        return s
+    # Chair / Co-chair / House Chair / Senate Chair, then the vice chairs, then members
+    role = s.str.lower()
+    rank = pd.Series(9, index=s.index)
+    rank[role.str.contains("chair")] = 0
+    rank[role.str.contains("vice")] = 1
+    rank[role.eq("member")] = 2
+    return rank
+
+
+def write_edges(edges: pd.DataFrame, path=EDGES_PATH):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(edges.to_dict(orient="records"), f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    kpis = pd.read_json(REPKPIS_PATH, orient="records")
+    edges = build_committee_edges(kpis)
+    write_edges(edges)
+    print(f"Wrote {len(edges)} committee assignments for {edges[edges.attrs['key']].nunique()} reps to {EDGES_PATH}")
+    if edges.attrs["mismatched"]:
+        print("Committee/Role lengths differ for:", ", ".join(map(str, edges.attrs["mismatched"])))
@@ -0,0 +1,103 @@
+# data_prep.py
+"""
+Load-time preparation of the bills table.
+
+combinedBills_2025.json stores its dates as epoch milliseconds, while the
+scraper output (utah_bills_2025.json) stores ISO strings. Everything here runs
+once when the data is loaded so the render path only has to slice and show.
+"""
+
+import hashlib
+from pathlib import Path
+
+import pandas as pd
+
+# Date columns we know about in the bills data
+BILL_DATE_COLS = [
+    "Bill Date Raw",
+    "Bill Date (utc_iso)",
+    "Date Passed",
+    "Gov's Action Date",
+    "Effective Date",
+    "Scrape Timestamp",
+]
+
+# The column the dashboard sorts on
+BILL_DATE_SORT_COL = "bill_date_parsed"
+
+DISPLAY_DATE_FORMAT = "%Y-%m-%d"
+DISPLAY_SUFFIX = " (display)"
+
+
+def display_col(col):
+    """Name of the preformatted string column for a date column."""
+    return f"{col}{DISPLAY_SUFFIX}"
+
+
+def to_datetime_col(s: pd.Series) -> pd.Series:
+    """Convert a column of epoch-ms numbers or ISO strings to naive UTC datetime64."""
+    if pd.api.types.is_datetime64_any_dtype(s):
+        if getattr(s.dt, "tz", None) is not None:
+            return s.dt.tz_convert("UTC").dt.tz_localize(None)
+        return s
+    if pd.api.types.is_numeric_dtype(s):
+        return pd.to_datetime(s, unit="ms", errors="coerce")
+    # object column: could be a mix of ms numbers and strings
+    numeric = pd.to_numeric(s, errors="coerce")
+    if numeric.notna().sum() == s.notna().sum():
+        return pd.to_datetime(numeric, unit="ms", errors="coerce")
+    parsed = pd.to_datetime(s, errors="coerce", utc=True).dt.tz_localize(None)
+    from_ms = pd.to_datetime(numeric, unit="ms", errors="coerce")
+    return parsed.fillna(from_ms)
+
+
+def prepare_bills(bills: pd.DataFrame) -> pd.DataFrame:
+    """Return the canonical typed bills table.
+
+    - every known date column becomes datetime64[ns] (naive, UTC)
+    - each of those gets a preformatted "<col> (display)" string column
+    - bill_date_parsed is the bill date used for sorting
+    """
+    bills = bills.copy()
+    bills.columns = bills.columns.str.strip()
+
+    for col in BILL_DATE_COLS:
+        if col in bills.columns:
+            bills[col] = to_datetime_col(bills[col])
+
+    if "Bill Date (utc_iso)" in bills.columns:
+        bills[BILL_DATE_SORT_COL] = bills["Bill Date (utc_iso)"]
+    elif "Bill Date Raw" in bills.columns:
+        bills[BILL_DATE_SORT_COL] = bills["Bill Date Raw"]
+    else:
+        bills[BILL_DATE_SORT_COL] = pd.NaT
+
+    for col in BILL_DATE_COLS + [BILL_DATE_SORT_COL]:
+        if col in bills.columns:
+            bills[display_col(col)] = bills[col].dt.strftime(DISPLAY_DATE_FORMAT).fillna("")
+
+    return bills
+
+
+def display_frame(bills: pd.DataFrame, cols) -> pd.DataFrame:
+    """Select cols for display, swapping date columns for their preformatted strings."""
+    out = {}
+    for c in cols:
+        fmt = display_col(c)
+        out[c] = bills[fmt] if fmt in bills.columns else bills[c]
+    return pd.DataFrame(out, index=bills.index)
+
+
+def data_version(paths) -> str:
+    """Short fingerprint of the data files (name, size, mtime).
+
+    Used as a cache key so anything derived from the data is rebuilt when a
+    file changes.
+    """
+    h = hashlib.sha1()
+    for p in paths:
+        p = Path(p)
+        if p.exists():
+            st_ = p.stat()
+            h.update(f"{p.name}:{st_.st_size}:{st_.st_mtime_ns};".encode())
+    return h.hexdigest()[:12]
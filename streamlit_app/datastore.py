@@ -0,0 +1,425 @@
+# datastore.py
+"""
+Process-wide, read-only datastore for the Streamlit apps.
+
+Everything derived from the data files (typed bills, rep keys, the merged
+reps/KPI/geo table, bills joined to reps, the committee index and the KPI
+engine) is built once per data version. It's held with st.cache_resource, so
+every session gets the same objects by reference instead of a pickled copy.
+Per-session state should only be selections (st.session_state).
+
+The frames are shared, so treat them as immutable. DataStore, the committee
+index and the KPI engine hand each one out as a shallow copy: no data is
+copied, and with copy-on-write any in-place change a session makes (a new
+column, .loc assignment) lands on that copy, never on the shared frame.
+shared.py turns copy-on-write on for pandas 2.x; it's the default from 3.
+"""
+
+import io
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import geopandas as gpd
+import pandas as pd
+import streamlit as st
+
+from advocacy import TAGS_PATH, ingest_all, join_advocacy
+from bundle import BUNDLE_PATH, get_bundle
+from committees import CommitteeIndex, build_committee_edges
+from data_prep import data_version, prepare_bills
+from kpis import KPIEngine
+from records import decode_any, decode_frame
+from shared import SharedFrames
+from entity_resolution import (
+    CROSSWALK_PATH, LEGISLATOR_ID_COL, resolve, sponsor_lookup,
+)
+import perf
+
+
+# ---------------------
+# Paths
+# ---------------------
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "data"
+
+BILLS_PATH = DATA_DIR / "combinedBills_2025.json"
+REPKPIS_PATH = DATA_DIR / "repKPIs_2025.json"
+GEO_PATH_A = DATA_DIR / "reps_with_geo_data_a.geojson"
+GEO_PATH_B = DATA_DIR / "reps_with_geo_data_b.geojson"
+DATA_PATHS = (BILLS_PATH, REPKPIS_PATH, GEO_PATH_A, GEO_PATH_B, CROSSWALK_PATH, TAGS_PATH, BUNDLE_PATH)
+
+
+# ---------------------
+# Helpers
+# ---------------------
+def bundled(path: Path):
+    """The data bundle (bundle.py) if it should be read instead of this file.
+
+    A loose file that's newer than the bundle wins, so files rebuilt by the
+    pipeline are used before the bundle is rebuilt.
+    """
+    path = Path(path)
+    bundle = get_bundle()
+    if bundle is None or path.name not in bundle:
+        return None
+    if path.exists() and path.stat().st_mtime > bundle.path.stat().st_mtime:
+        return None
+    return bundle
+
+
+def safe_read_json(path: Path, schema=None) -> pd.DataFrame:
+    """A JSON records file as a DataFrame, parsed once.
+
+    With a schema name ("bills", "kpis"; see records.py) every record is type-checked
+    while decoding and a bad one raises records.SchemaError naming it.
+    """
+    path = Path(path)
+    bundle = bundled(path)
+    if bundle is not None:
+        data = bundle.read(path.name)
+    elif path.exists():
+        data = path.read_bytes()
+    else:
+        raise FileNotFoundError(path)
+    if schema is None:
+        return decode_any(data, path.name)
+    return decode_frame(data, schema, path.name)
+
+def find_col(df: pd.DataFrame, candidates):
+    if df is None:
+        return None
+    cols_lower = {c.lower(): c for c in df.columns}
+    for cand in candidates:
+        if not cand:
+            continue
+        if cand.lower() in cols_lower:
+            return cols_lower[cand.lower()]
+    # substring fallback
+    for cand in candidates:
+        if not cand:
+            continue
+        for c in df.columns:
+            if cand.lower() in c.lower():
+                return c
+    return None
+
+def make_rep_key(name):
+    """Return lastname_firstinitial (lowercase, no spaces). Handles:
+       - 'Last, F.'
+       - 'Last F.' (two tokens where second is single letter)
+       - 'First Last'
+    """
+    if pd.isna(name):
+        return ""
+    s = str(name).strip().replace(".", "")
+    if s == "":
+        return ""
+    # 'Last, F' pattern
+    if "," in s:
+        left, right = [p.strip() for p in s.split(",", 1)]
+        last = left
+        first_token = right.split()[0] if right else ""
+        first = first_token
+    else:
+        parts = s.split()
+        if len(parts) == 1:
+            # single token, use it as last with empty initial
+            last = parts[0]
+            first = ""
+        elif len(parts) == 2 and len(parts[1]) == 1:
+            # 'Last F' pattern
+            last = parts[0]
+            first = parts[1]
+        else:
+            # assume 'First Last' or longer - use first and last
+            last = parts[-1]
+            first = parts[0]
+    last_clean = "".join(last.split()).lower()
+    first_initial = first[0].lower() if (first and len(first) > 0) else ""
+    return f"{last_clean}_{first_initial}"
+
+# create a friendly display name (prioritized)
+def pick_display_name(row):
+    candidates = [
+        "Representative_kpi", "Representative_geo",
+        "Bill Sponsor_kpi", "Bill Sponsor_geo",
+        "Representative", "Bill Sponsor", "Rep_Name"
+    ]
+    for c in candidates:
+        if c in row.index and pd.notna(row[c]) and str(row[c]).strip():
+            return str(row[c]).strip()
+    # fallback: try common columns in original geo df
+    for c in ["Representative", "Representative_geo", "Bill Sponsor", "Bill Sponsor_geo"]:
+        if c in row.index and pd.notna(row[c]) and str(row[c]).strip():
+            return str(row[c]).strip()
+    return row.get("rep_key", "")
+
+def add_rep_key(df: pd.DataFrame, candidates):
+    """rep_key from the first name column in candidates that exists ('' if none)."""
+    name_col = find_col(df, candidates)
+    df["rep_key"] = df[name_col].fillna("").apply(make_rep_key) if name_col else ""
+    return df
+
+
+# ---------------------
+# Load datasets
+# ---------------------
+def _read_bills(path):
+    # dates are typed + preformatted once here, not on every render
+    return prepare_bills(safe_read_json(path, "bills"))
+
+
+def _read_geo(path):
+    bundle = bundled(path)
+    if bundle is not None:
+        return gpd.read_file(io.BytesIO(bundle.read(path.name)))
+    return gpd.read_file(path)
+
+
+class DatasetLoad:
+    """The data files, read concurrently in a thread pool.
+
+    The GeoJSON parts dominate and pyogrio releases the GIL while parsing, so
+    they overlap with the JSON reads. bills / repkpis / geo_parts are futures:
+    a caller can use the KPI table (rep names) as soon as it's in, before the
+    geometry is. timings holds each file's read time in ms once it finishes.
+    """
+
+    def __init__(self, bills_path=BILLS_PATH, repkpis_path=REPKPIS_PATH,
+                 geo_paths=(GEO_PATH_A, GEO_PATH_B), max_workers=4):
+        self.timings = {}
+        self.started = time.perf_counter()
+        geo_paths = [Path(p) for p in geo_paths if Path(p).exists() or bundled(p) is not None]
+        if not geo_paths:
+            raise FileNotFoundError("Missing both geojson parts (reps_with_geo_data_a/b.geojson).")
+        pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="load_datasets")
+        # geometry first: it takes longest
+        self.geo_parts = [pool.submit(self._timed, p.name, _read_geo, p) for p in geo_paths]
+        self.bills = pool.submit(self._timed, Path(bills_path).name, _read_bills, bills_path)
+        self.repkpis = pool.submit(self._timed, Path(repkpis_path).name, safe_read_json, repkpis_path, "kpis")
+        pool.shutdown(wait=False)
+
+    def _timed(self, name, fn, *args):
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            self.timings[name] = round((time.perf_counter() - start) * 1000, 1)
+
+    def geo(self):
+        return pd.concat([f.result() for f in self.geo_parts], ignore_index=True)
+
+    def done(self):
+        return all(f.done() for f in [self.bills, self.repkpis, *self.geo_parts])
+
+    def result(self):
+        """(bills, repkpis, repsgeo); blocks until every file is read."""
+        frames = self.bills.result(), self.repkpis.result(), self.geo()
+        # reads ran on pool threads, outside the page's perf run; add them here
+        run = perf.current_run()
+        if run is not None:
+            for name, ms in self.timings.items():
+                run.add(f"read {name}", ms)
+        return frames
+
+
+def load_datasets(bills_path=BILLS_PATH, repkpis_path=REPKPIS_PATH, geo_paths=(GEO_PATH_A, GEO_PATH_B)):
+    return DatasetLoad(bills_path, repkpis_path, geo_paths).result()
+
+
+def load_crosswalk(bills, reps, sponsor_col="Bill Sponsor"):
+    """The persisted sponsor crosswalk if it covers these bills, else resolve now."""
+    if bundled(CROSSWALK_PATH) is not None or CROSSWALK_PATH.exists():
+        crosswalk = safe_read_json(CROSSWALK_PATH)
+        if set(bills[sponsor_col].dropna()) <= set(crosswalk["sponsor"]):
+            return crosswalk
+    return resolve(bills, reps, sponsor_col=sponsor_col)
+
+
+def load_advocacy_tags():
+    """The persisted advocacy tags, else parse the source pages now."""
+    if bundled(TAGS_PATH) is not None or TAGS_PATH.exists():
+        return safe_read_json(TAGS_PATH)
+    return ingest_all()
+
+
+@dataclass(frozen=True)
+class DataStore(SharedFrames):
+    version: str
+    bills: pd.DataFrame            # typed bills + rep_key
+    repkpis: pd.DataFrame          # one KPI row per rep_key
+    reps: gpd.GeoDataFrame         # geo + KPIs merged, with display_name
+    bills_with_rep: pd.DataFrame   # bills joined to reps (no geometry)
+    committees: CommitteeIndex
+    kpi_engine: KPIEngine
+    bill_sponsor_col: str
+    rep_choices: tuple
+
+    # handed out as shallow copies (see the module docstring)
+    SHARED = frozenset({"bills", "repkpis", "reps", "bills_with_rep"})
+
+    def bills_for(self, rep_key) -> pd.DataFrame:
+        if not rep_key:
+            return self.bills_with_rep.iloc[0:0]
+        return self.bills_with_rep[self.bills_with_rep["rep_key"] == rep_key]
+
+    def memory_mb(self) -> dict:
+        """Deep memory use of each shared frame, in MB."""
+        frames = {
+            "bills": self.bills,
+            "repkpis": self.repkpis,
+            "reps": self.reps,
+            "bills_with_rep": self.bills_with_rep,
+            "committee_edges": self.committees.edges,
+            "kpi_cube": self.kpi_engine.cube,
+        }
+        return {k: round(v.memory_usage(deep=True).sum() / 1e6, 3) for k, v in frames.items()}
+
+
+def build_datastore(version=None, frames=None, load=None) -> DataStore:
+    """Build everything from the data files (or from (bills, repkpis, repsgeo)
+    frames, or from a DatasetLoad that's already under way)."""
+    if frames is None:
+        with perf.timer("load_datasets"):
+            bills_df, repkpis_df, repsgeo_gdf = (load or DatasetLoad()).result()
+    else:
+        # the caller keeps its frames; columns are added below
+        bills_df, repkpis_df, repsgeo_gdf = (f.copy() for f in frames)
+
+    # Normalize column names (strip whitespace)
+    repkpis_df.columns = repkpis_df.columns.str.strip()
+    repsgeo_gdf.columns = repsgeo_gdf.columns.str.strip()
+
+    bill_sponsor_col = find_col(bills_df, ["Bill Sponsor", "Sponsor", "bill_sponsor"])
+    if bill_sponsor_col is None:
+        raise ValueError("Could not find a 'Bill Sponsor' column in bills data.")
+
+    # ---------------------
+    # Build consistent rep_key for all three datasets
+    # ---------------------
+    # rep_key is the legislator id (Img_ID) from the sponsor crosswalk, so the
+    # joins below are exact lookups. Without ids we fall back to make_rep_key.
+    if LEGISLATOR_ID_COL in repsgeo_gdf.columns:
+        with perf.timer("sponsor crosswalk"):
+            crosswalk = load_crosswalk(bills_df, repsgeo_gdf, bill_sponsor_col)
+            sponsor_to_id = sponsor_lookup(crosswalk)
+            bills_df["rep_key"] = bills_df[bill_sponsor_col].map(sponsor_to_id).fillna("")
+            kpi_sponsor_col = find_col(repkpis_df, ["Bill Sponsor"])
+            repkpis_df["rep_key"] = repkpis_df[kpi_sponsor_col].map(sponsor_to_id).fillna("") if kpi_sponsor_col else ""
+            repsgeo_gdf["rep_key"] = repsgeo_gdf[LEGISLATOR_ID_COL].fillna("").astype(str)
+    else:
+        with perf.timer("make_rep_key"):
+            bills_df["rep_key"] = bills_df[bill_sponsor_col].fillna("").apply(make_rep_key)
+            add_rep_key(repkpis_df, ["Bill Sponsor", "Representative", "Rep_Name", "Rep Name"])
+            add_rep_key(repsgeo_gdf, ["Bill Sponsor", "Representative", "Rep_Name", "Rep Name", "Representative_geo"])
+
+    # advocacy groups' stance/status per bill (<source>_stance / <source>_status)
+    with perf.timer("advocacy tags"):
+        bills_df = join_advocacy(bills_df, load_advocacy_tags(), bill_col="Bill Number")
+
+    # Deduplicate KPIs by rep_key keeping first KPI row per rep_key (unresolved rows can't join)
+    repkpis_df = repkpis_df[repkpis_df["rep_key"] != ""].drop_duplicates(subset=["rep_key"], keep="first")
+
+    # ---------------------
+    # Merge datasets (geo + kpi), then join bills
+    # ---------------------
+    with perf.timer("merge reps + KPIs"):
+        reps_merged = repsgeo_gdf.merge(repkpis_df, on="rep_key", how="left", suffixes=("_geo", "_kpi"))
+        reps_merged["display_name"] = reps_merged.apply(pick_display_name, axis=1)
+        # keep a cleaned version without trailing spaces
+        reps_merged["display_name"] = reps_merged["display_name"].fillna("").astype(str).str.strip()
+
+    # bills joined to reps (so each bill row will carry rep metadata if merged)
+    with perf.timer("merge bills + reps"):
+        reps_attrs = pd.DataFrame(reps_merged.drop(columns="geometry", errors="ignore"))
+        bills_with_rep = bills_df.merge(reps_attrs, on="rep_key", how="left")
+
+    # Committee/Role lists -> rep x committee x role edge table, indexed both ways
+    with perf.timer("committee index"):
+        committee_index = CommitteeIndex(build_committee_edges(repkpis_df))
+    # KPI engine: per-rep KPIs + chamber/party/committee/county cube from the bills
+    with perf.timer("KPI engine"):
+        kpi_engine = KPIEngine(bills_df, reps_attrs, edges=committee_index.edges)
+
+    rep_choices = tuple(sorted(x for x in reps_merged["display_name"].unique().tolist() if str(x).strip()))
+
+    return DataStore(
+        version=version or data_version(DATA_PATHS),
+        bills=bills_df,
+        repkpis=repkpis_df,
+        reps=reps_merged,
+        bills_with_rep=bills_with_rep,
+        committees=committee_index,
+        kpi_engine=kpi_engine,
+        bill_sponsor_col=bill_sponsor_col,
+        rep_choices=rep_choices,
+    )
+
+
+# Reads started for a version whose store isn't built yet (see preview_kpis)
+_loads = {}
+
+
+def _load_for(version):
+    with _swap_lock:
+        if version not in _loads:
+            _loads[version] = DatasetLoad()
+        return _loads[version]
+
+
+@st.cache_resource(max_entries=2, show_spinner="Loading data...")
+def _shared_datastore(version):
+    try:
+        return build_datastore(version, load=_load_for(version))
+    finally:
+        with _swap_lock:
+            _loads.pop(version, None)
+
+
+# When the files change under a running app (scripts/watch_pipeline.py), the
+# new version is built in a background thread while sessions keep getting the
+# store they already had; the next rerun after it's ready gets the new one.
+_live = {}
+_warming = set()
+_swap_lock = threading.Lock()
+
+
+def _warm(version):
+    try:
+        store = build_datastore(version)
+        with _swap_lock:
+            _live["store"] = store
+    finally:
+        with _swap_lock:
+            _warming.discard(version)
+
+
+def datastore_ready() -> bool:
+    """True if get_datastore() will return without loading anything."""
+    return "store" in _live
+
+
+def preview_kpis() -> pd.DataFrame:
+    """The KPI table, for a cold worker to show rep names while geometry loads.
+
+    Starts the reads that the datastore build will then pick up, and waits
+    only for repKPIs.
+    """
+    return _load_for(data_version(DATA_PATHS)).repkpis.result()
+
+
+def get_datastore() -> DataStore:
+    """The shared datastore for the current data version (built on first use)."""
+    version = data_version(DATA_PATHS)
+    with _swap_lock:
+        live = _live.get("store")
+        if live is not None and live.version != version and version not in _warming:
+            _warming.add(version)
+            threading.Thread(target=_warm, args=(version,), daemon=True).start()
+    if live is None:
+        # first load: nothing to serve yet, so build in the foreground
+        live = _live.setdefault("store", _shared_datastore(version))
+    return live
@@ -0,0 +1,237 @@
+# db.py
+"""
+Optional DuckDB backend.
+
+The datastore loads every file into pandas and pages filter whole frames in
+memory. When duckdb is installed, the pipeline can instead write everything
+into one file, data/electiontime.duckdb, with these tables:
+
+    bills        typed bills + rep_key (indexed on rep_key, Bill Number, bill date)
+    reps         reps + KPIs, no geometry (indexed on rep_key, DistrictKey)
+    kpis         per-rep KPIs from the KPI engine (rep_key)
+    committees   rep x committee edge table (rep_key, Committee)
+    candidates   data/cleaned_candidates_data.csv, all text (Office, District)
+    districts    WKB geometry + bbox + centroid per district (DistrictKey, rep_key)
+    meta         data_version and build time
+
+DB returns small frames for one rep, bill, district or date range, so a page
+that only queries it doesn't hold any table in memory. DuckDB has no spatial
+index without its spatial extension, so districts keep a plain bbox for
+window queries.
+
+Limitation: app.py still builds the full pandas DataStore in every process
+(rep picker, map geometry, last-name fallback and bulk export read it) and
+only takes a rep's bills and committees from DB. With the DB file built,
+memory is therefore the datastore plus DuckDB's cache. It does not stay
+flat as bill history grows until those panels query DB too.
+
+    python streamlit_app/db.py              # build from the current data files
+
+Without duckdb (or before the file has been built) get_db() returns None and
+callers use the pandas datastore as before.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+BASE_DIR = Path(__file__).resolve().parent
+DB_PATH = BASE_DIR / "data" / "electiontime.duckdb"
+CANDIDATES_PATH = BASE_DIR.parent / "data" / "cleaned_candidates_data.csv"
+
+INDEXES = {
+    "bills": ["rep_key", "Bill Number", "bill_date_parsed"],
+    "reps": ["rep_key", "DistrictKey"],
+    "kpis": ["rep_key"],
+    "committees": ["rep_key", "Committee"],
+    "candidates": ["Office", "District"],
+    "districts": ["DistrictKey", "rep_key"],
+}
+
+
+# ---------------------
+# Build (pipeline side)
+# ---------------------
+def _flat(df: pd.DataFrame) -> pd.DataFrame:
+    """List/dict cells (Committee, Role...) as JSON text so every column has one SQL type."""
+    df = pd.DataFrame(df)
+    for col in df.columns[df.dtypes == object]:
+        if df[col].map(lambda v: isinstance(v, (list, tuple, dict))).any():
+            df[col] = df[col].map(lambda v: json.dumps(v) if isinstance(v, (list, tuple, dict)) else v)
+    return df
+
+
+def district_table(reps) -> pd.DataFrame:
+    geom = reps.geometry
+    bounds = geom.bounds
+    centroid = geom.centroid
+    return pd.DataFrame({
+        "DistrictKey": reps["DistrictKey"].values,
+        "Chamber": reps["Chamber"].values if "Chamber" in reps.columns else None,
+        "rep_key": reps["rep_key"].values,
+        "minx": bounds["minx"].values, "miny": bounds["miny"].values,
+        "maxx": bounds["maxx"].values, "maxy": bounds["maxy"].values,
+        "lon": centroid.x.values, "lat": centroid.y.values,
+        "wkb": geom.to_wkb().values,
+    })
+
+
+def build_db(store, path=DB_PATH, candidates_path=CANDIDATES_PATH):
+    """Write the datastore's frames into a fresh database file, then swap it in."""
+    if duckdb is None:
+        raise ImportError("duckdb is not installed (pip install duckdb)")
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.unlink(missing_ok=True)
+
+    tables = {
+        "bills": _flat(store.bills),
+        "reps": _flat(store.reps.drop(columns="geometry")),
+        "kpis": store.kpi_engine.rep_kpis.reset_index(),
+        "committees": _flat(store.committees.edges),
+        "districts": district_table(store.reps),
+    }
+    con = duckdb.connect(str(tmp))
+    try:
+        for name, df in tables.items():
+            con.register("frame", df)
+            con.execute(f"CREATE TABLE {name} AS SELECT * FROM frame")
+            con.unregister("frame")
+        if Path(candidates_path).exists():
+            con.execute("CREATE TABLE candidates AS SELECT * FROM read_csv_auto(?, all_varchar = true)",
+                        [str(candidates_path)])
+        existing = {r[0] for r in con.execute("SELECT table_name FROM information_schema.tables").fetchall()}
+        for table, cols in INDEXES.items():
+            for col in cols:
+                if table in existing:
+                    slug = col.lower().replace(" ", "_")
+                    con.execute(f'CREATE INDEX idx_{table}_{slug} ON {table} ("{col}")')
+        con.execute("CREATE TABLE meta AS SELECT ? AS data_version, ? AS built_at", [store.version, time.time()])
+    finally:
+        con.close()
+    os.replace(tmp, path)
+    return path
+
+
+# ---------------------
+# Query layer (app side)
+# ---------------------
+class DB:
+    """Read-only queries that return small frames.
+
+    One connection is shared across sessions; each query runs on its own
+    cursor, which is how DuckDB lets several threads use one database.
+    """
+
+    def __init__(self, path=DB_PATH):
+        self.path = Path(path)
+        self.con = duckdb.connect(str(self.path), read_only=True)
+        self.version = self.con.execute("SELECT data_version FROM meta").fetchone()[0]
+
+    def query(self, sql, params=()) -> pd.DataFrame:
+        return self.con.cursor().execute(sql, list(params)).df()
+
+    # --- reps
+    def rep(self, rep_key) -> dict:
+        df = self.query("SELECT * FROM reps WHERE rep_key = ?", [rep_key])
+        return df.iloc[0].to_dict() if len(df) else {}
+
+    def reps(self, chamber=None, party=None) -> pd.DataFrame:
+        sql, params = "SELECT * FROM reps WHERE 1=1", []
+        if chamber:
+            sql += " AND Chamber = ?"
+            params.append(chamber)
+        if party:
+            sql += " AND Party_geo = ?"
+            params.append(party)
+        return self.query(sql + " ORDER BY display_name", params)
+
+    def rep_for_district(self, district_key) -> dict:
+        df = self.query("SELECT * FROM reps WHERE DistrictKey = ?", [district_key])
+        return df.iloc[0].to_dict() if len(df) else {}
+
+    def kpis_for(self, rep_key) -> dict:
+        df = self.query("SELECT total_bills, passed_bills, failed_bills, pass_rate FROM kpis WHERE rep_key = ?",
+                        [rep_key])
+        return df.iloc[0].to_dict() if len(df) else None
+
+    # --- bills
+    def bills_for(self, rep_key) -> pd.DataFrame:
+        return self.query("SELECT * FROM bills WHERE rep_key = ? ORDER BY bill_date_parsed DESC", [rep_key])
+
+    def bill(self, bill_number) -> dict:
+        df = self.query('SELECT * FROM bills WHERE "Bill Number" = ?', [bill_number])
+        return df.iloc[0].to_dict() if len(df) else {}
+
+    def bills_between(self, start, end, columns="*") -> pd.DataFrame:
+        return self.query(f"SELECT {columns} FROM bills WHERE bill_date_parsed BETWEEN ? AND ? "
+                          "ORDER BY bill_date_parsed", [pd.Timestamp(start), pd.Timestamp(end)])
+
+    def search_bills(self, text, limit=50) -> pd.DataFrame:
+        return self.query('SELECT "Bill Number", "Bill Title", "Bill Sponsor", "Bill Status", rep_key FROM bills '
+                          'WHERE "Bill Title" ILIKE ? ORDER BY bill_date_parsed DESC LIMIT ?',
+                          [f"%{text}%", limit])
+
+    # --- committees
+    def committees_for(self, rep_key) -> pd.DataFrame:
+        return self.query("SELECT * FROM committees WHERE rep_key = ? ORDER BY position", [rep_key])
+
+    def roster(self, committee) -> pd.DataFrame:
+        return self.query("SELECT * FROM committees WHERE Committee = ? "
+                          "ORDER BY CASE WHEN lower(Role) LIKE '%vice%' THEN 1 "
+                          "WHEN lower(Role) LIKE '%chair%' THEN 0 WHEN lower(Role) = 'member' THEN 2 ELSE 9 END",
+                          [committee])
+
+    # --- candidates
+    def candidates(self, office=None, district=None, party=None) -> pd.DataFrame:
+        sql, params = "SELECT * FROM candidates WHERE 1=1", []
+        for col, value in [("Office", office), ("District", district), ("Party", party)]:
+            if value is not None:
+                sql += f' AND "{col}" = ?'
+                params.append(str(value))
+        return self.query(sql, params)
+
+    # --- districts
+    def district_geometry(self, district_key):
+        """Shapely geometry for one district (None if unknown)."""
+        from shapely import from_wkb
+        row = self.con.cursor().execute("SELECT wkb FROM districts WHERE DistrictKey = ?",
+                                        [district_key]).fetchone()
+        return from_wkb(bytes(row[0])) if row else None
+
+    def districts_in(self, minx, miny, maxx, maxy) -> pd.DataFrame:
+        """Districts whose bbox overlaps the window (no geometry column)."""
+        return self.query("SELECT DistrictKey, Chamber, rep_key, lon, lat FROM districts "
+                          "WHERE maxx >= ? AND minx <= ? AND maxy >= ? AND miny <= ?",
+                          [minx, maxx, miny, maxy])
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _open_db(path, mtime_ns):
+    return DB(path)
+
+
+def get_db(path=DB_PATH):
+    """The shared DB, or None if duckdb isn't installed or the file hasn't been built."""
+    path = Path(path)
+    if duckdb is None or not path.exists():
+        return None
+    # keyed on mtime so a rebuilt file is picked up without a restart
+    return _open_db(str(path), path.stat().st_mtime_ns)
+
+
+if __name__ == "__main__":
+    from datastore import build_datastore
+
+    start = time.perf_counter()
+    out = build_db(build_datastore())
+    print(f"Wrote {out} ({out.stat().st_size / 1e6:.1f} MB) in {time.perf_counter() - start:.1f}s")
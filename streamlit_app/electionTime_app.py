@@ -4,9 +4,12 @@ import streamlit as st
 main_page = st.Page("pages/main_page.py", title="Home", icon="🏠")
 page_2 = st.Page("pages/page_2.py", title="Representatives", icon="❄️")
 page_3 = st.Page("pages/page_3.py", title="Page 3", icon="🎉")
+# not pages/committees.py: that would shadow the committees module it imports
+committees_page = st.Page("pages/committee_explorer.py", title="Committees", icon="🏛️", url_path="committees")
+statewide_page = st.Page("pages/statewide_map.py", title="Statewide Map", icon="🗺️")
 
 # Set up navigation
-pg = st.navigation([main_page, page_2, page_3])
+pg = st.navigation([main_page, page_2, statewide_page, committees_page, page_3])
 
 st.write("# Welcome to the ElectionTime App! 👋")
 
@@ -0,0 +1,294 @@
+# entity_resolution.py
+"""
+Sponsor -> legislator resolution.
+
+Bills name their sponsor as "Last, F." which make_rep_key() squashes to
+lastname_firstinitial. That collides ("Owens, D." is Doug Owens in the House
+and "Owens, DR." is Derrin R. Owens in the Senate) and misses sponsors listed
+by initials or a middle name ("Acton, CK.", "Walter, N." = R. Neil Walter).
+
+This resolves every distinct (session, sponsor) once, offline:
+  1. block candidates by normalized surname (only same-surname pairs are scored)
+  2. score given names within each block with rapidfuzz cdist, in one batch
+     per block (initials ratio, initials prefix/subsequence, full-name overlap)
+  3. adjust with chamber (from the bill categories), session and district
+  4. assign one-to-one per session, best score first
+
+The output is a crosswalk with a confidence score per sponsor, so joins are
+exact key lookups:
+
+    python streamlit_app/entity_resolution.py   # writes data/sponsor_crosswalk.json
+"""
+
+import json
+import re
+import unicodedata
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    from rapidfuzz import fuzz
+    from rapidfuzz.process import cdist
+except ImportError:  # slow pure-python fallback
+    from difflib import SequenceMatcher
+
+    class fuzz:
+        @staticmethod
+        def ratio(a, b):
+            return SequenceMatcher(None, a, b).ratio() * 100
+
+    def cdist(queries, choices, scorer=fuzz.ratio, **kwargs):
+        return np.array([[scorer(q, c) for c in choices] for q in queries], dtype=float)
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+CROSSWALK_PATH = DATA_DIR / "sponsor_crosswalk.json"
+
+DEFAULT_SESSION = "2025GS"
+LEGISLATOR_ID_COL = "Img_ID"
+MATCH_THRESHOLD = 60.0
+
+CROSSWALK_COLS = [
+    "session", "sponsor", "legislator_id", "Representative", "Chamber", "DistrictKey",
+    "score", "runner_up_score", "candidates", "method",
+]
+
+# score adjustments from the non-name signals
+CHAMBER_MATCH, CHAMBER_MISMATCH = 15.0, -30.0
+SESSION_MISMATCH = -50.0
+DISTRICT_MATCH = 20.0
+
+SUFFIXES = {"jr", "sr", "ii", "iii", "iv"}
+
+
+# ---------------------
+# Name normalization
+# ---------------------
+def _fold(s):
+    s = unicodedata.normalize("NFKD", str(s))
+    return "".join(ch for ch in s if not unicodedata.combining(ch))
+
+
+def norm_surname(s):
+    """'Dailey-Provost' -> 'daileyprovost', 'MacPherson' -> 'macpherson'"""
+    return re.sub(r"[^a-z]", "", _fold(s).lower())
+
+
+def _given_tokens(given):
+    return [t for t in re.split(r"[\s.]+", _fold(given)) if t and t.lower() not in SUFFIXES]
+
+
+def given_features(given):
+    """(initials, full names) for a given-name string.
+
+    'CK.' -> ('ck', set()), 'K. A.' -> ('ka', set()), 'A. Cory' -> ('ac', {'cory'}),
+    'Cheryl K.' -> ('ck', {'cheryl'})
+    """
+    initials = []
+    names = set()
+    for tok in _given_tokens(given):
+        if tok.isupper() and len(tok) <= 3:
+            # run-together initials like "CK" or "MG"
+            initials.extend(tok.lower())
+        else:
+            initials.append(tok[0].lower())
+            if len(tok) > 1:
+                names.add(tok.lower())
+    return "".join(initials), names
+
+
+def split_sponsor(name):
+    """'Peterson, K.' -> ('Peterson', 'K.'); 'First Last' -> ('Last', 'First')"""
+    if name is None or (isinstance(name, float) and pd.isna(name)):
+        return "", ""
+    s = str(name).strip()
+    if "," in s:
+        last, given = s.split(",", 1)
+        return last.strip(), given.strip()
+    parts = s.split()
+    if len(parts) == 1:
+        return parts[0], ""
+    if parts[-1].strip(".").lower() in SUFFIXES and len(parts) > 2:
+        parts = parts[:-1]
+    return parts[-1], " ".join(parts[:-1])
+
+
+def _is_subsequence(short, long):
+    it = iter(long)
+    return all(ch in it for ch in short)
+
+
+# ---------------------
+# Inputs
+# ---------------------
+def sponsor_table(bills, sponsor_col="Bill Sponsor", session=DEFAULT_SESSION):
+    """One row per (session, sponsor) with the chamber their bills came from."""
+    df = pd.DataFrame({
+        "sponsor": bills[sponsor_col],
+        "session": bills["Session"] if "Session" in bills.columns else session,
+        "chamber": bills["Category"].astype(str).str.split().str[0] if "Category" in bills.columns else None,
+    }).dropna(subset=["sponsor"])
+    df = df[df["sponsor"].astype(str).str.strip() != ""]
+    # majority chamber per sponsor
+    chamber = (
+        df.groupby(["session", "sponsor"])["chamber"]
+        .agg(lambda s: s.mode().iat[0] if s.notna().any() else None)
+        .reset_index()
+    )
+    if "District" in bills.columns:
+        district = bills.groupby(sponsor_col)["District"].first().rename("district")
+        chamber = chamber.merge(district, left_on="sponsor", right_index=True, how="left")
+    else:
+        chamber["district"] = None
+    parts = chamber["sponsor"].map(split_sponsor)
+    chamber["surname_key"] = parts.str[0].map(norm_surname)
+    feats = parts.str[1].map(given_features)
+    chamber["initials"] = feats.str[0]
+    chamber["names"] = feats.str[1]
+    return chamber
+
+
+def legislator_table(reps, id_col=LEGISLATOR_ID_COL, session=DEFAULT_SESSION):
+    """One row per legislator with surname key + given-name features."""
+    df = pd.DataFrame({
+        "legislator_id": reps[id_col].values,
+        "Representative": reps["Representative"].values,
+        "Chamber": reps["Chamber"].values if "Chamber" in reps.columns else None,
+        "DistrictKey": reps["DistrictKey"].values if "DistrictKey" in reps.columns else None,
+        "session": reps["Session"].values if "Session" in reps.columns else session,
+    })
+    # surname from the sponsor-format name when we have it (handles two-word surnames)
+    sponsor_names = reps["Bill Sponsor"].values if "Bill Sponsor" in reps.columns else [None] * len(df)
+    surnames, givens = [], []
+    for full, sponsor_fmt in zip(df["Representative"], sponsor_names):
+        last, given = split_sponsor(full)
+        if sponsor_fmt and isinstance(sponsor_fmt, str) and "," in sponsor_fmt:
+            last = sponsor_fmt.split(",", 1)[0].strip()
+            given = re.sub(rf"\s*{re.escape(last)}\s*$", "", str(full)).strip() or given
+        surnames.append(last)
+        givens.append(given)
+    df["surname_key"] = [norm_surname(s) for s in surnames]
+    feats = [given_features(g) for g in givens]
+    df["initials"] = [f[0] for f in feats]
+    df["names"] = [f[1] for f in feats]
+    return df
+
+
+# ---------------------
+# Scoring
+# ---------------------
+def score_block(sponsors, legislators):
+    """Score matrix (len(sponsors) x len(legislators)) for one surname block."""
+    ratio = cdist(sponsors["initials"].tolist(), legislators["initials"].tolist(), scorer=fuzz.ratio)
+    scores = np.asarray(ratio, dtype=float)
+
+    for i, (s_init, s_names, s_chamber, s_session, s_district) in enumerate(
+        sponsors[["initials", "names", "chamber", "session", "district"]].itertuples(index=False)
+    ):
+        for j, (l_init, l_names, l_chamber, l_session, l_district) in enumerate(
+            legislators[["initials", "names", "Chamber", "session", "DistrictKey"]].itertuples(index=False)
+        ):
+            given = scores[i, j]
+            if s_init and l_init.startswith(s_init):
+                given = 100.0
+            elif s_init and _is_subsequence(s_init, l_init):
+                # goes by a middle name: "Walter, N." = "R. Neil Walter"
+                given = max(given, 85.0)
+            if s_names and s_names & l_names:
+                given = 100.0
+            if not s_init:
+                given = 50.0
+
+            adj = 0.0
+            if s_chamber and l_chamber:
+                adj += CHAMBER_MATCH if s_chamber == l_chamber else CHAMBER_MISMATCH
+            if s_session != l_session:
+                adj += SESSION_MISMATCH
+            if s_district and l_district and str(s_district) == str(l_district):
+                adj += DISTRICT_MATCH
+            scores[i, j] = min(100.0, max(0.0, given + adj))
+    return scores
+
+
+def resolve(bills, reps, sponsor_col="Bill Sponsor", threshold=MATCH_THRESHOLD, session=DEFAULT_SESSION):
+    """Build the sponsor -> legislator crosswalk (see CROSSWALK_COLS)."""
+    sponsors = sponsor_table(bills, sponsor_col, session=session).reset_index(drop=True)
+    legislators = legislator_table(reps, session=session).reset_index(drop=True)
+    leg_blocks = legislators.groupby("surname_key").indices
+
+    # candidate pairs: (score, sponsor row, legislator row)
+    pairs = []
+    best = {}
+    for key, s_rows in sponsors.groupby("surname_key").indices.items():
+        l_rows = leg_blocks.get(key)
+        if l_rows is None:
+            continue
+        scores = score_block(sponsors.iloc[s_rows], legislators.iloc[l_rows])
+        for a, i in enumerate(s_rows):
+            ranked = np.sort(scores[a])[::-1]
+            best[i] = (ranked[0], ranked[1] if len(ranked) > 1 else 0.0, len(l_rows))
+            for b, j in enumerate(l_rows):
+                pairs.append((scores[a, b], i, j))
+
+    # one-to-one per session, best score first
+    pairs.sort(key=lambda p: -p[0])
+    assigned, taken = {}, set()
+    for score, i, j in pairs:
+        if score < threshold or i in assigned:
+            continue
+        slot = (sponsors.at[i, "session"], legislators.at[j, "legislator_id"])
+        if slot in taken:
+            continue
+        assigned[i] = (j, score)
+        taken.add(slot)
+
+    rows = []
+    for i, s in sponsors.iterrows():
+        top, runner_up, n_candidates = best.get(i, (0.0, 0.0, 0))
+        if i in assigned:
+            j, score = assigned[i]
+            leg = legislators.iloc[j]
+            exact = score >= 100.0 and runner_up < threshold
+            rows.append((s["session"], s["sponsor"], leg["legislator_id"], leg["Representative"],
+                         leg["Chamber"], leg["DistrictKey"], round(score, 1), round(runner_up, 1),
+                         n_candidates, "exact" if exact else "scored"))
+        else:
+            rows.append((s["session"], s["sponsor"], None, None, None, None,
+                         round(top, 1), round(runner_up, 1), n_candidates, "unmatched"))
+    return pd.DataFrame(rows, columns=CROSSWALK_COLS)
+
+
+# ---------------------
+# Persisted crosswalk
+# ---------------------
+def write_crosswalk(crosswalk, path=CROSSWALK_PATH):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(crosswalk.to_dict(orient="records"), f, indent=2, ensure_ascii=False)
+
+
+def read_crosswalk(path=CROSSWALK_PATH):
+    return pd.read_json(path, orient="records")
+
+
+def sponsor_lookup(crosswalk, session=DEFAULT_SESSION):
+    """{sponsor: legislator_id} for one session (unmatched sponsors left out)."""
+    cw = crosswalk[(crosswalk["session"] == session) & crosswalk["legislator_id"].notna()]
+    return dict(zip(cw["sponsor"], cw["legislator_id"]))
+
+
+if __name__ == "__main__":
+    import geopandas as gpd
+
+    bills = pd.read_json(DATA_DIR / "combinedBills_2025.json", orient="records")
+    reps = pd.concat(
+        [gpd.read_file(DATA_DIR / f"reps_with_geo_data_{p}.geojson") for p in ("a", "b")],
+        ignore_index=True,
+    )
+    crosswalk = resolve(bills, reps)
+    write_crosswalk(crosswalk)
+    counts = crosswalk["method"].value_counts().to_dict()
+    print(f"Wrote {len(crosswalk)} sponsors to {CROSSWALK_PATH}: {counts}")
+    low = crosswalk[(crosswalk["method"] != "exact")]
+    if not low.empty:
+        print(low[["sponsor", "Representative", "score", "runner_up_score", "method"]].to_string(index=False))
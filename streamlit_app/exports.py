@@ -0,0 +1,86 @@
+# exports.py
+"""
+Bill exports: one rep's bills as CSV, or every rep's bills at once as a zip of
+CSVs or a single Parquet file.
+
+Nothing here runs on a normal rerun; the app only calls these when someone asks
+for a download (and caches the result per rep + data version).
+
+    python streamlit_app/exports.py --format zip --out all_reps_bills.zip
+    python streamlit_app/exports.py --format parquet --out all_reps_bills.parquet
+"""
+
+import argparse
+import io
+import re
+import zipfile
+from pathlib import Path
+
+import pandas as pd
+
+from data_prep import display_frame, prepare_bills
+
+EXPORT_COLS = ["Bill Number", "Bill Title", "Bill Status", "Date Passed", "Effective Date", "Bill URL"]
+SPONSOR_COL = "Bill Sponsor"
+
+
+def _cols(bills, cols):
+    return [c for c in (cols or EXPORT_COLS) if c in bills.columns]
+
+
+def slugify(name):
+    """'Peterson, K.' -> 'Peterson_K'"""
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", str(name)).strip("_")
+    return slug or "unknown"
+
+
+def rep_bills_csv(bills: pd.DataFrame, cols=None) -> bytes:
+    """CSV bytes for one rep's (already sliced + sorted) bills."""
+    return display_frame(bills, _cols(bills, cols)).to_csv(index=False).encode("utf-8")
+
+
+def write_bulk_zip(bills: pd.DataFrame, dest, group_col=SPONSOR_COL, cols=None):
+    """Write one CSV per sponsor into a zip at dest (a path or binary file object).
+
+    Each member is streamed into the archive as it's written, so only one
+    sponsor's CSV is in memory at a time.
+    """
+    cols = _cols(bills, cols)
+    with zipfile.ZipFile(dest, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for sponsor, group in bills.groupby(group_col, sort=True):
+            with zf.open(f"{slugify(sponsor)}_bills.csv", "w") as member:
+                with io.TextIOWrapper(member, encoding="utf-8", newline="") as text:
+                    display_frame(group, cols).to_csv(text, index=False)
+    return dest
+
+
+def write_bulk_parquet(bills: pd.DataFrame, dest, group_col=SPONSOR_COL, cols=None):
+    """All sponsors' bills in one Parquet file, dates kept as real timestamps."""
+    cols = [group_col] + [c for c in _cols(bills, cols) if c != group_col]
+    bills[cols].sort_values([group_col, "Bill Number"]).to_parquet(dest, index=False)
+    return dest
+
+
+def bulk_export_bytes(bills: pd.DataFrame, fmt="zip", **kwargs) -> bytes:
+    """bulk export into memory, for st.download_button."""
+    buf = io.BytesIO()
+    if fmt == "zip":
+        write_bulk_zip(bills, buf, **kwargs)
+    elif fmt == "parquet":
+        write_bulk_parquet(bills, buf, **kwargs)
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
+    return buf.getvalue()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Bulk export every rep's bills.")
+    ap.add_argument("--bills", default=Path(__file__).resolve().parent / "data" / "combinedBills_2025.json")
+    ap.add_argument("--format", choices=["zip", "parquet"], default="zip")
+    ap.add_argument("--out", required=True)
+    args = ap.parse_args()
+
+    bills = prepare_bills(pd.read_json(args.bills, orient="records"))
+    writer = write_bulk_zip if args.format == "zip" else write_bulk_parquet
+    writer(bills, args.out)
+    print(f"Wrote {bills[SPONSOR_COL].nunique()} reps' bills to {args.out}")
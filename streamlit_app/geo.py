@@ -0,0 +1,157 @@
+# geo.py
+"""
+District geometries for the statewide maps.
+
+The district polygons don't change between reruns, only the metric they're
+colored by. The statewide map therefore writes each chamber's districts once
+per data version as a static GeoJSON under streamlit_app/static/. Every
+feature carries a precomputed RGBA color for each metric (color_pass_rate,
+color_total_bills, color_party).
+
+The deck only references that file by URL and picks the color column with an
+accessor, so switching the metric changes one accessor string. The polygons
+aren't re-sent, and the browser keeps the cached file. If static serving is
+off, the same GeoJSON is sent inline instead.
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from shapely import wkt
+from shapely.geometry import MultiPolygon, Polygon
+
+BASE_DIR = Path(__file__).resolve().parent
+STATIC_DIR = BASE_DIR / "static"
+STATIC_URL = "app/static"
+
+# simplification tolerances in degrees
+SIMPLIFY_LEVELS = {"full": 0.0, "medium": 0.002, "low": 0.02}
+DEFAULT_LEVEL = "medium"
+
+# metric -> (label, kind)
+METRICS = {
+    "pass_rate": ("Pass rate (%)", "sequential"),
+    "total_bills": ("Total bills", "sequential"),
+    "party": ("Party", "categorical"),
+}
+PARTY_COLORS = {"R": (200, 40, 40), "D": (40, 80, 200)}
+OTHER_COLOR = (150, 150, 150)
+NO_DATA_COLOR = (230, 230, 230)
+SEQ_LOW, SEQ_HIGH = np.array([255, 245, 200]), np.array([0, 90, 50])
+FILL_ALPHA = 170
+
+
+# ---------------------
+# District table
+# ---------------------
+def district_frame(store):
+    """One row per district: geometry + rep + KPI values from the KPI engine."""
+    reps = store.reps
+    party_col = next((c for c in ["Party_geo", "Party", "Party_kpi"] if c in reps.columns), None)
+    gdf = reps[["rep_key", "DistrictKey", "Chamber", "display_name", "geometry"]].copy()
+    gdf["party"] = reps[party_col].values if party_col else None
+    kpis = store.kpi_engine.rep_kpis[["total_bills", "pass_rate"]]
+    gdf = gdf.merge(kpis, left_on="rep_key", right_index=True, how="left")
+    return gdf.set_geometry("geometry")
+
+
+def simplify(gdf, level=DEFAULT_LEVEL):
+    tolerance = SIMPLIFY_LEVELS[level]
+    if not tolerance:
+        return gdf
+    out = gdf.copy()
+    out["geometry"] = out.geometry.simplify(tolerance=tolerance, preserve_topology=True)
+    return out
+
+
+def shapely_to_pydeck_polygons(geom):
+    if geom is None:
+        return []
+    polys = []
+    if isinstance(geom, (Polygon, MultiPolygon)):
+        if geom.geom_type == "Polygon":
+            ext = list(geom.exterior.coords)
+            polys.append([[c[0], c[1]] for c in ext])
+        else:
+            for p in geom.geoms:
+                polys.append([[c[0], c[1]] for c in list(p.exterior.coords)])
+    else:
+        try:
+            gg = wkt.loads(str(geom))
+            return shapely_to_pydeck_polygons(gg)
+        except Exception:
+            return []
+    return polys
+
+
+# ---------------------
+# Colors (vectorized, N x 4 uint8)
+# ---------------------
+def metric_colors(values, kind):
+    values = pd.Series(values)
+    n = len(values)
+    out = np.empty((n, 4), dtype=np.uint8)
+    out[:, 3] = FILL_ALPHA
+    if kind == "categorical":
+        rgb = np.array([PARTY_COLORS.get(v, OTHER_COLOR) for v in values], dtype=np.uint8)
+        out[:, :3] = rgb
+        return out
+    x = pd.to_numeric(values, errors="coerce").to_numpy(dtype=float)
+    finite = np.isfinite(x)
+    lo, hi = (x[finite].min(), x[finite].max()) if finite.any() else (0.0, 1.0)
+    t = np.clip((x - lo) / (hi - lo if hi > lo else 1), 0, 1)
+    rgb = SEQ_LOW + (SEQ_HIGH - SEQ_LOW) * np.nan_to_num(t)[:, None]
+    out[:, :3] = rgb.round().astype(np.uint8)
+    out[~finite, :3] = NO_DATA_COLOR
+    return out
+
+
+def metric_range(gdf, metric):
+    x = pd.to_numeric(gdf[metric], errors="coerce")
+    return x.min(), x.max()
+
+
+# ---------------------
+# GeoJSON
+# ---------------------
+def districts_geojson(gdf, level=DEFAULT_LEVEL):
+    """GeoJSON dict with stable feature ids (DistrictKey) and a color column per metric."""
+    gdf = simplify(gdf, level)
+    props = gdf.drop(columns="geometry")
+    colors = {m: metric_colors(gdf["party" if m == "party" else m], kind) for m, (_, kind) in METRICS.items()}
+    features = []
+    geoms = gdf.geometry.__geo_interface__["features"]
+    for i, (row, geom) in enumerate(zip(props.to_dict(orient="records"), geoms)):
+        row = {k: (None if isinstance(v, float) and np.isnan(v) else v) for k, v in row.items()}
+        for m in METRICS:
+            row[f"color_{m}"] = colors[m][i].tolist()
+        features.append({"type": "Feature", "id": row["DistrictKey"], "properties": row, "geometry": geom["geometry"]})
+    return {"type": "FeatureCollection", "features": features}
+
+
+def static_geojson(name, data, stale="*"):
+    """Write a GeoJSON dict to static/<name> (once; the name carries the data
+    version). Other files matching `stale` are removed. Returns its URL."""
+    path = STATIC_DIR / name
+    if not path.exists():
+        STATIC_DIR.mkdir(exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+        tmp.replace(path)
+        # drop files from older data versions
+        for old in STATIC_DIR.glob(stale):
+            if old != path:
+                old.unlink(missing_ok=True)
+    return f"{STATIC_URL}/{name}"
+
+
+def static_districts(gdf, chamber, version, level=DEFAULT_LEVEL):
+    """Write the chamber's districts GeoJSON to static/ (once per version). Returns its URL."""
+    prefix = f"districts_{chamber.lower()}_{level}_"
+    path = STATIC_DIR / f"{prefix}{version}.geojson"
+    if path.exists():
+        return f"{STATIC_URL}/{path.name}"
+    data = districts_geojson(gdf[gdf["Chamber"] == chamber], level)
+    return static_geojson(path.name, data, stale=f"{prefix}*.geojson")
@@ -1,47 +1,82 @@
-import os
 import streamlit as st
 import geopandas as gpd
-import plotly.express as px
-import json
+import pandas as pd
+import plotly.graph_objects as go
 
-# -----------------------------
-# Load data (cached for speed)
-# -----------------------------
-@st.cache_data
-def load_data(path):
-    gdf = gpd.read_file(path)
-    simplified = gdf.copy()
-    simplified["geometry"] = simplified["geometry"].simplify(tolerance=0.02, preserve_topology=True)
-    return simplified
+from datastore import GEO_PATH_A, GEO_PATH_B
+from data_prep import data_version
+import geo
+import perf
 
-# -------------------------------
-# File paths
-# -------------------------------
-# Ensure target folder exists
-save_dir = "data/"
+PARTY_CODES = {"D": 0, "R": 1}
+PARTY_COLORSCALE = [[0, "rgb(40,80,200)"], [0.5, "rgb(150,150,150)"], [1, "rgb(200,40,40)"]]
 
-os.makedirs(save_dir, exist_ok=True)
 
-# File paths
-geojson_path = os.path.join(save_dir, "reps_with_geo_data.geojson")
-json_path    = os.path.join(save_dir, "reps_with_geo_data.json")
+# -----------------------------
+# Load data (cached, read-only)
+# -----------------------------
+# Keyed on the data version so an updated file is picked up; nothing is
+# written back to disk.
+@st.cache_resource(max_entries=2, show_spinner="Loading districts...")
+def load_districts(version):
+    parts = [gpd.read_file(p) for p in (GEO_PATH_A, GEO_PATH_B) if p.exists()]
+    if not parts:
+        raise FileNotFoundError("Missing both geojson parts (reps_with_geo_data_a/b.geojson).")
+    gdf = gpd.GeoDataFrame(pd.concat(parts, ignore_index=True), crs=parts[0].crs)
+    # DistrictKey is the stable feature id plotly matches locations against
+    return gdf.set_index("DistrictKey", drop=False)
+
+
+@st.cache_resource(max_entries=6)
+def districts_geojson(version, level):
+    """Geometry-only GeoJSON (feature id = DistrictKey), built once per level.
+
+    With static serving on it's written to static/ and the figure only carries
+    its URL, so changing the selection re-sends locations/z, not the polygons.
+    Otherwise the GeoJSON itself goes into the figure."""
+    gdf = geo.simplify(load_districts(version)[["geometry"]], level)
+    data = gdf.__geo_interface__
+    if st.get_option("server.enableStaticServing"):
+        return geo.static_geojson(f"districts_all_{level}_{version}.geojson", data,
+                                  stale=f"districts_all_{level}_*.geojson")
+    return data
+
+
+@st.cache_resource(max_entries=32)
+def district_figure(version, level, locations):
+    """One choropleth trace over the shared GeoJSON; only locations/z vary."""
+    attrs = load_districts(version).loc[list(locations)]
+    fig = go.Figure(go.Choroplethmap(
+        geojson=districts_geojson(version, level),
+        featureidkey="id",
+        locations=attrs["DistrictKey"],
+        z=attrs["Party"].map(PARTY_CODES).fillna(0.5),
+        zmin=0,
+        zmax=1,
+        colorscale=PARTY_COLORSCALE,
+        showscale=False,
+        marker_opacity=0.6,
+        text=attrs["Representative"],
+        hovertemplate="%{text}<br>%{location}<extra></extra>",
+    ))
+    fig.update_layout(
+        map_style="carto-positron",
+        map_center={"lat": 39.5, "lon": -111.5},  # Utah center
+        map_zoom=6,
+        height=800,
+        margin={"l": 0, "r": 0, "t": 0, "b": 0},
+    )
+    return fig
+
 
 # -------------------------------
 # Load data
 # -------------------------------
-with open(geojson_path) as f:
-    geojson = json.load(f)
-
-if isinstance(geojson, dict) and "features" in geojson:
-    all_data = gpd.GeoDataFrame.from_features(geojson["features"])
-elif isinstance(geojson, list):  # fallback if file is a list of features
-    all_data = gpd.GeoDataFrame.from_features(geojson)
-else:
-    raise ValueError("Unsupported GeoJSON structure")
+perf.start_run("geodata_app", enabled=perf.ENABLED or st.query_params.get("perf") == "1")
 
-
-# Save attributes only as JSON
-all_data.drop(columns="geometry").to_json(json_path, orient="records")
+version = data_version((GEO_PATH_A, GEO_PATH_B))
+with perf.timer("read geojson"):
+    all_data = load_districts(version)
 
 st.title("Reps by District Map")
 
@@ -51,66 +86,24 @@ st.title("Reps by District Map")
 rep_options = all_data["Representative"].unique().tolist()
 selected_rep = st.sidebar.selectbox("Select a Representative", rep_options)
 
-
 reps = sorted(all_data["Representative"].unique())
 selected_reps = st.sidebar.multiselect("Select Representative", reps, default=[])
 
+level = st.sidebar.select_slider("Detail", list(geo.SIMPLIFY_LEVELS)[::-1], value="low")
 
 # If nothing selected, show all
 if selected_reps:
-    filtered = all_data[all_data["Representative"] == selected_rep]
-    # filtered = all_data[all_data["Representative"].isin(selected_reps)]
+    filtered = all_data[all_data["Representative"].isin(selected_reps)]
 else:
     filtered = all_data
 
-# -------------------------------
-# Simplify geometries for speed
-# -------------------------------
-filtered = filtered.copy()
-filtered["geometry"] = filtered["geometry"].simplify(
-    tolerance=0.02, preserve_topology=True
-)
-
 # -------------------------------
 # Build choropleth
 # -------------------------------
-fig = px.choropleth_mapbox(
-    filtered,
-    geojson=filtered.__geo_interface__,
-    locations="Representative",                # column to match features
-    featureidkey="properties.Representative",  # must match GeoJSON property
-    color="Representative",                    # coloring variable
-    hover_name="Representative",
-    mapbox_style="carto-positron",
-    center={"lat": 39.5, "lon": -111.5},       # Utah center
-    zoom=6,
-    opacity=0.6
-)
-
-
-# # -----------------------------
-# # Map (rendered once)
-# # -----------------------------
-# # geojson_data = all_data.__geo_interface__
-#
-# fig = px.choropleth_mapbox(
-#     filtered,
-#     geojson=filtered.__geo_interface__,
-#     locations="Representative",
-#     featureidkey="properties.Representative",
-#     color="Representative",  # keeps all districts colored
-#     hover_name="Representative",
-#     mapbox_style="carto-positron",
-#     center={"lat": 39.5, "lon": -111.5},
-#     zoom=6,
-#     opacity=0.5,
-#     height=700
-# )
-#
-# st.plotly_chart(fig, use_container_width=True)
-
-# Set figure size (height in px, width is auto by container)
-fig.update_layout(height=800)  # try 800–1000 for taller map
+with perf.timer("simplify"):
+    districts_geojson(version, level)
+with perf.timer("build choropleth"):
+    fig = district_figure(version, level, tuple(filtered["DistrictKey"]))
 
 st.plotly_chart(fig, use_container_width=True)
 
@@ -139,6 +132,7 @@ st.bar_chart(dummy_chart_data, x="Year", y="Bills Sponsored")
 # Debug info (optional)
 # -------------------------------
 st.write("✅ Loaded districts:", len(all_data))
-st.write("Memory before simplification (MB):", round(all_data.memory_usage(deep=True).sum() / 1e6, 2))
-st.write("Memory after simplification (MB):", round(filtered.memory_usage(deep=True).sum() / 1e6, 2))
+st.write("Memory of districts (MB):", round(all_data.memory_usage(deep=True).sum() / 1e6, 2))
 
+# perf panel (only shows when instrumentation is on)
+perf.render_panel()
@@ -0,0 +1,276 @@
+# kpis.py
+"""
+KPI engine for the bills table.
+
+Computes the per-sponsor measures that repKPIs_2025.json carries
+(total/passed/failed/pass_rate) straight from the bills in one groupby, and a
+small materialized cube over chamber x party x committee x county with the
+status breakdown and median days-to-pass.
+
+The cube holds every grouping set of the four dimensions, so a dashboard can
+read e.g. "House, all parties, all committees, Salt Lake county" as one row
+instead of re-aggregating. A dimension that was rolled up holds ALL.
+"""
+
+from itertools import combinations
+
+import pandas as pd
+
+from shared import SharedFrames
+
+ALL = "(all)"
+UNKNOWN = "Unknown"
+
+CUBE_DIMS = ["Chamber", "Party", "Committee", "County"]
+# with Bill Number, these identify a bill: numbers restart every session and
+# repeat across states/sources. Only the ones the bills table has are used.
+BILL_ID_COLS = ["State", "Source", "Session"]
+KPI_COLS = ["total_bills", "passed_bills", "failed_bills", "pass_rate"]
+
+# candidate source columns on the merged reps table, first match wins
+REP_DIM_SOURCES = {
+    "Chamber": ["Chamber", "Chamber_geo", "Chamber_kpi"],
+    "Party": ["Party_geo", "Party_kpi", "Party"],
+    "Committee": ["Committee", "Committee_kpi"],
+    "County": ["County(ies)", "County(ies)_geo", "County"],
+}
+
+GROUPING_SETS = [
+    list(c) for n in range(len(CUBE_DIMS), -1, -1) for c in combinations(CUBE_DIMS, n)
+]
+
+
+# ---------------------
+# Bill level measures
+# ---------------------
+def passed_mask(status: pd.Series) -> pd.Series:
+    """True where the bill status is exactly 'Passed'.
+
+    A substring test for "pass" would also match "Failed/Not Passed".
+    """
+    return status.astype(str).str.strip().str.lower().eq("passed")
+
+
+def days_to_pass(bills: pd.DataFrame) -> pd.Series:
+    """Days from the bill date to Date Passed (NaN for bills that didn't pass)."""
+    if "Date Passed" not in bills.columns or "Bill Date (utc_iso)" not in bills.columns:
+        return pd.Series(float("nan"), index=bills.index)
+    delta = bills["Date Passed"] - bills["Bill Date (utc_iso)"]
+    return delta.dt.total_seconds() / 86400.0
+
+
+def compute_rep_kpis(bills: pd.DataFrame, key="rep_key", status_col="Bill Status") -> pd.DataFrame:
+    """total/passed/failed/pass_rate per key, in one vectorized groupby."""
+    passed = passed_mask(bills[status_col]) if status_col in bills.columns else False
+    frame = pd.DataFrame({key: bills[key], "passed": passed}, index=bills.index)
+    out = frame.groupby(key, sort=False)["passed"].agg(total_bills="size", passed_bills="sum")
+    out["passed_bills"] = out["passed_bills"].astype(int)
+    out["failed_bills"] = out["total_bills"] - out["passed_bills"]
+    out["pass_rate"] = (out["passed_bills"] / out["total_bills"] * 100).round(1)
+    return out.reset_index()
+
+
+# ---------------------
+# Rep dimensions
+# ---------------------
+def _as_list(value):
+    if isinstance(value, (list, tuple)):
+        return [str(v).strip() for v in value if str(v).strip()]
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return []
+    return [v.strip() for v in str(value).strip("[]").replace("'", "").split(",") if v.strip()]
+
+
+def rep_dimensions(reps: pd.DataFrame, key="rep_key", edges=None) -> pd.DataFrame:
+    """One row per (rep, committee, county) with the cube dimensions.
+
+    Committees come as lists (or from the committee edge table, if given) and
+    counties as "Box Elder, Cache" strings, so both are exploded. Missing
+    values become UNKNOWN.
+    """
+    dims = pd.DataFrame({key: reps[key].values})
+    for dim, sources in REP_DIM_SOURCES.items():
+        src = next((c for c in sources if c in reps.columns), None)
+        dims[dim] = reps[src].values if src else None
+
+    if edges is not None and key in edges.columns:
+        dims = dims.drop(columns="Committee").merge(edges[[key, "Committee"]], on=key, how="left")
+    else:
+        dims["Committee"] = dims["Committee"].map(_as_list)
+    dims["County"] = dims["County"].map(_as_list)
+    dims = dims.explode("Committee").explode("County")
+    dims[CUBE_DIMS] = dims[CUBE_DIMS].fillna(UNKNOWN).astype(str)
+    dims = dims[dims[key].astype(str).str.len() > 0]
+    return dims.drop_duplicates().reset_index(drop=True)
+
+
+def bill_id_cols(bills: pd.DataFrame) -> list:
+    return [c for c in BILL_ID_COLS if c in bills.columns] + ["Bill Number"]
+
+
+def bill_ids(bills: pd.DataFrame, cols) -> pd.Series:
+    """One string per bill, e.g. 'S00|2024GS|HB 12'."""
+    out = bills[cols[-1]].astype(str)
+    for col in reversed(cols[:-1]):
+        out = bills[col].fillna("").astype(str) + "|" + out
+    return out
+
+
+# ---------------------
+# Cube
+# ---------------------
+def _aggregate(facts: pd.DataFrame, by) -> pd.DataFrame:
+    # a bill can sit in several committee/county cells; count it once per cell
+    facts = facts.drop_duplicates(subset=["bill_id"] + by)
+    if by:
+        g = facts.groupby(by, sort=False)
+        out = g.agg(
+            total_bills=("Bill Number", "size"),
+            passed_bills=("passed", "sum"),
+            median_days_to_pass=("days_to_pass", "median"),
+        )
+        status = facts.groupby(by + ["status"], sort=False).size().unstack(fill_value=0)
+        out = out.join(status.add_prefix("status: ")).reset_index()
+    else:
+        out = pd.DataFrame({
+            "total_bills": [len(facts)],
+            "passed_bills": [facts["passed"].sum()],
+            "median_days_to_pass": [facts["days_to_pass"].median()],
+        })
+        for s, n in facts["status"].value_counts().items():
+            out[f"status: {s}"] = n
+    for dim in CUBE_DIMS:
+        if dim not in by:
+            out[dim] = ALL
+    out["passed_bills"] = out["passed_bills"].astype(int)
+    out["failed_bills"] = out["total_bills"] - out["passed_bills"]
+    out["pass_rate"] = (out["passed_bills"] / out["total_bills"] * 100).round(1)
+    return out
+
+
+def _fill_cube(cube: pd.DataFrame) -> pd.DataFrame:
+    status_cols = [c for c in cube.columns if c.startswith("status: ")]
+    cube[status_cols] = cube[status_cols].fillna(0).astype(int)
+    lead = CUBE_DIMS + KPI_COLS + ["median_days_to_pass"]
+    return cube[lead + sorted(status_cols)].reset_index(drop=True)
+
+
+def bill_facts(bills: pd.DataFrame, dims: pd.DataFrame, key="rep_key", status_col="Bill Status",
+               id_cols=("Bill Number",)) -> pd.DataFrame:
+    """Bills joined to the exploded rep dimensions (the cube's fact table)."""
+    facts = pd.DataFrame({
+        "bill_id": bill_ids(bills, list(id_cols)).values,
+        "Bill Number": bills["Bill Number"].values,
+        key: bills[key].values,
+        "status": bills[status_col].fillna(UNKNOWN).astype(str).values if status_col in bills.columns else UNKNOWN,
+        "passed": passed_mask(bills[status_col]).values if status_col in bills.columns else False,
+        "days_to_pass": days_to_pass(bills).values,
+    })
+    facts = facts.merge(dims, on=key, how="left")
+    facts[CUBE_DIMS] = facts[CUBE_DIMS].fillna(UNKNOWN)
+    return facts
+
+
+def build_cube(facts: pd.DataFrame) -> pd.DataFrame:
+    """Every grouping set of CUBE_DIMS, stacked into one frame."""
+    return _fill_cube(pd.concat([_aggregate(facts, gs) for gs in GROUPING_SETS], ignore_index=True))
+
+
+def slice_cube(cube: pd.DataFrame, **filters) -> pd.DataFrame:
+    """Rows of the cube for the given dimension values; unnamed dims are ALL.
+
+    slice_cube(cube, Chamber="House", Party="R") -> one row.
+    slice_cube(cube, Chamber="House", Committee=None) -> one row per committee.
+    """
+    mask = pd.Series(True, index=cube.index)
+    for dim in CUBE_DIMS:
+        if dim not in filters:
+            mask &= cube[dim].eq(ALL)
+        elif filters[dim] is None:
+            mask &= cube[dim].ne(ALL)
+        else:
+            mask &= cube[dim].eq(filters[dim])
+    return cube[mask]
+
+
+# ---------------------
+# Incremental engine
+# ---------------------
+class KPIEngine(SharedFrames):
+    """Holds the bills, per-rep KPIs and the cube, and updates them in place.
+
+    update() takes new or changed bill rows (matched on bill_id_cols, i.e.
+    Bill Number plus session/state/source where the data has them) and only
+    recomputes the reps and cube cells those rows touch. The engine is shared
+    across sessions, so its frames are handed out as shallow copies (see
+    shared.py); update() swaps in new frames rather than editing them.
+    """
+
+    SHARED = frozenset({"bills", "facts", "rep_kpis", "cube", "dims"})
+
+    def __init__(self, bills: pd.DataFrame, reps: pd.DataFrame, key="rep_key", status_col="Bill Status", edges=None):
+        self.key = key
+        self.status_col = status_col
+        self.dims = rep_dimensions(reps, key=key, edges=edges)
+        self.id_cols = bill_id_cols(bills)
+        self.bills = bills.drop_duplicates(subset=self.id_cols, keep="last").reset_index(drop=True)
+        self.facts = bill_facts(self.bills, self.dims, key=key, status_col=status_col, id_cols=self.id_cols)
+        self.rep_kpis = compute_rep_kpis(self.bills, key=key, status_col=status_col).set_index(key)
+        self.cube = build_cube(self.facts)
+
+    def kpis_for(self, rep_key):
+        """Dict of KPI_COLS for a rep, or None if they have no bills."""
+        if rep_key not in self.rep_kpis.index:
+            return None
+        return self.rep_kpis.loc[rep_key, KPI_COLS].to_dict()
+
+    def update(self, new_bills: pd.DataFrame):
+        """Merge new bill rows in and refresh the affected KPIs and cube cells.
+
+        Returns the set of rep keys whose numbers changed.
+        """
+        if new_bills.empty:
+            return set()
+        new_bills = new_bills.drop_duplicates(subset=self.id_cols, keep="last")
+        new_ids = bill_ids(new_bills, self.id_cols)
+        replaced = bill_ids(self.bills, self.id_cols).isin(new_ids)
+        touched = set(new_bills[self.key]) | set(self.bills.loc[replaced, self.key])
+
+        # cells the touched reps sat in before the update, plus where they are now
+        before = self.facts[self.facts[self.key].isin(touched)]
+
+        self.bills = pd.concat([self.bills[~replaced], new_bills], ignore_index=True)
+        new_facts = bill_facts(new_bills, self.dims, key=self.key, status_col=self.status_col, id_cols=self.id_cols)
+        self.facts = pd.concat(
+            [self.facts[~self.facts["bill_id"].isin(new_ids)], new_facts],
+            ignore_index=True,
+        )
+
+        # per-rep KPIs: recompute only the touched reps
+        touched_bills = self.bills[self.bills[self.key].isin(touched)]
+        fresh = compute_rep_kpis(touched_bills, key=self.key, status_col=self.status_col).set_index(self.key)
+        self.rep_kpis = pd.concat([self.rep_kpis.drop(index=list(touched), errors="ignore"), fresh])
+
+        # cube: recompute the cells the touched reps fall in, per grouping set
+        touched_dims = pd.concat([before, self.facts[self.facts[self.key].isin(touched)]])
+        parts = []
+        keep = pd.Series(True, index=self.cube.index)
+        for gs in GROUPING_SETS:
+            in_set = pd.Series(True, index=self.cube.index)
+            for dim in CUBE_DIMS:
+                in_set &= self.cube[dim].ne(ALL) if dim in gs else self.cube[dim].eq(ALL)
+            if gs:
+                cells = touched_dims[gs].drop_duplicates()
+                cell_facts = self.facts.merge(cells, on=gs, how="inner")
+                cell_rows = pd.MultiIndex.from_frame(self.cube.loc[in_set, gs])
+                hit = cell_rows.isin(pd.MultiIndex.from_frame(cells))
+                stale = self.cube.index[in_set.values][hit]
+            else:
+                cell_facts = self.facts
+                stale = self.cube.index[in_set.values]
+            keep[stale] = False
+            if not cell_facts.empty:
+                parts.append(_aggregate(cell_facts, gs))
+
+        self.cube = _fill_cube(pd.concat([self.cube[keep]] + parts, ignore_index=True))
+        return touched
@@ -0,0 +1,172 @@
+# legislative_calendar.py
+"""
+"Day of Legislature" from dates, and back, using NumPy business-day math.
+
+The Utah general session is 45 days long, and state holidays don't count
+toward it. Sundays do count, because Utah Code 63G-1-301(1)(e) excludes them
+from the holiday list for this purpose (see info/Utah_Holidays.pdf). So a
+session day is any calendar day that isn't a state holiday. That's
+np.busday_count / np.busday_offset with a 7-day weekmask and each session's
+holidays.
+
+    session_day(dates)              # whole column -> day numbers (1..45), NaN outside the session
+    session_date([1, 10, 45])       # day numbers -> dates, NaT outside the session
+"""
+
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_SESSION = "2025GS"
+
+# session -> (first day, last day)
+SESSIONS = {
+    "2023GS": ("2023-01-17", "2023-03-03"),
+    "2024GS": ("2024-01-16", "2024-03-01"),
+    "2025GS": ("2025-01-21", "2025-03-07"),
+}
+
+# every day of the week can be a session day; only holidays are skipped
+WEEKMASK = "1111111"
+
+
+# ---------------------
+# Holidays (63G-1-301)
+# ---------------------
+def _nth_weekday(year, month, weekday, n):
+    """n-th weekday (Mon=0) of a month; n=-1 for the last one."""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year + (month == 12), month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _observed(d):
+    """Sunday holidays move to Monday, Saturday ones to Friday."""
+    if d.weekday() == 6:
+        return d + timedelta(days=1)
+    if d.weekday() == 5:
+        return d - timedelta(days=1)
+    return d
+
+
+def _juneteenth(year):
+    d = date(year, 6, 19)
+    if d.weekday() == 0:
+        return d
+    if d.weekday() <= 4:
+        return d - timedelta(days=d.weekday())
+    return d + timedelta(days=7 - d.weekday())
+
+
+def utah_holidays(year):
+    """Utah legal holidays for a year (Sundays excluded, see module docstring)."""
+    fixed = [
+        date(year, 1, 1),                  # New Year's Day
+        _nth_weekday(year, 1, 0, 3),       # Dr. Martin Luther King, Jr. Day
+        _nth_weekday(year, 2, 0, 3),       # Washington and Lincoln Day
+        _nth_weekday(year, 5, 0, -1),      # Memorial Day
+        date(year, 7, 4),                  # Independence Day
+        date(year, 7, 24),                 # Pioneer Day
+        _nth_weekday(year, 9, 0, 1),       # Labor Day
+        _nth_weekday(year, 10, 0, 2),      # Columbus Day
+        date(year, 11, 11),                # Veterans Day
+        _nth_weekday(year, 11, 3, 4),      # Thanksgiving Day
+        date(year, 12, 25),                # Christmas
+    ]
+    days = {_observed(d) for d in fixed} | {_juneteenth(year)}
+    return np.array(sorted(days), dtype="datetime64[D]")
+
+
+def session_bounds(session=DEFAULT_SESSION):
+    start, end = SESSIONS[session]
+    return np.datetime64(start, "D"), np.datetime64(end, "D")
+
+
+def session_holidays(session=DEFAULT_SESSION):
+    start, end = session_bounds(session)
+    years = range(start.astype(object).year, end.astype(object).year + 1)
+    return np.concatenate([utah_holidays(y) for y in years])
+
+
+def session_length(session=DEFAULT_SESSION):
+    start, end = session_bounds(session)
+    return int(np.busday_count(start, end + 1, weekmask=WEEKMASK, holidays=session_holidays(session)))
+
+
+def session_for(dates) -> np.ndarray:
+    """Session name per date (the general session of that year; None if unknown)."""
+    years = pd.DatetimeIndex(pd.to_datetime(dates)).year
+    by_year = {int(v[0][:4]): k for k, v in SESSIONS.items()}
+    return np.array([by_year.get(y) for y in years], dtype=object)
+
+
+# ---------------------
+# Dates <-> session days (vectorized)
+# ---------------------
+def _as_days(dates):
+    return pd.to_datetime(pd.Series(dates)).to_numpy("datetime64[D]")
+
+
+def session_day(dates, session=None, clip=True) -> np.ndarray:
+    """Day of Legislature for each date (float; NaN for missing/out-of-session dates).
+
+    A holiday during the session gets the number of the session day before it.
+    session=None picks each date's session by year. With clip=False, dates
+    outside the session get their (negative or >45) offset instead of NaN.
+    """
+    d = _as_days(dates)
+    out = np.full(len(d), np.nan)
+    sessions = session_for(d) if session is None else np.full(len(d), session, dtype=object)
+    known = ~np.isnat(d)
+    for name in pd.unique(sessions[known]):
+        if name is None:
+            continue
+        rows = known & (sessions == name)
+        start, end = session_bounds(name)
+        holidays = session_holidays(name)
+        n = np.busday_count(start, d[rows] + 1, weekmask=WEEKMASK, holidays=holidays).astype(float)
+        if clip:
+            n[(d[rows] < start) | (d[rows] > end)] = np.nan
+        out[rows] = n
+    return out
+
+
+def session_date(day_numbers, session=DEFAULT_SESSION, clip=True) -> np.ndarray:
+    """Calendar date (datetime64[D]) of each Day of Legislature.
+
+    NaT for missing numbers, numbers below 1 and, like session_day(), numbers
+    past the end of the session. With clip=False, numbers past the end are
+    counted on past it.
+    """
+    n = pd.to_numeric(pd.Series(day_numbers), errors="coerce").to_numpy(dtype=float)
+    out = np.full(len(n), np.datetime64("NaT"), dtype="datetime64[D]")
+    valid = ~np.isnan(n) & (n >= 1)
+    if clip:
+        valid &= n <= session_length(session)
+    start, _ = session_bounds(session)
+    out[valid] = np.busday_offset(start, n[valid].astype(int) - 1, roll="forward",
+                                  weekmask=WEEKMASK, holidays=session_holidays(session))
+    return out
+
+
+def session_days_between(start_dates, end_dates, session=None) -> np.ndarray:
+    """Legislative days from start to end (holidays skipped), NaN where either is missing."""
+    a, b = _as_days(start_dates), _as_days(end_dates)
+    out = np.full(len(a), np.nan)
+    known = ~np.isnat(a) & ~np.isnat(b)
+    sessions = session_for(a) if session is None else np.full(len(a), session, dtype=object)
+    for name in pd.unique(sessions[known]):
+        if name is None:
+            continue
+        rows = known & (sessions == name)
+        out[rows] = np.busday_count(a[rows], b[rows], weekmask=WEEKMASK, holidays=session_holidays(name))
+    return out
+
+
+if __name__ == "__main__":
+    for name in SESSIONS:
+        start, end = session_bounds(name)
+        print(f"{name}: {start} .. {end}, {session_length(name)} session days")
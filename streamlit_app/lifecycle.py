@@ -0,0 +1,176 @@
+# lifecycle.py
+"""
+Bill lifecycle durations.
+
+Every stage duration comes out of one NumPy operation on the typed bills
+table (see data_prep.prepare_bills). The stage dates are pulled into a single
+datetime64 matrix and every (start, end) pair is subtracted at once, giving a
+timedelta64 matrix that's converted to days. Grouped distributions and the
+"still pending after N days" curves run on those arrays, with no per-row code.
+A Session column, if present, is just one more group key, so several sessions
+load into the same table.
+
+    python streamlit_app/lifecycle.py   # prints the summary tables
+"""
+
+import numpy as np
+import pandas as pd
+
+INTRO_COL = "Bill Date (utc_iso)"
+PASSED_COL = "Date Passed"
+GOV_COL = "Gov's Action Date"
+EFFECTIVE_COL = "Effective Date"
+
+# stage name -> (start column, end column)
+STAGES = {
+    "intro_to_passed": (INTRO_COL, PASSED_COL),
+    "passed_to_gov": (PASSED_COL, GOV_COL),
+    "gov_to_effective": (GOV_COL, EFFECTIVE_COL),
+    "intro_to_gov": (INTRO_COL, GOV_COL),
+    "intro_to_effective": (INTRO_COL, EFFECTIVE_COL),
+}
+
+# group name -> how to get it from the bills table
+GROUPS = {
+    "sponsor": "Bill Sponsor",
+    "chamber": "chamber",
+    "category": "Category",
+    "governor_action": "Governor's Action",
+}
+
+DAY = np.timedelta64(1, "D")
+
+
+def _chamber(bills):
+    return bills["Category"].astype(str).str.split().str[0] if "Category" in bills.columns else None
+
+
+# ---------------------
+# Durations
+# ---------------------
+def stage_dates(bills: pd.DataFrame):
+    """(dates matrix [n x cols] as datetime64[ns], column names)."""
+    cols = list(dict.fromkeys(c for pair in STAGES.values() for c in pair))
+    dates = np.empty((len(bills), len(cols)), dtype="datetime64[ns]")
+    for j, col in enumerate(cols):
+        dates[:, j] = bills[col].to_numpy("datetime64[ns]") if col in bills.columns else np.datetime64("NaT")
+    return dates, cols
+
+
+def stage_timedeltas(bills: pd.DataFrame):
+    """timedelta64 matrix [n x stages] (NaT where either date is missing) + stage names."""
+    dates, cols = stage_dates(bills)
+    pos = {c: j for j, c in enumerate(cols)}
+    starts = [pos[s] for s, _ in STAGES.values()]
+    ends = [pos[e] for _, e in STAGES.values()]
+    return dates[:, ends] - dates[:, starts], list(STAGES)
+
+
+def stage_durations(bills: pd.DataFrame) -> pd.DataFrame:
+    """Days per stage, one column per stage (NaN = stage not reached)."""
+    deltas, names = stage_timedeltas(bills)
+    return pd.DataFrame(deltas / DAY, columns=names, index=bills.index)
+
+
+def stage_session_days(bills: pd.DataFrame, session=None) -> pd.DataFrame:
+    """Like stage_durations, but counted in legislative days (holidays skipped)."""
+    from legislative_calendar import session_days_between
+
+    dates, cols = stage_dates(bills)
+    pos = {c: j for j, c in enumerate(cols)}
+    out = {
+        name: session_days_between(dates[:, pos[s]], dates[:, pos[e]], session=session)
+        for name, (s, e) in STAGES.items()
+    }
+    return pd.DataFrame(out, index=bills.index)
+
+
+def with_durations(bills: pd.DataFrame) -> pd.DataFrame:
+    """Bills + the stage durations + a chamber column for grouping."""
+    out = bills.join(stage_durations(bills))
+    if "chamber" not in out.columns:
+        out["chamber"] = _chamber(bills)
+    return out
+
+
+# ---------------------
+# Distributions
+# ---------------------
+def duration_summary(bills: pd.DataFrame, by="chamber", stages=None) -> pd.DataFrame:
+    """count / median / p90 days per stage for each group."""
+    stages = stages or list(STAGES)
+    frame = with_durations(bills)
+    keys = [GROUPS.get(b, b) for b in ([by] if isinstance(by, str) else by)]
+    if "Session" in frame.columns and "Session" not in keys:
+        keys = ["Session"] + keys
+    grouped = frame.groupby(keys, dropna=False, sort=True)[stages]
+    out = pd.concat(
+        {"count": grouped.count(), "median": grouped.median(), "p90": grouped.quantile(0.9)},
+        axis=1,
+    )
+    # (stage, stat) column order, stages as listed
+    out = out.swaplevel(axis=1).reindex(columns=pd.MultiIndex.from_product([stages, ["count", "median", "p90"]]))
+    return out.round(1)
+
+
+# ---------------------
+# Pending curves
+# ---------------------
+def pending_curve(bills: pd.DataFrame, stage="intro_to_passed", days=None, as_of=None, by=None) -> pd.DataFrame:
+    """Share of bills that haven't reached the end of `stage` after N days.
+
+    Kaplan-Meier style: bills that started the stage but have no end date are
+    censored at as_of (default: the latest date in the table) instead of being
+    counted as never finishing. Returns columns day, pending (and the group).
+    """
+    start_col, end_col = STAGES[stage]
+    days = np.arange(0, 121) if days is None else np.asarray(days)
+    dates, cols = stage_dates(bills)
+    if as_of is None:
+        known = dates[~np.isnat(dates)]
+        as_of = known.max() if known.size else np.datetime64("today")
+    as_of = pd.Timestamp(as_of).to_datetime64()
+    start = dates[:, cols.index(start_col)]
+    end = dates[:, cols.index(end_col)]
+    has_start = ~np.isnat(start)
+    done = ~np.isnat(end)
+    t = np.where(done, end - start, as_of - start) / DAY
+
+    if by is None:
+        return pd.DataFrame({"day": days, "pending": _km(t[has_start], done[has_start], days)})
+
+    col = GROUPS.get(by, by)
+    key = (bills[col] if col in bills.columns else _chamber(bills)).to_numpy()[has_start]
+    t, done = t[has_start], done[has_start]
+    frames = []
+    for group, rows in pd.DataFrame({"key": key}).groupby("key", sort=True).indices.items():
+        frames.append(pd.DataFrame({by: group, "day": days, "pending": _km(t[rows], done[rows], days)}))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=[by, "day", "pending"])
+
+
+def _km(t, event, days):
+    """Kaplan-Meier survival evaluated at each of days (vectorized)."""
+    if len(t) == 0:
+        return np.full(len(days), np.nan)
+    t_sorted = np.sort(t)
+    event_times, deaths = np.unique(t[event], return_counts=True)
+    if len(event_times) == 0:
+        return np.ones(len(days))
+    at_risk = len(t) - np.searchsorted(t_sorted, event_times, side="left")
+    surv = np.cumprod(1.0 - deaths / at_risk)
+    idx = np.searchsorted(event_times, days, side="right") - 1
+    return np.where(idx >= 0, surv[np.clip(idx, 0, None)], 1.0)
+
+
+if __name__ == "__main__":
+    from pathlib import Path
+
+    from data_prep import prepare_bills
+
+    path = Path(__file__).resolve().parent / "data" / "combinedBills_2025.json"
+    bills = prepare_bills(pd.read_json(path, orient="records"))
+    pd.set_option("display.width", 200)
+    for by in ["chamber", "governor_action"]:
+        print(duration_summary(bills, by=by, stages=["intro_to_passed", "passed_to_gov", "gov_to_effective"]))
+    curve = pending_curve(bills, by="chamber", days=[7, 14, 30, 45, 60])
+    print(curve.pivot(index="day", columns="chamber", values="pending").round(3))
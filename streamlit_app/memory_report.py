@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Memory report: process RSS as more Streamlit sessions open the dashboard.
+
+Each session is a streamlit.testing AppTest run of app.py in this process,
+all sharing the same st.cache_resource datastore (which is what happens
+inside one server worker). Sessions are kept alive so their per-session
+state is counted.
+
+    python streamlit_app/memory_report.py --sessions 20
+    python streamlit_app/memory_report.py --sessions 20 --json report.json
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+
+
+def rss_mb():
+    """Current resident set size of this process in MB."""
+    try:
+        import psutil
+        return psutil.Process(os.getpid()).memory_info().rss / 1e6
+    except ImportError:
+        # Linux fallback
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1e3
+    return float("nan")
+
+
+def run_report(n_sessions=10, app_path=BASE_DIR / "app.py", timeout=60):
+    from streamlit.testing.v1 import AppTest
+
+    sys.path.insert(0, str(BASE_DIR))
+    gc.collect()
+    baseline = rss_mb()
+    rows = []
+    sessions = []
+    choices = None
+    for i in range(n_sessions):
+        at = AppTest.from_file(str(app_path), default_timeout=timeout)
+        at.run()
+        if at.exception:
+            raise RuntimeError(f"session {i} failed: {at.exception[0].message}")
+        # pick a different rep per session so per-session state differs
+        picker = at.sidebar.selectbox[0]
+        choices = choices or list(picker.options)
+        picker.select(choices[i % len(choices)]).run()
+        sessions.append(at)
+        gc.collect()
+        rss = rss_mb()
+        rows.append({
+            "sessions": i + 1,
+            "rss_mb": round(rss, 1),
+            "delta_mb": round(rss - (rows[-1]["rss_mb"] if rows else baseline), 2),
+        })
+
+    from datastore import get_datastore
+    store = get_datastore()
+    per_session = [r["delta_mb"] for r in rows[1:]]
+    return {
+        "baseline_rss_mb": round(baseline, 1),
+        "shared_datastore_mb": store.memory_mb(),
+        "rows": rows,
+        "mean_mb_per_additional_session": round(sum(per_session) / len(per_session), 2) if per_session else None,
+    }
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="RSS per additional Streamlit session.")
+    ap.add_argument("--sessions", type=int, default=10)
+    ap.add_argument("--json", help="also write the report to this file")
+    args = ap.parse_args()
+
+    report = run_report(args.sessions)
+    print(f"baseline RSS: {report['baseline_rss_mb']} MB")
+    print("shared datastore (MB):", ", ".join(f"{k}={v}" for k, v in report["shared_datastore_mb"].items()))
+    print(f"{'sessions':>8}  {'RSS MB':>8}  {'delta MB':>8}")
+    for r in report["rows"]:
+        print(f"{r['sessions']:>8}  {r['rss_mb']:>8}  {r['delta_mb']:>8}")
+    print(f"mean per additional session: {report['mean_mb_per_additional_session']} MB")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
@@ -0,0 +1,46 @@
+import streamlit as st
+import pandas as pd
+from pathlib import Path
+
+from committees import CommitteeIndex, build_committee_edges
+
+REPKPIS_PATH = Path(__file__).resolve().parent.parent / "data" / "repKPIs_2025.json"
+
+# -----------------------------
+# Load data (built once, shared)
+# -----------------------------
+@st.cache_resource
+def load_committee_index(path):
+    kpis = pd.read_json(path, orient="records")
+    return CommitteeIndex(build_committee_edges(kpis))
+
+index = load_committee_index(REPKPIS_PATH)
+
+st.markdown("# Committees 🏛️")
+st.sidebar.markdown("# Committees 🏛️")
+
+# -------------------------------
+# Committee roster
+# -------------------------------
+committee = st.sidebar.selectbox("Select a Committee", index.committee_names)
+
+st.subheader(committee)
+roster = index.roster(committee)
+st.dataframe(
+    roster[["Representative", "Role", "Party", "Office"]],
+    use_container_width=True,
+    hide_index=True,
+)
+
+# -------------------------------
+# Who chairs what
+# -------------------------------
+st.markdown("---")
+st.subheader("Who chairs what")
+include_vice = st.checkbox("Include vice chairs", value=True)
+chairs = index.chairs(include_vice=include_vice)
+st.dataframe(
+    chairs[["Committee", "Role", "Representative", "Party"]],
+    use_container_width=True,
+    hide_index=True,
+)
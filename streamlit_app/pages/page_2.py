@@ -2,22 +2,31 @@ import streamlit as st
 import geopandas as gpd
 import json
 import plotly.express as px
+import pandas as pd
 import plotly.graph_objects as go
 
+from datastore import GEO_PATH_A, GEO_PATH_B
+from photos import photo_for
+import perf
+
 # -----------------------------
 # Load data (cached for speed)
 # -----------------------------
-@st.cache_data
-def load_data(path):
+def read_features(path):
     with open(path) as f:
         geojson = json.load(f)
     if isinstance(geojson, dict) and "features" in geojson:
-        df = gpd.GeoDataFrame.from_features(geojson["features"])
+        return gpd.GeoDataFrame.from_features(geojson["features"])
     elif isinstance(geojson, list):  # fallback if file is a list of features
-        df = gpd.GeoDataFrame.from_features(geojson)
+        return gpd.GeoDataFrame.from_features(geojson)
     else:
         raise ValueError("Unsupported GeoJSON structure")
-    simplified = df.copy()
+
+
+@st.cache_data
+def load_data(paths):
+    df = pd.concat([read_features(p) for p in paths], ignore_index=True)
+    simplified = gpd.GeoDataFrame(df, geometry="geometry")
     simplified["geometry"] = simplified["geometry"].simplify(tolerance=0.02, preserve_topology=True)
     return simplified
 
@@ -25,8 +34,8 @@ def load_data(path):
 # -------------------------------
 # Load data
 # -------------------------------
-geojson_path = "streamlit_app/data/reps_with_geo_data.geojson"
-json_path = "streamlit_app/data/reps_with_geo_data.json"
+# the reps geojson is split across two files; read both, like the datastore does
+geojson_paths = (str(GEO_PATH_A), str(GEO_PATH_B))
 
 # with open(geojson_path) as f:
 #     geojson = json.load(f)
@@ -38,7 +47,10 @@ json_path = "streamlit_app/data/reps_with_geo_data.json"
 # else:
 #     raise ValueError("Unsupported GeoJSON structure")
 
-all_data = load_data(geojson_path)
+perf.start_run("page_2", enabled=perf.ENABLED or st.query_params.get("perf") == "1")
+
+with perf.timer("load_data"):
+    all_data = load_data(geojson_paths)
 # -------------------------------
 # Sidebar Rep Selector
 # -------------------------------
@@ -56,7 +68,7 @@ col1, col2, col3 = st.columns(3)
 
 # ---- Column 1: Representative Image ----
 with col1:
-    st.image(rep_data["Img_URL"], use_container_width=True)
+    st.image(photo_for(rep_data["Img_ID"], rep_data["Img_URL"]), use_container_width=True)
 
 # ---- Column 2: Representative Info ----
 with col2:
@@ -79,19 +91,20 @@ with col3:
     #     tolerance=0.02, preserve_topology=True)
 
 
-    fig = go.Figure(go.Choroplethmap(
-        geojson=filtered.__geo_interface__,
-        locations=[0],
-        z=[1],
-        featureidkey="properties.Representative",
-        colorscale=[[0, "blue"], [1, "blue"]],
-        showscale=False,
-    ))
+    with perf.timer("build map figure"):
+        fig = go.Figure(go.Choroplethmap(
+            geojson=filtered.__geo_interface__,
+            locations=[0],
+            z=[1],
+            featureidkey="properties.Representative",
+            colorscale=[[0, "blue"], [1, "blue"]],
+            showscale=False,
+        ))
 
     fig.update_layout(
-        mapbox_style="carto-positron",  # works with MapLibre too
-        mapbox_zoom=7,
-        mapbox_center={"lat": 39.5, "lon": -111.5},
+        map_style="carto-positron",
+        map_zoom=7,
+        map_center={"lat": 39.5, "lon": -111.5},
     )
 
 
@@ -109,3 +122,5 @@ with col3:
 #     opacity=0.6
 # )
 
+# perf panel (only shows when instrumentation is on)
+perf.render_panel()
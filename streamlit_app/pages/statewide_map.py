@@ -0,0 +1,83 @@
+import streamlit as st
+import pydeck as pdk
+
+from datastore import get_datastore
+import geo
+import perf
+
+perf.start_run("statewide_map", enabled=perf.ENABLED or st.query_params.get("perf") == "1")
+
+st.markdown("# Statewide Map 🗺️")
+st.sidebar.markdown("# Statewide Map 🗺️")
+
+try:
+    store = get_datastore()
+except Exception as e:
+    st.error(f"Error loading data: {e}")
+    st.stop()
+
+
+# -----------------------------
+# District geometry (built once per data version, shared)
+# -----------------------------
+@st.cache_resource(max_entries=2)
+def district_layer_data(version, chamber, level, _store):
+    """URL of the static GeoJSON, or the GeoJSON itself if static serving is off."""
+    gdf = geo.district_frame(_store)
+    if st.get_option("server.enableStaticServing"):
+        return geo.static_districts(gdf, chamber, version, level)
+    return geo.districts_geojson(gdf[gdf["Chamber"] == chamber], level)
+
+
+@st.cache_data(max_entries=4)
+def metric_legend(version, chamber, metric, _store):
+    gdf = geo.district_frame(_store)
+    gdf = gdf[gdf["Chamber"] == chamber]
+    if geo.METRICS[metric][1] == "categorical":
+        return gdf["party"].value_counts().to_dict()
+    lo, hi = geo.metric_range(gdf, metric)
+    return {"min": lo, "max": hi}
+
+
+# -----------------------------
+# Controls
+# -----------------------------
+chamber = st.sidebar.radio("Chamber", ["House", "Senate"], horizontal=True)
+metric = st.sidebar.selectbox("Color by", list(geo.METRICS), format_func=lambda m: geo.METRICS[m][0])
+level = st.sidebar.select_slider("Detail", list(geo.SIMPLIFY_LEVELS)[::-1], value=geo.DEFAULT_LEVEL)
+
+with perf.timer("district layer data"):
+    data = district_layer_data(store.version, chamber, level, store)
+
+# only the accessor changes with the metric; the polygons stay put
+layer = pdk.Layer(
+    "GeoJsonLayer",
+    data=data,
+    id=f"districts-{chamber}",
+    get_fill_color=f"properties.color_{metric}",
+    get_line_color=[60, 60, 60],
+    line_width_min_pixels=1,
+    stroked=True,
+    filled=True,
+    pickable=True,
+    auto_highlight=True,
+    # deck.gl keys triggers by its own (camelCase) accessor names
+    update_triggers={"getFillColor": metric},
+)
+view = pdk.ViewState(latitude=39.5, longitude=-111.7, zoom=5.6)
+tooltip = {"text": "{DistrictKey}: {display_name} ({party})\nBills: {total_bills}  Pass rate: {pass_rate}%"}
+
+with perf.timer("render deck"):
+    st.pydeck_chart(pdk.Deck(layers=[layer], initial_view_state=view, tooltip=tooltip, map_style=None))
+
+# -----------------------------
+# Legend
+# -----------------------------
+legend = metric_legend(store.version, chamber, metric, store)
+label = geo.METRICS[metric][0]
+if geo.METRICS[metric][1] == "categorical":
+    st.caption(f"{label}: " + ", ".join(f"{k} ({v})" for k, v in legend.items()) + " · red = R, blue = D")
+else:
+    st.caption(f"{label}: light = {legend['min']:.0f}, dark = {legend['max']:.0f} · grey = no bills")
+
+perf.render_panel()
@@ -0,0 +1,192 @@
+# perf.py
+"""
+Lightweight hot-path timing for the Streamlit pages.
+
+    perf.start_run("app")                 # top of the page script
+    with perf.timer("load_datasets"):     # around a stage
+        ...
+    @perf.timed("fuzzy_search")           # or as a decorator
+    def search(...): ...
+    perf.count("bills_rows", len(df))     # counters
+    perf.render_panel()                   # bottom of the page: sidebar breakdown
+
+Turned on with ELECTIONTIME_PERF=1 or ?perf=1 in the page URL. When it's off,
+start_run doesn't open a run and every timer/counter is a single ContextVar
+lookup that returns early. If ELECTIONTIME_PERF_LOG is set, each finished run
+is appended there as one JSON line for aggregating across sessions.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar
+from functools import wraps
+
+ENABLED = os.environ.get("ELECTIONTIME_PERF", "") not in ("", "0")
+LOG_PATH = os.environ.get("ELECTIONTIME_PERF_LOG")
+
+_current = ContextVar("electiontime_perf_run", default=None)
+_log_lock = threading.Lock()
+_NOOP = nullcontext()
+
+
+class RunStats:
+    """Timings + counters for one script run."""
+
+    def __init__(self, page):
+        self.page = page
+        self.started = time.time()
+        self.t0 = time.perf_counter()
+        self.timings = []   # (name, ms) in the order the stages finished
+        self.counters = {}
+
+    def add(self, name, ms):
+        self.timings.append((name, ms))
+
+    def total_ms(self):
+        return (time.perf_counter() - self.t0) * 1000
+
+    def breakdown(self):
+        """{name: {"calls", "ms"}} summed over repeated stages."""
+        out = {}
+        for name, ms in self.timings:
+            row = out.setdefault(name, {"calls": 0, "ms": 0.0})
+            row["calls"] += 1
+            row["ms"] += ms
+        return out
+
+    def to_dict(self):
+        return {
+            "page": self.page,
+            "ts": self.started,
+            "total_ms": round(self.total_ms(), 2),
+            "stages": {k: {"calls": v["calls"], "ms": round(v["ms"], 2)} for k, v in self.breakdown().items()},
+            "counters": self.counters,
+        }
+
+
+class _Timer:
+    __slots__ = ("run", "name", "t0")
+
+    def __init__(self, run, name):
+        self.run = run
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.run.add(self.name, (time.perf_counter() - self.t0) * 1000)
+        return False
+
+
+def start_run(page, enabled=None):
+    """Open a run for this script execution. Returns the RunStats or None."""
+    if enabled is None:
+        enabled = ENABLED
+    run = RunStats(page) if enabled else None
+    _current.set(run)
+    return run
+
+
+def current_run():
+    return _current.get()
+
+
+def timer(name):
+    """Context manager timing a stage (no-op when no run is open)."""
+    run = _current.get()
+    if run is None:
+        return _NOOP
+    return _Timer(run, name)
+
+
+def timed(name=None):
+    """Decorator version of timer(); name defaults to the function name."""
+    def deco(fn):
+        label = name or fn.__name__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            run = _current.get()
+            if run is None:
+                return fn(*args, **kwargs)
+            with _Timer(run, label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+
+def count(name, n=1):
+    run = _current.get()
+    if run is not None:
+        run.counters[name] = run.counters.get(name, 0) + n
+
+
+def export_jsonl(run, path=None):
+    """Append the run as one JSON line."""
+    path = path or LOG_PATH
+    if run is None or not path:
+        return
+    line = json.dumps(run.to_dict())
+    with _log_lock, open(path, "a", encoding="utf-8") as f:
+        f.write(line + "\n")
+
+
+def finish_run():
+    """Close the current run, write it to the JSONL log, and return it."""
+    run = _current.get()
+    if run is not None:
+        run.add("total", run.total_ms())
+        export_jsonl(run)
+    _current.set(None)
+    return run
+
+
+def render_panel(title="⏱️ Perf"):
+    """Sidebar breakdown of this rerun (and finishes the run)."""
+    run = finish_run()
+    if run is None:
+        return
+    import pandas as pd
+    import streamlit as st
+
+    rows = [{"stage": k, "calls": v["calls"], "ms": round(v["ms"], 1)} for k, v in run.breakdown().items()]
+    with st.sidebar.expander(title, expanded=True):
+        st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+        if run.counters:
+            st.json(run.counters)
+
+
+def summarize_log(path):
+    """Aggregate a JSONL log: per page + stage call count, mean/p95 ms."""
+    import pandas as pd
+
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            run = json.loads(line)
+            for stage, v in run["stages"].items():
+                records.append({"page": run["page"], "stage": stage, "ms": v["ms"], "calls": v["calls"]})
+    df = pd.DataFrame(records)
+    if df.empty:
+        return df
+    return (
+        df.groupby(["page", "stage"])["ms"]
+        .agg(runs="size", mean_ms="mean", p95_ms=lambda s: s.quantile(0.95))
+        .round(2)
+        .reset_index()
+        .sort_values(["page", "mean_ms"], ascending=[True, False])
+    )
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) != 2:
+        print("usage: python streamlit_app/perf.py <perf_log.jsonl>")
+        sys.exit(2)
+    print(summarize_log(sys.argv[1]).to_string(index=False))
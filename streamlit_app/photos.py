@@ -0,0 +1,42 @@
+# photos.py
+"""
+Serve rep photos from the local cache built by scripts/rep_photos.py.
+
+Falls back to the le.utah.gov URL when a photo isn't cached yet.
+"""
+
+import json
+from functools import lru_cache
+from pathlib import Path
+
+PHOTO_ROOT = Path(__file__).resolve().parent.parent / "assets" / "img" / "rep_photos"
+MANIFEST_PATH = PHOTO_ROOT / "manifest.json"
+
+
+@lru_cache(maxsize=4)
+def _load_manifest(mtime_ns):
+    with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_manifest():
+    if not MANIFEST_PATH.exists():
+        return {}
+    # keyed on mtime so a rebuilt manifest is picked up without a restart
+    return _load_manifest(MANIFEST_PATH.stat().st_mtime_ns)
+
+
+def photo_for(img_id, fallback_url=None, size="md", fmt="webp"):
+    """Local thumbnail path for img_id, or fallback_url if it isn't cached."""
+    manifest = load_manifest()
+    entry = manifest.get("photos", {}).get(str(img_id)) if img_id else None
+    if entry:
+        name = entry.get("thumbs", {}).get(size, {}).get(fmt)
+        if name:
+            path = PHOTO_ROOT / manifest.get("thumb_dir", "thumbs") / name
+            if path.exists():
+                return str(path)
+        original = PHOTO_ROOT / entry["original"]
+        if original.exists():
+            return str(original)
+    return fallback_url
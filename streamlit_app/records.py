@@ -0,0 +1,260 @@
+# records.py
+"""
+Typed decoding of the JSON record files.
+
+The bills and KPI files each have a schema here: column name -> Python type
+(the district GeoJSON is read by geopandas and has none). decode_frame() parses the raw bytes and checks every record against the
+schema while it parses. It then builds the DataFrame from one array per
+column, with no intermediate list of dicts.
+
+With msgspec installed, the schema becomes a msgspec Struct, so parsing and
+validation happen in one C pass and the records are slotted objects. Without
+it, orjson (or the stdlib json) parses and the same schema is checked in
+Python.
+
+A record that doesn't match raises SchemaError naming the file, the record's
+position, the column and the offending record:
+
+    SchemaError: combinedBills_2025.json record 412 (Bill Number 'HB 77'):
+        column 'Date Passed': expected int or float or null, got str '2025-03-01'
+
+Column dtypes follow the schema rather than pd.read_json's guesses: text is
+a string column and lists are object, required ints are int64, and every
+epoch-ms or nullable int column is float64 with NaN. Two columns differ from
+what pd.read_json gave: the epoch-ms columns without nulls (Bill Date Raw,
+Bill Date (utc_iso), Scrape Timestamp) were int64 and are float64 here, and
+"Laws of Utah Chapter" is text ("165.0", as in the file) where read_json
+made it float64. Columns that aren't in the schema are ignored; SPARSE_COLS
+are dropped when every record lacks them.
+"""
+
+import json
+import re
+from typing import List, Optional, Union, get_args, get_origin
+
+import numpy as np
+import pandas as pd
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# ---------------------
+# Schemas
+# ---------------------
+# epoch milliseconds; pandas' to_json writes a column of these that has nulls
+# as floats (1738195200000.0), so integral floats are accepted too
+EpochMs = Union[int, float, None]
+
+BILLS = {
+    "Bill Number": str,
+    "Bill Title": str,
+    "Category": str,
+    "Bill Sponsor": Optional[str],
+    "Bill Date Raw": EpochMs,
+    "Bill Date (utc_iso)": EpochMs,
+    "Bill URL": Optional[str],
+    "Bill Status": Optional[str],
+    "Date Passed": EpochMs,
+    "Effective Date": EpochMs,
+    "Governor's Action": Optional[str],
+    "Gov's Action Date": EpochMs,
+    "Laws of Utah Chapter": Union[str, float, None],  # "1.0"; a pandas round trip makes it 1.0
+    "Scrape Timestamp": EpochMs,
+    # only in multi-session / multi-state data (see SPARSE_COLS)
+    "Session": Optional[str],
+    "State": Optional[str],
+    "Source": Optional[str],
+}
+
+KPIS = {
+    "Bill Sponsor": str,
+    "total_bills": int,
+    "passed_bills": int,
+    "failed_bills": int,
+    "pass_rate": float,
+    "Representative": Optional[str],
+    "Office": Optional[str],
+    "Party": Optional[str],
+    "Committee": Optional[List[str]],
+    "Role": Optional[List[str]],
+    "Committee Count": Optional[float],
+}
+
+# schema name -> schema; decode_frame takes the name
+SCHEMAS = {"bills": BILLS, "kpis": KPIS}
+
+# left out of the frame when no record has a value, so code that checks for
+# the column (entity_resolution, kpis) sees the file's real layout
+SPARSE_COLS = {"Session", "State", "Source"}
+
+# the column used to name a bad record in errors
+ID_COLS = ["Bill Number", "Bill Sponsor"]
+
+
+class SchemaError(ValueError):
+    pass
+
+
+def _optional(typ):
+    return get_origin(typ) is Union and type(None) in get_args(typ)
+
+
+def _bases(typ):
+    """The non-null types a column accepts, e.g. (int, float) for EpochMs."""
+    args = get_args(typ) if get_origin(typ) is Union else (typ,)
+    return tuple(get_origin(t) or t for t in args if t is not type(None))
+
+
+def _type_name(typ):
+    return " or ".join(t.__name__ for t in _bases(typ)) + (" or null" if _optional(typ) else "")
+
+
+def _attr(col):
+    """A Python attribute name for a column ('Gov's Action Date' -> 'gov_s_action_date')."""
+    return re.sub(r"\W+", "_", col).strip("_").lower()
+
+
+def _dtype(typ):
+    bases = _bases(typ)
+    if not set(bases) <= {int, float}:
+        return object
+    if float in bases:
+        return "float64"
+    if bases == (int,):
+        return "float64" if _optional(typ) else "int64"
+    return object
+
+
+# ---------------------
+# Decoding
+# ---------------------
+_structs = {}
+
+
+def _struct_for(name):
+    """A msgspec Struct type for a named schema, plus the column each of its
+    fields holds, in field order (built once per name)."""
+    if name not in _structs:
+        schema = SCHEMAS[name]
+        fields = [(_attr(c), t, None) if _optional(t) else (_attr(c), t) for c, t in schema.items()]
+        # required fields have to come first in a Struct
+        fields.sort(key=lambda f: len(f))
+        Record = msgspec.defstruct(f"{name.title()}Record", fields, rename={_attr(c): c for c in schema})
+        columns = {_attr(c): c for c in schema}
+        _structs[name] = (Record, [columns[f] for f in Record.__struct_fields__])
+    return _structs[name]
+
+
+def _parse(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _describe(records, i, source):
+    rec = records[i] if isinstance(records, list) and i < len(records) else None
+    ident = ""
+    if isinstance(rec, dict):
+        col = next((c for c in ID_COLS if rec.get(c) is not None), None)
+        if col:
+            ident = f" ({col} {rec[col]!r})"
+    return f"{source} record {i}{ident}"
+
+
+def _error(data, source, index, detail):
+    # only on failure: parse generically to show which record it was
+    try:
+        records = _parse(data)
+    except ValueError:
+        records = None
+    return SchemaError(f"{_describe(records, index, source)}: {detail}")
+
+
+def _check(value, typ):
+    if value is None:
+        return _optional(typ)
+    if isinstance(value, bool):
+        return bool in _bases(typ)
+    for base in _bases(typ):
+        if base is float and isinstance(value, (int, float)):
+            return True
+        if isinstance(value, base):
+            return True
+    return False
+
+
+def _columns_from_dicts(records, schema, source, data):
+    if not isinstance(records, list):
+        raise SchemaError(f"{source}: expected a JSON array of records")
+    columns = {}
+    for col, typ in schema.items():
+        values = [None] * len(records)
+        for i, rec in enumerate(records):
+            if not isinstance(rec, dict):
+                raise _error(data, source, i, f"expected an object, got {type(rec).__name__}")
+            v = rec.get(col)
+            if not _check(v, typ):
+                raise _error(data, source, i, f"column {col!r}: expected {_type_name(typ)}, "
+                                              f"got {type(v).__name__} {v!r}")
+            values[i] = v
+        columns[col] = values
+    return columns
+
+
+def _columns_from_structs(data, name, source):
+    Record, columns = _struct_for(name)
+    try:
+        records = msgspec.json.decode(data, type=List[Record])
+    except msgspec.ValidationError as e:
+        # message ends with "- at `$[412].Date Passed`"
+        m = re.search(r"\$\[(\d+)\]", str(e))
+        raise _error(data, source, int(m.group(1)) if m else 0, str(e)) from None
+    except msgspec.DecodeError as e:
+        raise SchemaError(f"{source}: {e}") from None
+    if not records:
+        return {c: [] for c in columns}
+    astuple = msgspec.structs.astuple
+    return dict(zip(columns, zip(*map(astuple, records))))
+
+
+def decode_frame(data: bytes, name: str, source="<bytes>") -> pd.DataFrame:
+    """DataFrame from a JSON array of records, validated against SCHEMAS[name]."""
+    schema = SCHEMAS[name]
+    if msgspec is not None:
+        columns = _columns_from_structs(data, name, source)
+    else:
+        try:
+            records = _parse(data)
+        except ValueError as e:
+            raise SchemaError(f"{source}: {e}") from None
+        columns = _columns_from_dicts(records, schema, source, data)
+    frame = {}
+    for col, typ in schema.items():
+        dtype = _dtype(typ)
+        values = columns[col]
+        if col in SPARSE_COLS and all(v is None for v in values):
+            continue
+        if dtype == "float64":
+            values = [np.nan if v is None else v for v in values]
+        frame[col] = np.array(values, dtype=dtype) if dtype != object else _object_array(values)
+    return pd.DataFrame(frame)
+
+
+def _object_array(values):
+    # np.array would turn a column of equal-length lists into a 2-D array
+    out = np.empty(len(values), dtype=object)
+    out[:] = values
+    return out
+
+
+def decode_any(data: bytes, source="<bytes>") -> pd.DataFrame:
+    """DataFrame from a JSON array of records with no schema (one parse)."""
+    try:
+        return pd.DataFrame(_parse(data))
+    except ValueError as e:
+        raise SchemaError(f"{source}: {e}") from None
@@ -0,0 +1,36 @@
+# shared.py
+"""
+Read-only sharing of DataFrames across sessions.
+
+The datastore, the KPI engine and the committee index are built once per
+process and shared by every session, so their frames must never be changed
+in place. SharedFrames hands out the frames a class lists in SHARED as
+shallow copies. No data is copied, and with copy-on-write any in-place change
+a caller makes (a new column, a .loc assignment) lands on its copy, never on
+the shared frame.
+
+That relies on copy-on-write. It's always on from pandas 3. On pandas 2.x it
+is opt-in, so importing this module switches it on there. Older versions
+can't give the guarantee and aren't supported.
+"""
+
+import pandas as pd
+
+PANDAS_MAJOR = int(pd.__version__.split(".")[0])
+
+if PANDAS_MAJOR < 2:
+    raise ImportError(f"pandas {pd.__version__} is too old; the shared frames need pandas>=2 (copy-on-write)")
+if PANDAS_MAJOR == 2:
+    pd.set_option("mode.copy_on_write", True)
+
+
+class SharedFrames:
+    """Mixin: attributes named in SHARED are returned as shallow copies."""
+
+    SHARED = frozenset()
+
+    def __getattribute__(self, name):
+        value = object.__getattribute__(self, name)
+        if name in type(self).SHARED and isinstance(value, pd.DataFrame):
+            return value.copy(deep=False)
+        return value